@@ -0,0 +1,24 @@
+"""
+Short-lived cache for analytics responses.
+Dashboards poll analytics far more often than the underlying tables change,
+so results are reused for a few seconds. Backed by Redis when configured,
+otherwise an in-process LRU.
+"""
+
+from typing import Optional
+
+from backend.ttl_cache import TTLCache
+
+ANALYTICS_CACHE_TTL = 60  # seconds
+REDIS_KEY_PREFIX = "rev2:analytics:v1:"
+
+# Global analytics cache, keyed by endpoint name
+_analytics_cache: Optional[TTLCache] = None
+
+
+def get_analytics_cache() -> TTLCache:
+    """Get or create global analytics cache."""
+    global _analytics_cache
+    if _analytics_cache is None:
+        _analytics_cache = TTLCache("analytics", REDIS_KEY_PREFIX, ANALYTICS_CACHE_TTL)
+    return _analytics_cache
@@ -1,23 +1,149 @@
-import time, jwt, os, requests
-from backend.config import GITHUB_APP_ID, GITHUB_PRIVATE_KEY 
+import time, jwt, os, requests, sys, threading
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from cryptography.hazmat.primitives import serialization
+from github import Auth, Github
+from requests.adapters import HTTPAdapter
+from backend.config import GITHUB_APP_ID, GITHUB_PRIVATE_KEY
 
 APP_ID, PRIVATE_KEY = GITHUB_APP_ID, GITHUB_PRIVATE_KEY
-def build_app_jwt():
-    now = int(time.time())
-    payload = {"iat": now, "exp": now + 9 * 60, "iss": APP_ID}
-    private_key_str = PRIVATE_KEY
-    if PRIVATE_KEY and not PRIVATE_KEY.strip().startswith("-----BEGIN"):
-        with open(PRIVATE_KEY.strip(), "r") as f:
+
+# Tokens are reused until they are this close to expiry (seconds)
+TOKEN_REFRESH_MARGIN = 30
+# Installation tokens live an hour; refresh early so a token handed to a
+# long-running review doesn't expire mid-way
+INSTALL_TOKEN_REFRESH_MARGIN = 300
+INSTALL_TOKEN_CACHE_SIZE = 1024
+_LOCK_BUCKETS = 16
+GITHUB_API_TIMEOUT = int(os.getenv("GITHUB_API_TIMEOUT", 30))
+GITHUB_POOL_SIZE = 20
+
+# Shared session keeps TLS connections to GitHub alive between webhooks
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+
+_jwt_cache = {}  # {app_id: (jwt, exp)}
+_jwt_lock = threading.Lock()
+_install_token_cache = OrderedDict()  # {installation_id: (token, exp)}, LRU order
+_install_token_cache_lock = threading.Lock()
+_github_clients = OrderedDict()  # {installation_id: (token, Github)}, LRU order
+_github_clients_lock = threading.Lock()
+# Refresh locks sharded by installation so one slow refresh doesn't block the rest
+_install_locks = [threading.Lock() for _ in range(_LOCK_BUCKETS)]
+
+
+def _is_fresh(exp: float, margin: float = TOKEN_REFRESH_MARGIN) -> bool:
+    return exp - time.time() > margin
+
+
+@lru_cache(maxsize=1)
+def _load_private_key(private_key: str):
+    """Read (if a path) and parse the PEM once; PyJWT signs with the key object."""
+    private_key_str = private_key
+    if private_key and not private_key.strip().startswith("-----BEGIN"):
+        with open(private_key.strip(), "r") as f:
             private_key_str = f.read()
-    return jwt.encode(payload, private_key_str.encode("utf-8"), algorithm="RS256")
+    return serialization.load_pem_private_key(
+        private_key_str.encode("utf-8"), password=None
+    )
+
+
+def build_app_jwt():
+    cached = _jwt_cache.get(APP_ID)
+    if cached and _is_fresh(cached[1]):
+        return cached[0]
+
+    with _jwt_lock:
+        cached = _jwt_cache.get(APP_ID)
+        if cached and _is_fresh(cached[1]):
+            return cached[0]
+
+        now = int(time.time())
+        payload = {"iat": now, "exp": now + 9 * 60, "iss": APP_ID}
+        token = jwt.encode(payload, _load_private_key(PRIVATE_KEY), algorithm="RS256")
+        _jwt_cache[APP_ID] = (token, payload["exp"])
+        return token
+
+
+def _get_cached_installation_token(installation_id: str):
+    with _install_token_cache_lock:
+        cached = _install_token_cache.get(installation_id)
+        if cached and _is_fresh(cached[1], INSTALL_TOKEN_REFRESH_MARGIN):
+            _install_token_cache.move_to_end(installation_id)
+            return cached[0]
+    return None
+
+
+# fromisoformat accepts a trailing "Z" natively from Python 3.11
+_FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
+
+
+def _parse_expires_at(data: dict) -> float:
+    expires_at = data.get("expires_at")
+    if expires_at:
+        if not _FROMISOFORMAT_ACCEPTS_Z and expires_at.endswith("Z"):
+            expires_at = expires_at[:-1] + "+00:00"
+        return datetime.fromisoformat(expires_at).timestamp()
+    # Installation tokens are valid for one hour
+    return time.time() + data.get("expires_in", 3600)
+
 
 def get_installation_token(installation_id: str) -> str:
-    app_jwt = build_app_jwt()
-    url = f"https://api.github.com/app/installations/{installation_id}/access_tokens"
-    headers = {
-        "Authorization": f"Bearer {app_jwt}",
-        "Accept": "application/vnd.github+json",
-    }
-    response = requests.post(url, headers=headers)
-    response.raise_for_status()
-    return response.json()["token"]
+    token = _get_cached_installation_token(installation_id)
+    if token:
+        return token
+
+    with _install_locks[hash(str(installation_id)) % _LOCK_BUCKETS]:
+        # Another request may have refreshed it while we waited
+        token = _get_cached_installation_token(installation_id)
+        if token:
+            return token
+
+        app_jwt = build_app_jwt()
+        url = f"https://api.github.com/app/installations/{installation_id}/access_tokens"
+        headers = {
+            "Authorization": f"Bearer {app_jwt}",
+            "Accept": "application/vnd.github+json",
+        }
+        response = _session.post(url, headers=headers, timeout=GITHUB_API_TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
+
+        with _install_token_cache_lock:
+            _install_token_cache[installation_id] = (data["token"], _parse_expires_at(data))
+            _install_token_cache.move_to_end(installation_id)
+            while len(_install_token_cache) > INSTALL_TOKEN_CACHE_SIZE:
+                _install_token_cache.popitem(last=False)
+        return data["token"]
+
+
+def get_github_client(installation_id: str) -> Github:
+    """
+    Get a PyGithub client for an installation.
+
+    Clients are reused while their installation token is current, so the
+    pooled connections to api.github.com stay open between webhooks. The
+    client a rotated token replaces is closed; clients evicted from the LRU
+    may still be serving a review, so they are only dropped and left to GC.
+    """
+    token = get_installation_token(installation_id)
+    with _github_clients_lock:
+        cached = _github_clients.get(installation_id)
+        if cached and cached[0] == token:
+            _github_clients.move_to_end(installation_id)
+            return cached[1]
+
+        client = Github(
+            auth=Auth.Token(token),
+            timeout=GITHUB_API_TIMEOUT,
+            pool_size=GITHUB_POOL_SIZE,
+        )
+        _github_clients[installation_id] = (token, client)
+        _github_clients.move_to_end(installation_id)
+        while len(_github_clients) > INSTALL_TOKEN_CACHE_SIZE:
+            _github_clients.popitem(last=False)
+
+    if cached:
+        cached[1].close()
+    return client
@@ -3,12 +3,16 @@ Cache management and index optimization for REV2.
 Handles TTL, cleanup, and index type selection.
 """
 
+import math
 import os
 import time
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import BinaryIO, Dict, Optional
 import faiss
+import msgspec
+import numpy as np
 import pickle
 from sqlalchemy.orm import Session
 
@@ -21,6 +25,75 @@ logger = get_logger(__name__)
 DEFAULT_TTL_DAYS = int(os.getenv("INDEX_TTL_DAYS", 30))
 USE_IVF_FOR_LARGE_REPOS = os.getenv("USE_IVF_FOR_LARGE_REPOS", "True").lower() == "true"
 IVF_THRESHOLD = 1000000  # Use IVF for indexes with >1M vectors
+HNSW_NEIGHBORS = 32
+# Search-time breadth. nprobe isn't saved with an index and defaults to 1,
+# which for IVF with thousands of lists misses most true neighbours.
+HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", 64))
+IVF_NPROBE = int(os.getenv("IVF_NPROBE", 16))
+CLEANUP_WORKERS = 8
+
+INDEX_TYPE_FLAT = "flat"
+INDEX_TYPE_HNSW = "hnsw"
+INDEX_TYPE_IVFPQ = "ivfpq"
+
+METADATA_SUFFIX = "_meta.mpk"
+LEGACY_METADATA_SUFFIX = "_meta.pkl"
+
+
+
+class _MetadataFile(msgspec.Struct):
+    """On-disk layout of the metadata sidecar."""
+    index_type: str
+    chunks: list
+
+
+_metadata_encoder = msgspec.msgpack.Encoder()
+_metadata_decoder = msgspec.msgpack.Decoder(_MetadataFile)
+
+
+def get_index_type(index: faiss.Index) -> str:
+    """Classify a FAISS index into one of the cache index types."""
+    if isinstance(index, faiss.IndexHNSW):
+        return INDEX_TYPE_HNSW
+    if isinstance(index, faiss.IndexIVF):
+        return INDEX_TYPE_IVFPQ
+    return INDEX_TYPE_FLAT
+
+
+def tune_index_for_search(index: faiss.Index) -> faiss.Index:
+    """
+    Apply search-time parameters to a built or freshly loaded index.
+
+    Args:
+        index: FAISS index
+
+    Returns:
+        The same index, for chaining
+    """
+    if isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+    elif isinstance(index, faiss.IndexIVF):
+        index.nprobe = IVF_NPROBE
+    return index
+
+
+def _write_index_stream(index: faiss.Index, fileobj: BinaryIO):
+    """
+    Stream a FAISS index into a writable binary file object.
+
+    FAISS pushes the serialized index through the callback in chunks, so no
+    full in-memory copy is made. Never use faiss.serialize_index() + pickle
+    for this: it doubles peak memory and hits pickle's 4 GiB limit.
+    """
+    writer = faiss.PyCallbackIOWriter(fileobj.write)
+    faiss.write_index(index, writer)
+    del writer  # flushes any buffered bytes to fileobj
+
+
+def _read_index_stream(fileobj: BinaryIO) -> faiss.Index:
+    """Stream a FAISS index out of a readable binary file object."""
+    reader = faiss.PyCallbackIOReader(fileobj.read)
+    return faiss.read_index(reader)
 
 
 class CacheManager:
@@ -31,6 +104,46 @@ class CacheManager:
         self.cache_dir = cache_dir
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
+    def build_index(self, vectors: np.ndarray) -> faiss.Index:
+        """
+        Build a FAISS index sized for the number of vectors.
+
+        Uses HNSW below IVF_THRESHOLD (or when IVF is disabled) and a
+        PQ-compressed IVF index above it to keep large caches small.
+
+        Args:
+            vectors: float32 array of shape (n, d)
+
+        Returns:
+            Populated FAISS index
+        """
+        vectors = np.ascontiguousarray(vectors, dtype="float32")
+        n, dimension = vectors.shape
+
+        if not USE_IVF_FOR_LARGE_REPOS or n < IVF_THRESHOLD:
+            index = faiss.IndexHNSWFlat(dimension, HNSW_NEIGHBORS)
+            index.add(vectors)
+            return tune_index_for_search(index)
+
+        nlist = int(4 * math.sqrt(n))
+        # PQ sub-quantizer count must divide the vector dimension
+        m = next(k for k in (64, 48, 32, 16, 8, 4, 2, 1) if dimension % k == 0)
+        index = faiss.index_factory(dimension, f"IVF{nlist},PQ{m}x8")
+
+        # Train on a random sample; FAISS wants ~39 points per centroid
+        train_size = min(n, nlist * 64)
+        sample = vectors[np.random.choice(n, train_size, replace=False)]
+        index.train(sample)
+        index.add(vectors)
+
+        logger.info(
+            "Built IVF-PQ index",
+            vectors=n,
+            nlist=nlist,
+            pq_subquantizers=m,
+        )
+        return tune_index_for_search(index)
+
     def get_index_path(self, repo_name: str, commit_sha: str) -> Path:
         """
         Get path to cached index.
@@ -49,19 +162,40 @@ class CacheManager:
     def get_metadata_path(self, repo_name: str, commit_sha: str) -> Path:
         """Get path to metadata file."""
         safe_repo_name = repo_name.replace("/", "__")
-        filename = f"{safe_repo_name}_{commit_sha}_meta.pkl"
+        filename = f"{safe_repo_name}_{commit_sha}{METADATA_SUFFIX}"
         return self.cache_dir / filename
 
+    def get_legacy_metadata_path(self, repo_name: str, commit_sha: str) -> Path:
+        """Get path to pickled metadata file written by older versions."""
+        safe_repo_name = repo_name.replace("/", "__")
+        filename = f"{safe_repo_name}_{commit_sha}{LEGACY_METADATA_SUFFIX}"
+        return self.cache_dir / filename
+
+    def _resolve_metadata_path(self, repo_name: str, commit_sha: str) -> Path:
+        """Return the msgpack metadata path, falling back to a legacy pickle."""
+        metadata_path = self.get_metadata_path(repo_name, commit_sha)
+        if not metadata_path.exists():
+            legacy_path = self.get_legacy_metadata_path(repo_name, commit_sha)
+            if legacy_path.exists():
+                return legacy_path
+        return metadata_path
+
     def cache_exists(self, repo_name: str, commit_sha: str) -> bool:
         """Check if index cache exists and is valid."""
         index_path = self.get_index_path(repo_name, commit_sha)
-        metadata_path = self.get_metadata_path(repo_name, commit_sha)
 
-        if not index_path.exists() or not metadata_path.exists():
+        # One stat() gives both existence and mtime
+        try:
+            index_stat = os.stat(index_path)
+        except FileNotFoundError:
+            return False
+
+        metadata_path = self._resolve_metadata_path(repo_name, commit_sha)
+        if not metadata_path.exists():
             return False
 
         # Check TTL
-        file_age_days = (time.time() - index_path.stat().st_mtime) / 86400
+        file_age_days = (time.time() - index_stat.st_mtime) / 86400
         if file_age_days > DEFAULT_TTL_DAYS:
             logger.info(
                 "Index cache expired",
@@ -91,12 +225,38 @@ class CacheManager:
 
         try:
             index_path = self.get_index_path(repo_name, commit_sha)
-            metadata_path = self.get_metadata_path(repo_name, commit_sha)
-
-            index = faiss.read_index(str(index_path))
+            metadata_path = self._resolve_metadata_path(repo_name, commit_sha)
 
+            index_type = None
             with open(metadata_path, "rb") as f:
-                metadata = pickle.load(f)
+                if metadata_path.name.endswith(LEGACY_METADATA_SUFFIX):
+                    metadata = pickle.load(f)
+                else:
+                    metadata_file = _metadata_decoder.decode(f.read())
+                    index_type = metadata_file.index_type
+                    metadata = metadata_file.chunks
+
+            # Read straight from the path so FAISS streams from disk. IVF
+            # lists are memory-mapped so concurrently loaded indexes share
+            # the OS page cache; HNSW gains little from mmap.
+            if index_type == INDEX_TYPE_IVFPQ:
+                index = faiss.read_index(
+                    str(index_path), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+                )
+            else:
+                index = faiss.read_index(str(index_path))
+
+            if index_type is not None and index_type != get_index_type(index):
+                logger.warning(
+                    "Cached index type mismatch",
+                    repo=repo_name,
+                    commit_sha=commit_sha,
+                    expected=index_type,
+                    actual=get_index_type(index),
+                )
+                return None, None
+
+            tune_index_for_search(index)
 
             logger.info(
                 "Index cache hit",
@@ -132,16 +292,34 @@ class CacheManager:
             repo_name: Repository name
             commit_sha: Commit SHA
         """
-        try:
-            index_path = self.get_index_path(repo_name, commit_sha)
-            metadata_path = self.get_metadata_path(repo_name, commit_sha)
+        index_path = self.get_index_path(repo_name, commit_sha)
+        metadata_path = self.get_metadata_path(repo_name, commit_sha)
+        index_tmp_path = index_path.with_name(f"{index_path.name}.tmp")
+        metadata_tmp_path = metadata_path.with_name(f"{metadata_path.name}.tmp")
 
-            # Save index
-            faiss.write_index(index, str(index_path))
+        try:
+            # Write both files to temp paths and rename into place, so a
+            # crash mid-write never leaves a torn file for load_index.
+            # Metadata goes first; cache_exists needs both files present.
+            with open(metadata_tmp_path, "wb") as f:
+                f.write(
+                    _metadata_encoder.encode(
+                        _MetadataFile(
+                            index_type=get_index_type(index),
+                            chunks=metadata,
+                        )
+                    )
+                )
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(metadata_tmp_path, metadata_path)
 
-            # Save metadata
-            with open(metadata_path, "wb") as f:
-                pickle.dump(metadata, f)
+            # Save index, streamed to disk by FAISS (no in-memory blob)
+            with open(index_tmp_path, "wb") as f:
+                _write_index_stream(index, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(index_tmp_path, index_path)
 
             logger.info(
                 "Index cached",
@@ -158,6 +336,28 @@ class CacheManager:
                 commit_sha=commit_sha,
                 error=str(e),
             )
+            for tmp_path in (index_tmp_path, metadata_tmp_path):
+                tmp_path.unlink(missing_ok=True)
+
+    def _scan_index_files(self):
+        """
+        Yield DirEntry objects for cached .faiss files.
+
+        DirEntry.stat() is cached per entry, so callers can read both size
+        and mtime without extra syscalls.
+        """
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".faiss") and entry.is_file():
+                    yield entry
+
+    @staticmethod
+    def _remove_index_files(index_file: Path):
+        """Delete an index file and its metadata sidecars."""
+        index_file.unlink()
+        # Also remove metadata (current and legacy formats)
+        for suffix in (METADATA_SUFFIX, LEGACY_METADATA_SUFFIX):
+            index_file.with_name(f"{index_file.stem}{suffix}").unlink(missing_ok=True)
 
     def cleanup_old_indexes(self, ttl_days: int = DEFAULT_TTL_DAYS) -> int:
         """
@@ -173,16 +373,23 @@ class CacheManager:
         cutoff_time = time.time() - (ttl_days * 86400)
 
         try:
-            for index_file in self.cache_dir.glob("*.faiss"):
-                file_age_time = index_file.stat().st_mtime
-
-                if file_age_time < cutoff_time:
+            expired_files = [
+                Path(entry.path)
+                for entry in self._scan_index_files()
+                if entry.stat().st_mtime < cutoff_time
+            ]
+
+            # Unlinks are syscall-latency bound, so overlap them
+            with ThreadPoolExecutor(max_workers=CLEANUP_WORKERS) as executor:
+                futures = {
+                    executor.submit(self._remove_index_files, index_file): index_file
+                    for index_file in expired_files
+                }
+
+                for future in as_completed(futures):
+                    index_file = futures[future]
                     try:
-                        index_file.unlink()
-                        # Also remove metadata
-                        meta_file = index_file.with_suffix(".pkl")
-                        if meta_file.exists():
-                            meta_file.unlink()
+                        future.result()
                         removed_count += 1
 
                         logger.info(
@@ -214,14 +421,14 @@ class CacheManager:
         oldest_time = time.time()
 
         try:
-            for index_file in self.cache_dir.glob("*.faiss"):
-                total_size += index_file.stat().st_size
+            for entry in self._scan_index_files():
+                entry_stat = entry.stat()
+                total_size += entry_stat.st_size
                 total_files += 1
 
-                mtime = index_file.stat().st_mtime
-                if mtime < oldest_time:
-                    oldest_time = mtime
-                    oldest_file = index_file.name
+                if entry_stat.st_mtime < oldest_time:
+                    oldest_time = entry_stat.st_mtime
+                    oldest_file = entry.name
 
             return {
                 "total_files": total_files,
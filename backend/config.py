@@ -16,6 +16,7 @@ MAX_FILE_CHARS = int(os.getenv("MAX_FILE_SIZE", 8000))
 CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", 800))
 CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", 200))
 TOP_K = int(os.getenv("TOP_K", 5))
+INDEX_TTL_DAYS = int(os.getenv("INDEX_TTL_DAYS", 30))
 
 
 # GitHub/Gemini env
@@ -24,7 +25,15 @@ GITHUB_APP_ID = os.getenv("GITHUB_APP_ID")
 GITHUB_PRIVATE_KEY = os.getenv("GITHUB_PRIVATE_KEY")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
-# Validate critical environment variables at startup
+# Logging
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+
+# Optional shared state across workers
+REDIS_URL = os.getenv("REDIS_URL")
+
+# Validate critical environment variables at startup (called from the
+# FastAPI startup hook, not at import time)
 def validate_config():
     """Validate that required environment variables are set."""
     required_vars = {
@@ -45,10 +54,8 @@ def validate_config():
             "\n\nPlease set these variables in your .env file. See .env.example for reference."
         )
 
-# Call validation
-validate_config()
-
 
-# ensure directories
-INDEX_DIR.mkdir(parents=True, exist_ok=True)
-REPO_CACHE_DIR.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
+def ensure_data_dirs():
+    """Create the index and repo cache directories if missing."""
+    INDEX_DIR.mkdir(parents=True, exist_ok=True)
+    REPO_CACHE_DIR.mkdir(parents=True, exist_ok=True)
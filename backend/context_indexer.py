@@ -8,6 +8,7 @@ import numpy as np
 import faiss
 
 from backend.config import INDEX_DIR, CHUNK_SIZE, CHUNK_OVERLAP, REPO_CACHE_DIR
+from backend.cache_manager import get_cache_manager, tune_index_for_search
 
 MODEL_NAME = "all-MiniLM-L6-v2"  # or any local sentence-transformers model
 _model = None
@@ -58,7 +59,7 @@ def index_repo(repo_dir: str, repo_name: str, commit_sha: str) -> Tuple[faiss.In
     
     if index_path.exists() and metadata_path.exists():
         print(f"✅ Loading existing index for {repo_name}@{commit_sha}")
-        index = faiss.read_index(str(index_path))
+        index = tune_index_for_search(faiss.read_index(str(index_path)))
         with open(metadata_path, "r") as f:
             metadata = json.load(f)
         return index, metadata
@@ -95,10 +96,8 @@ def index_repo(repo_dir: str, repo_name: str, commit_sha: str) -> Tuple[faiss.In
     model = _get_model()
     embeddings = model.encode(all_chunks).astype("float32")
 
-    # Create and populate FAISS index
-    dimension = embeddings.shape[1]
-    index = faiss.IndexFlatL2(dimension)
-    index.add(embeddings)
+    # Create and populate FAISS index (type chosen by repo size)
+    index = get_cache_manager().build_index(embeddings)
 
     # Save the index and metadata for future use
     faiss.write_index(index, str(index_path))
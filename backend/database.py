@@ -4,13 +4,13 @@ Supports SQLite (development) and PostgreSQL (production).
 """
 
 import os
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, inspect
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.pool import StaticPool
 from typing import Generator
 
 # Import models
-from backend.db_models import Base
+from backend.db_models import Base, utcnow
 
 # Database configuration
 DATABASE_URL = os.getenv(
@@ -20,27 +20,33 @@ DATABASE_URL = os.getenv(
 
 # Create engine
 if "postgresql" in DATABASE_URL or "postgres" in DATABASE_URL:
-    # PostgreSQL
+    # PostgreSQL. Size the pool per worker; with many workers, point
+    # DATABASE_URL at PgBouncer (transaction pooling) to cap server connections.
     engine = create_engine(
         DATABASE_URL,
-        pool_size=int(os.getenv("DATABASE_POOL_SIZE", 10)),
-        max_overflow=20,
+        pool_size=int(os.getenv("DATABASE_POOL_SIZE", 20)),
+        max_overflow=int(os.getenv("DATABASE_MAX_OVERFLOW", 40)),
+        pool_pre_ping=True,  # Detect connections dropped by the server
+        pool_recycle=int(os.getenv("DATABASE_POOL_RECYCLE", 3600)),
+        query_cache_size=1200,  # Compiled statement cache
         echo=os.getenv("DATABASE_ECHO", "False").lower() == "true",
     )
 else:
     # SQLite
     engine = create_engine(
         DATABASE_URL,
-        connect_args={"check_same_thread": False},
+        connect_args={"check_same_thread": False, "cached_statements": 256},
         poolclass=StaticPool,
         echo=os.getenv("DATABASE_ECHO", "False").lower() == "true",
     )
 
-    # Enable foreign keys for SQLite
+    # Enable foreign keys and WAL (readers don't block the webhook writer)
     @event.listens_for(engine, "connect")
     def set_sqlite_pragma(dbapi_connection, connection_record):
         cursor = dbapi_connection.cursor()
         cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
         cursor.close()
 
 
@@ -62,9 +68,63 @@ def get_db_session() -> Generator:
         db.close()
 
 
+def get_pool_status() -> dict:
+    """
+    Snapshot of connection pool usage.
+
+    Returns:
+        Dict with checked-in, checked-out and overflow connection counts
+        (empty for pools that don't track them, e.g. SQLite's StaticPool)
+    """
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return {}
+    return {
+        "checkedin": pool.checkedin(),
+        "checkedout": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+
+
 def init_db():
     """Initialize database tables."""
     Base.metadata.create_all(bind=engine)
+    upgrade_db()
+
+
+def upgrade_db():
+    """
+    Bring tables created by older releases up to the current schema.
+
+    create_all() never alters existing tables, so timestamp columns created
+    before they had a UTC database default get one here. Only PostgreSQL
+    needs it: SQLite can't change a column default in place, and the ORM
+    sends the same UTC expression with every INSERT anyway.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        existing = set(inspector.get_table_names())
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing:
+                continue
+            defaults = {
+                column["name"]: column["default"] or ""
+                for column in inspector.get_columns(table.name)
+            }
+            for column in table.columns:
+                if column.server_default is None or not isinstance(
+                    column.server_default.arg, utcnow
+                ):
+                    continue
+                if "timezone" in defaults.get(column.name, "").lower():
+                    continue
+                conn.exec_driver_sql(
+                    f'ALTER TABLE "{table.name}" ALTER COLUMN "{column.name}" '
+                    "SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP)"
+                )
 
 
 def drop_db():
@@ -4,7 +4,6 @@ Tracks review history, comments, cache metadata, and user feedback.
 """
 
 import uuid
-from datetime import datetime
 from sqlalchemy import (
     Column,
     String,
@@ -16,13 +15,80 @@ from sqlalchemy import (
     ForeignKey,
     Enum,
     Index,
+    TypeDecorator,
 )
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy.sql.expression import FunctionElement
 from enum import Enum as PyEnum
 
 Base = declarative_base()
 
 
+class utcnow(FunctionElement):
+    """
+    Current UTC time, evaluated by the database.
+
+    Timestamp columns are naive and hold UTC; PostgreSQL's now() is in the
+    server's time zone, so it is converted explicitly there.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _default_utcnow(element, compiler, **kw):
+    # SQLite's CURRENT_TIMESTAMP is already UTC
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _pg_utcnow(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+class UUIDString(TypeDecorator):
+    """
+    UUID kept in a String(36) column in its dashed text form.
+
+    The ORM and endpoints work with uuid.UUID values, while databases
+    created with string ids keep their column types and stored values.
+    """
+
+    impl = String(36)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(str(value))
+        return str(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return uuid.UUID(value)
+
+
+def _timestamp_column(**kwargs) -> Column:
+    """
+    UTC timestamp column stamped by the database.
+
+    The default is sent with each INSERT so tables created before the column
+    had a server default still accept rows; server_default covers new tables
+    and rows written outside the ORM.
+    """
+    return Column(
+        DateTime,
+        default=utcnow(),
+        server_default=utcnow(),
+        nullable=False,
+        **kwargs,
+    )
+
+
 class ReviewStatus(PyEnum):
     """Status of a review."""
     SUCCESS = "success"
@@ -46,9 +112,9 @@ class ReviewRecord(Base):
     __tablename__ = "review_records"
 
     id = Column(
-        String(36),
+        UUIDString,
         primary_key=True,
-        default=lambda: str(uuid.uuid4()),
+        default=uuid.uuid4,
     )
     installation_id = Column(String(50), nullable=False, index=True)
     repo_name = Column(String(255), nullable=False, index=True)
@@ -65,13 +131,8 @@ class ReviewRecord(Base):
     api_latency_ms = Column(Integer, nullable=True)
     cache_hit = Column(Boolean, default=False)
     error_message = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(
-        DateTime,
-        default=datetime.utcnow,
-        onupdate=datetime.utcnow,
-        nullable=False,
-    )
+    created_at = _timestamp_column()
+    updated_at = _timestamp_column(onupdate=utcnow())
 
     # Relationships
     comments = relationship("ReviewComment", back_populates="review_record")
@@ -80,6 +141,7 @@ class ReviewRecord(Base):
     __table_args__ = (
         Index("idx_repo_created", "repo_name", "created_at"),
         Index("idx_installation_created", "installation_id", "created_at"),
+        Index("idx_status_cache", "review_status", "cache_hit"),
     )
 
 
@@ -92,12 +154,12 @@ class ReviewComment(Base):
     __tablename__ = "review_comments"
 
     id = Column(
-        String(36),
+        UUIDString,
         primary_key=True,
-        default=lambda: str(uuid.uuid4()),
+        default=uuid.uuid4,
     )
     review_record_id = Column(
-        String(36),
+        UUIDString,
         ForeignKey("review_records.id", ondelete="CASCADE"),
         nullable=False,
         index=True,
@@ -110,7 +172,7 @@ class ReviewComment(Base):
         nullable=False,
     )
     comment_text = Column(Text, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = _timestamp_column()
 
     # Relationships
     review_record = relationship("ReviewRecord", back_populates="comments")
@@ -125,17 +187,17 @@ class IndexCache(Base):
     __tablename__ = "index_cache"
 
     id = Column(
-        String(36),
+        UUIDString,
         primary_key=True,
-        default=lambda: str(uuid.uuid4()),
+        default=uuid.uuid4,
     )
     repo_name = Column(String(255), nullable=False, index=True)
     commit_sha = Column(String(40), nullable=False, index=True)
     index_file_path = Column(String(512), nullable=False, unique=True)
     file_count = Column(Integer, default=0)
     total_size_bytes = Column(Integer, default=0)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    last_accessed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = _timestamp_column()
+    last_accessed_at = _timestamp_column()
     ttl_days = Column(Integer, default=30)
 
     __table_args__ = (
@@ -153,20 +215,29 @@ class ReviewFeedback(Base):
     __tablename__ = "review_feedback"
 
     id = Column(
-        String(36),
+        UUIDString,
         primary_key=True,
-        default=lambda: str(uuid.uuid4()),
+        default=uuid.uuid4,
     )
+    # Indexed through idx_feedback_review_created (leading column)
     review_record_id = Column(
-        String(36),
+        UUIDString,
         ForeignKey("review_records.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     rating = Column(Integer, nullable=False)  # 1-5 rating
     is_helpful = Column(Boolean, nullable=False)
     comment = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = _timestamp_column()
 
     # Relationships
     review_record = relationship("ReviewRecord", back_populates="feedback")
+
+    __table_args__ = (
+        # Per-review listing filters on the review and orders by time
+        Index("idx_feedback_review_created", "review_record_id", "created_at"),
+        # Covers the rating histogram (GROUP BY rating, SUM(is_helpful)) so
+        # analytics reads the index only
+        Index("idx_feedback_rating_helpful", "rating", "is_helpful"),
+        Index("idx_feedback_helpful", "is_helpful"),
+    )
@@ -2,18 +2,114 @@
 User feedback collection and analytics for review quality improvement.
 """
 
-from datetime import datetime
-from typing import Optional
+import asyncio
+import hashlib
+import logging
+import uuid
+import orjson
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from sqlalchemy import bindparam, case, func, insert, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
+from backend import database
+from backend.analytics_cache import get_analytics_cache
 from backend.database import get_db_session
-from backend.db_models import ReviewRecord, ReviewFeedback
+from backend.db_models import ReviewRecord, ReviewFeedback, ReviewStatus
 from backend.logger import get_logger
 
 logger = get_logger(__name__)
-router = APIRouter()
+# orjson serializes the analytics/feedback payloads much faster than stdlib json
+router = APIRouter(default_response_class=ORJSONResponse)
+
+MAX_FEEDBACK_BATCH_SIZE = 1000
+FEEDBACK_FETCH_BATCH_SIZE = 500
+# Analytics cache keys; both depend on feedback, so submissions drop both
+FEEDBACK_ANALYTICS_KEY = "feedback"
+QUALITY_ANALYTICS_KEY = "quality"
+
+# Statements are built once at import. SQLAlchemy still caches their compiled
+# SQL, but this also skips rebuilding the expression tree on every request.
+# The async analytics handlers run them in a worker thread so a slow
+# aggregate doesn't stall the event loop.
+
+# Rating histogram; totals, average and helpful count are folded from its
+# (at most five) rows
+_FEEDBACK_HISTOGRAM_STMT = select(
+    ReviewFeedback.rating,
+    func.count(),
+    func.sum(case((ReviewFeedback.is_helpful == True, 1), else_=0)),
+).group_by(ReviewFeedback.rating)
+
+# All review quality metrics in one statement. Feedback correlation is a
+# scalar subquery; counting distinct foreign keys only touches
+# review_feedback (and its index).
+_QUALITY_METRICS_STMT = select(
+    func.count(ReviewRecord.id),
+    func.sum(case((ReviewRecord.review_status == ReviewStatus.SUCCESS, 1), else_=0)),
+    func.sum(case((ReviewRecord.cache_hit == True, 1), else_=0)),
+    func.avg(ReviewRecord.api_latency_ms),
+    select(
+        func.count(func.distinct(ReviewFeedback.review_record_id))
+    ).scalar_subquery(),
+)
+
+# Cheap change signatures for conditional GETs: any write that can change an
+# analytics payload changes one of these values
+_FEEDBACK_SIGNATURE_STMT = select(func.count(), func.max(ReviewFeedback.created_at))
+_QUALITY_SIGNATURE_STMT = select(
+    func.count(ReviewRecord.id),
+    func.max(ReviewRecord.updated_at),
+    select(func.count()).select_from(ReviewFeedback).scalar_subquery(),
+)
+
+# Column-only feedback rows for one review, oldest first
+_FEEDBACK_ROWS_STMT = (
+    select(
+        ReviewFeedback.id,
+        ReviewFeedback.rating,
+        ReviewFeedback.is_helpful,
+        ReviewFeedback.comment,
+        ReviewFeedback.created_at,
+    )
+    .where(ReviewFeedback.review_record_id == bindparam("review_id"))
+    .order_by(ReviewFeedback.created_at)
+)
+
+
+def _exc_info() -> bool:
+    """Only format tracebacks when debug logging is on."""
+    return logger.is_enabled_for(logging.DEBUG)
+
+
+def _analytics_etag(db: Session, signature_stmt) -> str:
+    """
+    Build a strong ETag from an analytics signature query.
+
+    Args:
+        db: Database session
+        signature_stmt: Statement returning one row that changes with the data
+
+    Returns:
+        Quoted ETag value
+    """
+    signature = tuple(db.execute(signature_stmt).one())
+    digest = hashlib.blake2b(repr(signature).encode("utf-8"), digest_size=8)
+    return f'"{digest.hexdigest()}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header (weak comparison) against an ETag."""
+    if not if_none_match:
+        return False
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(
+        tag == "*" or tag.removeprefix("W/") == etag for tag in candidates
+    )
 
 
 class FeedbackRequest:
@@ -36,9 +132,163 @@ class FeedbackRequest:
         self.comment = comment
 
 
+class FeedbackBatchItem(BaseModel):
+    """Single entry in a batch feedback submission."""
+
+    review_id: uuid.UUID
+    rating: int = Field(ge=1, le=5)
+    is_helpful: bool
+    comment: Optional[str] = None
+
+
+@router.get("/api/reviews/analytics/feedback")
+async def feedback_analytics(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db_session),
+):
+    """
+    Get feedback analytics across all reviews.
+
+    Answers 304 when If-None-Match carries the current ETag; a cached
+    payload is only served while its ETag is still current.
+
+    Returns:
+        Analytics summary
+    """
+    try:
+        etag = await asyncio.to_thread(_analytics_etag, db, _FEEDBACK_SIGNATURE_STMT)
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+
+        analytics_cache = get_analytics_cache()
+        cached = await analytics_cache.get(FEEDBACK_ANALYTICS_KEY)
+        if cached is not None and cached["etag"] == etag:
+            return cached["data"]
+
+        histogram = await asyncio.to_thread(
+            lambda: db.execute(_FEEDBACK_HISTOGRAM_STMT).all()
+        )
+
+        total_feedback = sum(count for _, count, _ in histogram)
+        if not total_feedback:
+            result = {
+                "total_feedback": 0,
+                "average_rating": 0,
+                "helpful_percentage": 0,
+                "feedback_by_rating": {},
+            }
+            await analytics_cache.set(
+                FEEDBACK_ANALYTICS_KEY, {"etag": etag, "data": result}
+            )
+            return result
+
+        helpful_count = sum(helpful or 0 for _, _, helpful in histogram)
+        average_rating = (
+            sum(rating * count for rating, count, _ in histogram) / total_feedback
+        )
+        helpful_percentage = (helpful_count / total_feedback) * 100
+
+        # Feedback by rating
+        counts = {rating: count for rating, count, _ in histogram}
+        feedback_by_rating = {i: counts.get(i, 0) for i in range(1, 6)}
+
+        logger.info(
+            "Feedback analytics generated",
+            total_feedback=total_feedback,
+            avg_rating=average_rating,
+        )
+
+        result = {
+            "total_feedback": total_feedback,
+            "average_rating": round(average_rating, 2),
+            "helpful_percentage": round(helpful_percentage, 2),
+            "feedback_by_rating": feedback_by_rating,
+        }
+        await analytics_cache.set(
+            FEEDBACK_ANALYTICS_KEY, {"etag": etag, "data": result}
+        )
+        return result
+
+    except Exception as e:
+        logger.error(
+            "Failed to generate feedback analytics", error=str(e), exc_info=_exc_info()
+        )
+        raise HTTPException(status_code=500, detail="Failed to generate analytics")
+
+
+@router.get("/api/reviews/analytics/quality")
+async def review_quality_analytics(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db_session),
+):
+    """
+    Analyze review quality based on feedback.
+
+    Answers 304 when If-None-Match carries the current ETag; a cached
+    payload is only served while its ETag is still current.
+
+    Returns:
+        Quality metrics and trends
+    """
+    try:
+        etag = await asyncio.to_thread(_analytics_etag, db, _QUALITY_SIGNATURE_STMT)
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+
+        analytics_cache = get_analytics_cache()
+        cached = await analytics_cache.get(QUALITY_ANALYTICS_KEY)
+        if cached is not None and cached["etag"] == etag:
+            return cached["data"]
+
+        (
+            total_reviews,
+            successful_reviews,
+            cache_hits,
+            avg_latency,
+            reviews_with_feedback,
+        ) = await asyncio.to_thread(lambda: db.execute(_QUALITY_METRICS_STMT).one())
+        successful_reviews = successful_reviews or 0
+        cache_hits = cache_hits or 0
+        avg_latency = float(avg_latency or 0)
+
+        # Cache hit rate
+        cache_hit_rate = (cache_hits / total_reviews * 100) if total_reviews > 0 else 0
+
+        logger.info(
+            "Quality analytics generated",
+            total_reviews=total_reviews,
+            success_rate=successful_reviews / total_reviews if total_reviews > 0 else 0,
+        )
+
+        result = {
+            "total_reviews": total_reviews,
+            "successful_reviews": successful_reviews,
+            "success_rate": (
+                successful_reviews / total_reviews if total_reviews > 0 else 0
+            ),
+            "average_latency_ms": round(avg_latency, 2),
+            "cache_hit_rate": round(cache_hit_rate, 2),
+            "reviews_with_feedback": reviews_with_feedback,
+        }
+        await analytics_cache.set(
+            QUALITY_ANALYTICS_KEY, {"etag": etag, "data": result}
+        )
+        return result
+
+    except Exception as e:
+        logger.error(
+            "Failed to generate quality analytics", error=str(e), exc_info=_exc_info()
+        )
+        raise HTTPException(status_code=500, detail="Failed to generate analytics")
+
+
 @router.post("/api/reviews/{review_id}/feedback")
 async def submit_feedback(
-    review_id: str,
+    review_id: uuid.UUID,
     rating: int,
     is_helpful: bool,
     comment: Optional[str] = None,
@@ -54,11 +304,6 @@ async def submit_feedback(
         comment: Optional feedback comment
     """
     try:
-        # Validate review exists
-        review = db.query(ReviewRecord).filter_by(id=review_id).first()
-        if not review:
-            raise HTTPException(status_code=404, detail="Review not found")
-
         # Validate feedback
         try:
             feedback_request = FeedbackRequest(
@@ -69,16 +314,31 @@ async def submit_feedback(
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
 
-        # Create feedback record
-        feedback = ReviewFeedback(
-            review_record_id=review_id,
-            rating=feedback_request.rating,
-            is_helpful=feedback_request.is_helpful,
-            comment=feedback_request.comment,
+        # Create feedback record. The review_record_id foreign key rejects
+        # unknown reviews, so no separate existence query is needed, and
+        # RETURNING avoids reloading the row after commit.
+        stmt = (
+            insert(ReviewFeedback)
+            .values(
+                id=uuid.uuid4(),
+                review_record_id=review_id,
+                rating=feedback_request.rating,
+                is_helpful=feedback_request.is_helpful,
+                comment=feedback_request.comment,
+            )
+            .returning(ReviewFeedback.id, ReviewFeedback.created_at)
         )
 
-        db.add(feedback)
-        db.commit()
+        try:
+            feedback_id, created_at = db.execute(stmt).one()
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(status_code=404, detail="Review not found")
+
+        await get_analytics_cache().invalidate(
+            FEEDBACK_ANALYTICS_KEY, QUALITY_ANALYTICS_KEY
+        )
 
         logger.info(
             "Feedback submitted",
@@ -89,159 +349,165 @@ async def submit_feedback(
 
         return {
             "status": "success",
-            "feedback_id": feedback.id,
-            "created_at": feedback.created_at.isoformat(),
+            "feedback_id": feedback_id,
+            "created_at": created_at.isoformat(),
         }
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to submit feedback: {e}", exc_info=True)
+        logger.error(
+            "Failed to submit feedback", error=str(e), exc_info=_exc_info()
+        )
         raise HTTPException(status_code=500, detail="Failed to submit feedback")
 
 
-@router.get("/api/reviews/{review_id}/feedback")
-async def get_review_feedback(
-    review_id: str,
+@router.post("/api/reviews/feedback/batch")
+async def submit_feedback_batch(
+    items: List[FeedbackBatchItem],
     db: Session = Depends(get_db_session),
 ):
     """
-    Get all feedback for a review.
+    Submit feedback for many reviews in one request.
 
     Args:
-        review_id: ID of the review
+        items: Feedback entries, each naming its review
 
     Returns:
-        List of feedback records
+        IDs of the created feedback records, in request order
     """
+    if not items:
+        raise HTTPException(status_code=400, detail="No feedback provided")
+    if len(items) > MAX_FEEDBACK_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch size exceeds {MAX_FEEDBACK_BATCH_SIZE}",
+        )
+
     try:
-        feedback_list = db.query(ReviewFeedback).filter_by(
-            review_record_id=review_id
-        ).all()
+        # Ids are generated here so one executemany INSERT is enough, with
+        # no per-row RETURNING or refresh round trips
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "review_record_id": item.review_id,
+                "rating": item.rating,
+                "is_helpful": item.is_helpful,
+                "comment": item.comment,
+            }
+            for item in items
+        ]
+
+        try:
+            db.execute(insert(ReviewFeedback), rows)
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(status_code=404, detail="Review not found")
+
+        await get_analytics_cache().invalidate(
+            FEEDBACK_ANALYTICS_KEY, QUALITY_ANALYTICS_KEY
+        )
+
+        logger.info("Feedback batch submitted", count=len(rows))
 
         return {
-            "review_id": review_id,
-            "feedback_count": len(feedback_list),
-            "feedback": [
-                {
-                    "id": f.id,
-                    "rating": f.rating,
-                    "is_helpful": f.is_helpful,
-                    "comment": f.comment,
-                    "created_at": f.created_at.isoformat(),
-                }
-                for f in feedback_list
-            ],
+            "status": "success",
+            "feedback_ids": [row["id"] for row in rows],
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Failed to get feedback: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Failed to get feedback")
+        logger.error(
+            "Failed to submit feedback batch", error=str(e), exc_info=_exc_info()
+        )
+        raise HTTPException(status_code=500, detail="Failed to submit feedback")
 
 
-@router.get("/api/reviews/analytics/feedback")
-async def feedback_analytics(
-    db: Session = Depends(get_db_session),
-):
+def _feedback_rows(db: Session, review_id: uuid.UUID):
     """
-    Get feedback analytics across all reviews.
+    Column-only feedback query streamed in batches (no ORM hydration).
 
-    Returns:
-        Analytics summary
+    Rows come oldest first, read in order from idx_feedback_review_created.
     """
-    try:
-        # Get all feedback
-        all_feedback = db.query(ReviewFeedback).all()
-
-        if not all_feedback:
-            return {
-                "total_feedback": 0,
-                "average_rating": 0,
-                "helpful_percentage": 0,
-                "feedback_by_rating": {},
-            }
-
-        # Calculate statistics
-        ratings = [f.rating for f in all_feedback]
-        helpful_count = sum(1 for f in all_feedback if f.is_helpful)
-
-        average_rating = sum(ratings) / len(ratings) if ratings else 0
-        helpful_percentage = (helpful_count / len(all_feedback)) * 100 if all_feedback else 0
+    return db.execute(
+        _FEEDBACK_ROWS_STMT,
+        {"review_id": review_id},
+        execution_options={"yield_per": FEEDBACK_FETCH_BATCH_SIZE},
+    )
 
-        # Feedback by rating
-        feedback_by_rating = {}
-        for i in range(1, 6):
-            feedback_by_rating[i] = sum(1 for f in all_feedback if f.rating == i)
-
-        logger.info(
-            "Feedback analytics generated",
-            total_feedback=len(all_feedback),
-            avg_rating=average_rating,
-        )
 
-        return {
-            "total_feedback": len(all_feedback),
-            "average_rating": round(average_rating, 2),
-            "helpful_percentage": round(helpful_percentage, 2),
-            "feedback_by_rating": feedback_by_rating,
-        }
+def _stream_feedback_ndjson(review_id: uuid.UUID):
+    """
+    Yield feedback for a review as NDJSON lines.
 
-    except Exception as e:
-        logger.error(f"Failed to generate feedback analytics: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Failed to generate analytics")
+    Uses its own session because the request-scoped one is closed before
+    a streaming body is consumed.
+    """
+    db = database.SessionLocal()
+    try:
+        for feedback_id, rating, is_helpful, comment, created_at in _feedback_rows(
+            db, review_id
+        ):
+            yield orjson.dumps(
+                {
+                    "id": feedback_id,
+                    "rating": rating,
+                    "is_helpful": is_helpful,
+                    "comment": comment,
+                    "created_at": created_at,
+                }
+            ) + b"\n"
+    finally:
+        db.close()
 
 
-@router.get("/api/reviews/analytics/quality")
-async def review_quality_analytics(
+@router.get("/api/reviews/{review_id}/feedback")
+async def get_review_feedback(
+    review_id: uuid.UUID,
+    stream: bool = False,
     db: Session = Depends(get_db_session),
 ):
     """
-    Analyze review quality based on feedback.
+    Get all feedback for a review.
+
+    Args:
+        review_id: ID of the review
+        stream: Stream one JSON object per line (NDJSON) instead of a
+            single document, keeping memory flat for large reviews
 
     Returns:
-        Quality metrics and trends
+        List of feedback records
     """
-    try:
-        from sqlalchemy import func
-
-        # Calculate metrics
-        total_reviews = db.query(ReviewRecord).count()
-        successful_reviews = db.query(ReviewRecord).filter_by(
-            review_status="success"
-        ).count()
-
-        # Average latency
-        avg_latency = db.query(func.avg(ReviewRecord.api_latency_ms)).scalar() or 0
-
-        # Cache hit rate
-        cache_hits = db.query(ReviewRecord).filter_by(cache_hit=True).count()
-        cache_hit_rate = (cache_hits / total_reviews * 100) if total_reviews > 0 else 0
-
-        # Feedback correlation
-        reviews_with_feedback = (
-            db.query(ReviewRecord)
-            .join(ReviewFeedback)
-            .distinct()
-            .count()
+    if stream:
+        return StreamingResponse(
+            _stream_feedback_ndjson(review_id),
+            media_type="application/x-ndjson",
         )
 
-        logger.info(
-            "Quality analytics generated",
-            total_reviews=total_reviews,
-            success_rate=successful_reviews / total_reviews if total_reviews > 0 else 0,
-        )
+    try:
+        feedback_list = [
+            {
+                "id": feedback_id,
+                "rating": rating,
+                "is_helpful": is_helpful,
+                "comment": comment,
+                "created_at": created_at.isoformat(),
+            }
+            for feedback_id, rating, is_helpful, comment, created_at in _feedback_rows(
+                db, review_id
+            )
+        ]
 
         return {
-            "total_reviews": total_reviews,
-            "successful_reviews": successful_reviews,
-            "success_rate": (
-                successful_reviews / total_reviews if total_reviews > 0 else 0
-            ),
-            "average_latency_ms": round(avg_latency, 2),
-            "cache_hit_rate": round(cache_hit_rate, 2),
-            "reviews_with_feedback": reviews_with_feedback,
+            "review_id": review_id,
+            "feedback_count": len(feedback_list),
+            "feedback": feedback_list,
         }
 
     except Exception as e:
-        logger.error(f"Failed to generate quality analytics: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Failed to generate analytics")
+        logger.error(
+            "Failed to get feedback", error=str(e), exc_info=_exc_info()
+        )
+        raise HTTPException(status_code=500, detail="Failed to get feedback")
@@ -3,64 +3,216 @@ Health check and monitoring endpoints for REV2.
 Provides system status and Prometheus-compatible metrics.
 """
 
+import asyncio
 import os
+import threading
 import time
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, Any
 from pathlib import Path
 import shutil
+from collections import deque
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import case, func, select, text
 from sqlalchemy.orm import Session
 
-from backend.database import get_db_session, SessionLocal
+from backend.database import get_db_session, get_pool_status, SessionLocal
+from backend.db_models import ReviewRecord, ReviewStatus
 from backend.logger import get_logger
 from backend.config import INDEX_DIR, REPO_CACHE_DIR
+from backend.redis_client import get_redis_client
 
 logger = get_logger(__name__)
 router = APIRouter()
 
+MAX_TRACKED_DURATIONS = 1000
+DIR_SIZE_CACHE_TTL = 30  # seconds
+REDIS_METRICS_PREFIX = "rev2:metrics:"
+
+
+class _Counter:
+    """
+    Counter safe to bump from concurrent threads.
+    The read-modify-write happens under a lock, so increments are never lost
+    and value never goes backwards; reading value needs no lock.
+    """
+
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def increment(self):
+        with self._lock:
+            self.value += 1
+
+
+def _counter_property(name: str) -> property:
+    return property(lambda self: self._counters[name].value)
+
+
 # Metrics storage
 class MetricsStore:
-    """In-memory metrics storage."""
+    """
+    In-memory metrics storage.
+    Counters are mirrored to Redis (when configured) so totals are correct
+    across uvicorn workers.
+    """
+
+    COUNTERS = (
+        "reviews_total",
+        "reviews_success",
+        "reviews_failure",
+        "api_errors_total",
+        "rate_limit_hits_total",
+    )
+
+    reviews_total = _counter_property("reviews_total")
+    reviews_success = _counter_property("reviews_success")
+    reviews_failure = _counter_property("reviews_failure")
+    api_errors_total = _counter_property("api_errors_total")
+    rate_limit_hits_total = _counter_property("rate_limit_hits_total")
+
     def __init__(self):
-        self.reviews_total = 0
-        self.reviews_success = 0
-        self.reviews_failure = 0
-        self.api_errors_total = 0
-        self.rate_limit_hits_total = 0
-        self.review_durations = []  # List of durations in ms
+        self._counters = {name: _Counter() for name in self.COUNTERS}
+        # Ring buffer of recent durations in ms, with a running sum
+        self.review_durations = deque(maxlen=MAX_TRACKED_DURATIONS)
+        self.review_durations_sum = 0.0
+        self._durations_lock = threading.Lock()
         self.last_reset = time.time()
 
+    def _increment(self, *names: str):
+        """Bump local counters and mirror them to Redis in one round trip."""
+        for name in names:
+            self._counters[name].increment()
+
+        redis_client = get_redis_client()
+        if redis_client is None:
+            return
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for name in names:
+                pipe.incr(REDIS_METRICS_PREFIX + name)
+            pipe.execute()
+        except Exception as e:
+            logger.warning("Failed to update Redis metrics", error=str(e))
+
+    def get_totals(self) -> Dict[str, int]:
+        """
+        Get counter totals, aggregated across workers when Redis is
+        configured, otherwise for this process only.
+        """
+        redis_client = get_redis_client()
+        if redis_client is not None:
+            try:
+                values = redis_client.mget(
+                    [REDIS_METRICS_PREFIX + name for name in self.COUNTERS]
+                )
+                return {
+                    name: int(value or 0)
+                    for name, value in zip(self.COUNTERS, values)
+                }
+            except Exception as e:
+                logger.warning("Failed to read Redis metrics", error=str(e))
+
+        return {name: counter.value for name, counter in self._counters.items()}
+
     def record_review(self, success: bool, duration_ms: float):
         """Record a review completion."""
-        self.reviews_total += 1
-        if success:
-            self.reviews_success += 1
-        else:
-            self.reviews_failure += 1
-        self.review_durations.append(duration_ms)
-        # Keep only last 1000 durations to avoid memory bloat
-        if len(self.review_durations) > 1000:
-            self.review_durations = self.review_durations[-1000:]
+        self._increment(
+            "reviews_total",
+            "reviews_success" if success else "reviews_failure",
+        )
+        # The deque evicts the oldest entry on append once full; the lock
+        # keeps the running sum in step with it across review threads
+        with self._durations_lock:
+            if len(self.review_durations) == self.review_durations.maxlen:
+                self.review_durations_sum -= self.review_durations[0]
+            self.review_durations.append(duration_ms)
+            self.review_durations_sum += duration_ms
 
     def record_api_error(self):
         """Record an API error."""
-        self.api_errors_total += 1
+        self._increment("api_errors_total")
 
     def record_rate_limit_hit(self):
         """Record a rate limit hit."""
-        self.rate_limit_hits_total += 1
+        self._increment("rate_limit_hits_total")
 
     def get_avg_duration_ms(self) -> float:
         """Get average review duration."""
-        if not self.review_durations:
-            return 0.0
-        return sum(self.review_durations) / len(self.review_durations)
+        with self._durations_lock:
+            if not self.review_durations:
+                return 0.0
+            return self.review_durations_sum / len(self.review_durations)
 
 
 metrics = MetricsStore()
 
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+_METRICS_TEMPLATE = """\
+# HELP rev2_reviews_total Total number of reviews performed
+# TYPE rev2_reviews_total counter
+rev2_reviews_total{status="success"} %(success)d
+rev2_reviews_total{status="failure"} %(failure)d
+
+# HELP rev2_review_duration_ms Review processing duration in milliseconds
+# TYPE rev2_review_duration_ms histogram
+rev2_review_duration_ms_sum %(duration_sum)s
+rev2_review_duration_ms_count %(duration_count)d
+rev2_review_duration_ms_avg %(duration_avg)s
+
+# HELP rev2_index_cache_size_bytes Size of index cache in bytes
+# TYPE rev2_index_cache_size_bytes gauge
+rev2_index_cache_size_bytes %(index_size)d
+
+# HELP rev2_api_errors_total Total API errors
+# TYPE rev2_api_errors_total counter
+rev2_api_errors_total %(api_errors)d
+
+# HELP rev2_rate_limit_hits_total Total rate limit hits
+# TYPE rev2_rate_limit_hits_total counter
+rev2_rate_limit_hits_total %(rate_limit_hits)d
+"""
+
+def _utcnow_iso() -> str:
+    """Current UTC time as an ISO 8601 string with a Z suffix."""
+    return (
+        datetime.now(timezone.utc)
+        .isoformat(timespec="milliseconds")
+        .replace("+00:00", "Z")
+    )
+
+
+# {path: (size_bytes, computed_at)}, so scrapes don't walk the tree each time
+_dir_size_cache: Dict[Path, tuple] = {}
+
+
+def _get_dir_size(path: Path, ttl: float = DIR_SIZE_CACHE_TTL) -> int:
+    """
+    Get total size of files under a directory, cached for ttl seconds.
+
+    Args:
+        path: Directory to measure
+        ttl: Seconds a computed size stays valid
+
+    Returns:
+        Size in bytes (0 if the directory does not exist)
+    """
+    cached = _dir_size_cache.get(path)
+    now = time.monotonic()
+    if cached and now - cached[1] < ttl:
+        return cached[0]
+
+    size = 0
+    if path.exists():
+        size = sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+    _dir_size_cache[path] = (size, now)
+    return size
+
 
 @router.get("/health")
 async def health_check() -> Dict[str, Any]:
@@ -70,7 +222,7 @@ async def health_check() -> Dict[str, Any]:
     """
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": _utcnow_iso(),
     }
 
 
@@ -86,8 +238,12 @@ async def detailed_health_check(
 
     # Database connectivity
     try:
-        db.execute("SELECT 1")
-        checks["database"] = {"status": "healthy", "message": "Connected"}
+        db.execute(text("SELECT 1")).scalar()
+        checks["database"] = {
+            "status": "healthy",
+            "message": "Connected",
+            "pool": get_pool_status(),
+        }
     except Exception as e:
         checks["database"] = {
             "status": "unhealthy",
@@ -121,9 +277,7 @@ async def detailed_health_check(
     # Cache directory
     try:
         if REPO_CACHE_DIR.exists():
-            cache_size_mb = sum(
-                f.stat().st_size for f in REPO_CACHE_DIR.rglob("*") if f.is_file()
-            ) / (1024 ** 2)
+            cache_size_mb = _get_dir_size(REPO_CACHE_DIR) / (1024 ** 2)
             checks["cache"] = {
                 "status": "healthy",
                 "size_mb": round(cache_size_mb, 2),
@@ -150,52 +304,30 @@ async def detailed_health_check(
 
     return {
         "status": overall_status,
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": _utcnow_iso(),
         "checks": checks,
     }
 
 
-@router.get("/metrics")
-async def prometheus_metrics() -> str:
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics() -> PlainTextResponse:
     """
     Prometheus-compatible metrics endpoint.
-    Returns metrics in OpenMetrics format.
+    Returns metrics in the Prometheus text exposition format.
     """
-    avg_duration = metrics.get_avg_duration_ms()
-
-    # Index and cache sizes
-    index_size_bytes = 0
-    if INDEX_DIR.exists():
-        index_size_bytes = sum(
-            f.stat().st_size for f in INDEX_DIR.rglob("*") if f.is_file()
-        )
-
-    metrics_lines = [
-        "# HELP rev2_reviews_total Total number of reviews performed",
-        "# TYPE rev2_reviews_total counter",
-        f"rev2_reviews_total{{status=\"success\"}} {metrics.reviews_success}",
-        f"rev2_reviews_total{{status=\"failure\"}} {metrics.reviews_failure}",
-        "",
-        "# HELP rev2_review_duration_ms Review processing duration in milliseconds",
-        "# TYPE rev2_review_duration_ms histogram",
-        f"rev2_review_duration_ms_sum {sum(metrics.review_durations)}",
-        f"rev2_review_duration_ms_count {len(metrics.review_durations)}",
-        f"rev2_review_duration_ms_avg {avg_duration}",
-        "",
-        "# HELP rev2_index_cache_size_bytes Size of index cache in bytes",
-        "# TYPE rev2_index_cache_size_bytes gauge",
-        f"rev2_index_cache_size_bytes {index_size_bytes}",
-        "",
-        "# HELP rev2_api_errors_total Total API errors",
-        "# TYPE rev2_api_errors_total counter",
-        f"rev2_api_errors_total {metrics.api_errors_total}",
-        "",
-        "# HELP rev2_rate_limit_hits_total Total rate limit hits",
-        "# TYPE rev2_rate_limit_hits_total counter",
-        f"rev2_rate_limit_hits_total {metrics.rate_limit_hits_total}",
-    ]
-
-    return "\n".join(metrics_lines)
+    # get_totals may wait on Redis; keep that off the event loop
+    totals = await asyncio.to_thread(metrics.get_totals)
+    body = _METRICS_TEMPLATE % {
+        "success": totals["reviews_success"],
+        "failure": totals["reviews_failure"],
+        "duration_sum": metrics.review_durations_sum,
+        "duration_count": len(metrics.review_durations),
+        "duration_avg": metrics.get_avg_duration_ms(),
+        "index_size": _get_dir_size(INDEX_DIR),
+        "api_errors": totals["api_errors_total"],
+        "rate_limit_hits": totals["rate_limit_hits_total"],
+    }
+    return PlainTextResponse(body, media_type=PROMETHEUS_CONTENT_TYPE)
 
 
 @router.get("/metrics/summary")
@@ -206,26 +338,27 @@ async def metrics_summary(
     Human-readable metrics summary.
     Shows recent review statistics and system health.
     """
-    from backend.db_models import ReviewRecord
-
-    # Count reviews by status
-    total_reviews = db.query(ReviewRecord).count()
-    success_reviews = db.query(ReviewRecord).filter_by(
-        review_status="success"
-    ).count()
-    failure_reviews = db.query(ReviewRecord).filter_by(
-        review_status="failure"
-    ).count()
-
-    avg_duration = (
-        db.query(ReviewRecord.api_latency_ms)
-        .filter(ReviewRecord.api_latency_ms.isnot(None))
-        .scalar()
-        or 0
-    )
+    # Count reviews by status and average latency in a single pass
+    total_reviews, success_reviews, failure_reviews, avg_duration = db.execute(
+        select(
+            func.count(ReviewRecord.id),
+            func.sum(
+                case((ReviewRecord.review_status == ReviewStatus.SUCCESS, 1), else_=0)
+            ),
+            func.sum(
+                case((ReviewRecord.review_status == ReviewStatus.FAILURE, 1), else_=0)
+            ),
+            func.avg(ReviewRecord.api_latency_ms),
+        )
+    ).one()
+    # get_totals may wait on Redis; keep that off the event loop
+    totals = await asyncio.to_thread(metrics.get_totals)
+    success_reviews = success_reviews or 0
+    failure_reviews = failure_reviews or 0
+    avg_duration = float(avg_duration or 0)
 
     return {
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": _utcnow_iso(),
         "reviews": {
             "total": total_reviews,
             "success": success_reviews,
@@ -237,17 +370,11 @@ async def metrics_summary(
         "performance": {
             "avg_review_duration_ms": avg_duration,
             "reviews_in_memory": {
-                "total": metrics.reviews_total,
+                "total": totals["reviews_total"],
                 "avg_duration_ms": metrics.get_avg_duration_ms(),
             },
         },
         "system": {
-            "index_cache_bytes": (
-                sum(
-                    f.stat().st_size for f in INDEX_DIR.rglob("*") if f.is_file()
-                )
-                if INDEX_DIR.exists()
-                else 0
-            ),
+            "index_cache_bytes": _get_dir_size(INDEX_DIR),
         },
     }
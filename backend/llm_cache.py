@@ -0,0 +1,48 @@
+"""
+LLM response cache for REV2.
+Identical prompts reuse the previous review instead of calling the provider
+again. Backed by Redis when configured, otherwise an in-process LRU.
+"""
+
+import hashlib
+from typing import Optional
+
+from backend.ttl_cache import LOCAL_CACHE_SIZE, TTLCache
+
+# Bump when the review prompt template changes so stale reviews aren't served
+PROMPT_CACHE_VERSION = "v1"
+LLM_CACHE_TTL = 3600  # seconds
+REDIS_KEY_PREFIX = "rev2:llm:"
+
+
+class LLMResponseCache(TTLCache):
+    """TTL cache of generated reviews keyed by prompt hash."""
+
+    def __init__(self, max_size: int = LOCAL_CACHE_SIZE):
+        super().__init__("llm", REDIS_KEY_PREFIX, LLM_CACHE_TTL, max_size)
+
+    @staticmethod
+    def make_key(prompt: str) -> str:
+        """
+        Build the cache key for a prompt.
+
+        Args:
+            prompt: The review prompt
+
+        Returns:
+            Hex SHA-256 of the versioned prompt
+        """
+        salted = f"{PROMPT_CACHE_VERSION}:{prompt}".encode("utf-8")
+        return hashlib.sha256(salted).hexdigest()
+
+
+# Global LLM response cache
+_llm_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Get or create global LLM response cache."""
+    global _llm_cache
+    if _llm_cache is None:
+        _llm_cache = LLMResponseCache()
+    return _llm_cache
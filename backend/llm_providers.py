@@ -3,16 +3,192 @@ Abstract LLM providers for multi-model support.
 Supports Gemini, Claude, GPT-4, and local endpoints.
 """
 
+import asyncio
 import os
+import time
 from abc import ABC, abstractmethod
-from typing import Optional
+from functools import lru_cache
+from typing import Awaitable, Callable, Optional, Type
 import google.generativeai as genai
 from google.api_core.exceptions import ResourceExhausted
 
+from backend.llm_cache import get_llm_cache
 from backend.logger import get_logger
 
+
+class _SDKNotInstalled(Exception):
+    """Placeholder for SDK exception types when the SDK isn't installed."""
+
+
+class EmptyResponseError(RuntimeError):
+    """Raised when a provider answers without any review text."""
+
+
+try:
+    from anthropic import RateLimitError as AnthropicRateLimit
+except ImportError:
+    AnthropicRateLimit = _SDKNotInstalled
+
+try:
+    from openai import RateLimitError as OpenAIRateLimit
+except ImportError:
+    OpenAIRateLimit = _SDKNotInstalled
+
 logger = get_logger(__name__)
 
+# Connection pool shared by the async Claude and GPT-4 clients
+LLM_MAX_CONNECTIONS = 100
+LLM_MAX_KEEPALIVE_CONNECTIONS = 20
+_async_http_client = None
+
+
+def _get_async_http_client():
+    """Get or create the shared HTTP/2 client for async LLM SDKs."""
+    global _async_http_client
+    if _async_http_client is None:
+        import httpx
+        _async_http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+    return _async_http_client
+
+
+# SDK clients are cached per API key so every provider instance in the
+# worker shares the same transport and connection pool.
+@lru_cache(maxsize=None)
+def _shared_gemini_model(api_key: str, model_name: str):
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(model_name)
+
+
+@lru_cache(maxsize=None)
+def _shared_anthropic_clients(api_key: str) -> tuple:
+    from anthropic import Anthropic, AsyncAnthropic
+    return (
+        Anthropic(api_key=api_key),
+        AsyncAnthropic(api_key=api_key, http_client=_get_async_http_client()),
+    )
+
+
+@lru_cache(maxsize=None)
+def _shared_openai_clients(api_key: str) -> tuple:
+    from openai import AsyncOpenAI, OpenAI
+    return (
+        OpenAI(api_key=api_key),
+        AsyncOpenAI(api_key=api_key, http_client=_get_async_http_client()),
+    )
+
+
+# Backoff between attempts: rate limits double from the initial delay,
+# other errors retry after a fixed pause
+RATE_LIMIT_INITIAL_DELAY = 10  # seconds
+ERROR_RETRY_DELAY = 5  # seconds
+
+
+def _log_retry(
+    provider: str,
+    error: Exception,
+    rate_limited: bool,
+    attempt: int,
+    max_retries: int,
+):
+    """Log a failed attempt: rate limits as warnings, other errors as errors."""
+    if rate_limited:
+        logger.warning(
+            "LLM rate limit hit",
+            provider=provider,
+            attempt=attempt + 1,
+            max_retries=max_retries,
+        )
+    else:
+        logger.error("LLM API error", provider=provider, error=str(error))
+
+
+def _call_with_retries(
+    call: Callable[[], str],
+    provider: str,
+    rate_limit_error: Type[Exception],
+    max_retries: int,
+) -> str:
+    """
+    Call a provider, retrying rate limits and transient errors.
+
+    Args:
+        call: Makes one API request and returns the review text
+        provider: Provider name for logs
+        rate_limit_error: SDK exception signalling a rate limit
+        max_retries: Maximum attempts
+
+    Returns:
+        Review text
+
+    Raises:
+        EmptyResponseError: If the provider returned no text (not retried)
+    """
+    delay = RATE_LIMIT_INITIAL_DELAY
+    for attempt in range(max_retries):
+        try:
+            return call()
+        except EmptyResponseError:
+            raise
+        except Exception as e:
+            rate_limited = isinstance(e, rate_limit_error)
+            _log_retry(provider, e, rate_limited, attempt, max_retries)
+            if attempt == max_retries - 1:
+                raise
+            if rate_limited:
+                time.sleep(delay)
+                delay *= 2
+            else:
+                time.sleep(ERROR_RETRY_DELAY)
+
+    raise RuntimeError("Review failed after all retries")
+
+
+async def _call_with_retries_async(
+    call: Callable[[], Awaitable[str]],
+    provider: str,
+    rate_limit_error: Type[Exception],
+    max_retries: int,
+) -> str:
+    """
+    Async counterpart of _call_with_retries; backs off with asyncio.sleep.
+
+    Args:
+        call: Returns an awaitable making one API request for the review text
+        provider: Provider name for logs
+        rate_limit_error: SDK exception signalling a rate limit
+        max_retries: Maximum attempts
+
+    Returns:
+        Review text
+
+    Raises:
+        EmptyResponseError: If the provider returned no text (not retried)
+    """
+    delay = RATE_LIMIT_INITIAL_DELAY
+    for attempt in range(max_retries):
+        try:
+            return await call()
+        except EmptyResponseError:
+            raise
+        except Exception as e:
+            rate_limited = isinstance(e, rate_limit_error)
+            _log_retry(provider, e, rate_limited, attempt, max_retries)
+            if attempt == max_retries - 1:
+                raise
+            if rate_limited:
+                await asyncio.sleep(delay)
+                delay *= 2
+            else:
+                await asyncio.sleep(ERROR_RETRY_DELAY)
+
+    raise RuntimeError("Review failed after all retries")
+
 
 class CodeReviewProvider(ABC):
     """Abstract base class for code review LLM providers."""
@@ -28,6 +204,26 @@ class CodeReviewProvider(ABC):
 
         Returns:
             Review text
+
+        Raises:
+            EmptyResponseError: If the provider returned no text
+        """
+        pass
+
+    @abstractmethod
+    async def generate_review_async(self, prompt: str, max_retries: int = 3) -> str:
+        """
+        Generate a code review without blocking the event loop.
+
+        Args:
+            prompt: The review prompt
+            max_retries: Maximum retries on rate limit
+
+        Returns:
+            Review text
+
+        Raises:
+            EmptyResponseError: If the provider returned no text
         """
         pass
 
@@ -51,8 +247,7 @@ class GeminiProvider(CodeReviewProvider):
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
         self.model_name = model_name
         if self.api_key:
-            genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel(model_name)
+            self.model = _shared_gemini_model(self.api_key, model_name)
         else:
             self.model = None
 
@@ -60,42 +255,36 @@ class GeminiProvider(CodeReviewProvider):
     def provider_name(self) -> str:
         return "gemini"
 
+    @staticmethod
+    def _review_text(response) -> str:
+        if response and response.text:
+            logger.debug("Gemini API call successful")
+            return response.text
+        raise EmptyResponseError("No response from Gemini API")
+
     def generate_review(self, prompt: str, max_retries: int = 3) -> str:
         """Generate review using Gemini API."""
         if not self.model:
             raise RuntimeError("Gemini API not configured")
 
-        import time
-        delay = 10
-
-        for attempt in range(max_retries):
-            try:
-                response = self.model.generate_content(prompt)
-                if response and response.text:
-                    logger.debug("Gemini API call successful")
-                    return response.text
-                return "No response from Gemini API"
+        return _call_with_retries(
+            lambda: self._review_text(self.model.generate_content(prompt)),
+            self.provider_name,
+            ResourceExhausted,
+            max_retries,
+        )
 
-            except ResourceExhausted:
-                logger.warning(
-                    "Gemini rate limit hit",
-                    attempt=attempt + 1,
-                    max_retries=max_retries,
-                )
-                if attempt < max_retries - 1:
-                    time.sleep(delay)
-                    delay *= 2
-                else:
-                    raise
+    async def generate_review_async(self, prompt: str, max_retries: int = 3) -> str:
+        """Generate review using Gemini's async API."""
+        if not self.model:
+            raise RuntimeError("Gemini API not configured")
 
-            except Exception as e:
-                logger.error(f"Gemini API error: {str(e)}")
-                if attempt < max_retries - 1:
-                    time.sleep(5)
-                else:
-                    raise
+        async def call():
+            return self._review_text(await self.model.generate_content_async(prompt))
 
-        return "Review failed after all retries"
+        return await _call_with_retries_async(
+            call, self.provider_name, ResourceExhausted, max_retries
+        )
 
     def health_check(self) -> bool:
         """Check Gemini API health."""
@@ -106,7 +295,7 @@ class GeminiProvider(CodeReviewProvider):
             response = self.model.generate_content("Say 'OK'")
             return response and response.text
         except Exception as e:
-            logger.warning(f"Gemini health check failed: {e}")
+            logger.warning("Gemini health check failed", error=str(e))
             return False
 
 
@@ -119,59 +308,62 @@ class ClaudeProvider(CodeReviewProvider):
         self.model_name = model_name
         if self.api_key:
             try:
-                from anthropic import Anthropic
-                self.client = Anthropic(api_key=self.api_key)
+                self.client, self.async_client = _shared_anthropic_clients(
+                    self.api_key
+                )
             except ImportError:
                 logger.warning("anthropic library not installed")
                 self.client = None
+                self.async_client = None
         else:
             self.client = None
+            self.async_client = None
 
     @property
     def provider_name(self) -> str:
         return "claude"
 
+    def _request(self, prompt: str) -> dict:
+        return {
+            "model": self.model_name,
+            "max_tokens": 2048,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+
+    @staticmethod
+    def _review_text(message) -> str:
+        if message.content:
+            logger.debug("Claude API call successful")
+            return message.content[0].text
+        raise EmptyResponseError("No response from Claude API")
+
     def generate_review(self, prompt: str, max_retries: int = 3) -> str:
         """Generate review using Claude API."""
         if not self.client:
             raise RuntimeError("Claude API not configured")
 
-        import time
-        delay = 10
+        return _call_with_retries(
+            lambda: self._review_text(
+                self.client.messages.create(**self._request(prompt))
+            ),
+            self.provider_name,
+            AnthropicRateLimit,
+            max_retries,
+        )
 
-        for attempt in range(max_retries):
-            try:
-                message = self.client.messages.create(
-                    model=self.model_name,
-                    max_tokens=2048,
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ]
-                )
-                if message.content:
-                    logger.debug("Claude API call successful")
-                    return message.content[0].text
-                return "No response from Claude API"
+    async def generate_review_async(self, prompt: str, max_retries: int = 3) -> str:
+        """Generate review using the async Claude client."""
+        if not self.async_client:
+            raise RuntimeError("Claude API not configured")
 
-            except Exception as e:
-                if "rate_limit" in str(e).lower():
-                    logger.warning(
-                        "Claude rate limit hit",
-                        attempt=attempt + 1,
-                    )
-                    if attempt < max_retries - 1:
-                        time.sleep(delay)
-                        delay *= 2
-                    else:
-                        raise
-                else:
-                    logger.error(f"Claude API error: {str(e)}")
-                    if attempt < max_retries - 1:
-                        time.sleep(5)
-                    else:
-                        raise
-
-        return "Review failed after all retries"
+        async def call():
+            return self._review_text(
+                await self.async_client.messages.create(**self._request(prompt))
+            )
+
+        return await _call_with_retries_async(
+            call, self.provider_name, AnthropicRateLimit, max_retries
+        )
 
     def health_check(self) -> bool:
         """Check Claude API health."""
@@ -185,7 +377,7 @@ class ClaudeProvider(CodeReviewProvider):
             )
             return message and message.content
         except Exception as e:
-            logger.warning(f"Claude health check failed: {e}")
+            logger.warning("Claude health check failed", error=str(e))
             return False
 
 
@@ -198,61 +390,68 @@ class GPT4Provider(CodeReviewProvider):
         self.model_name = model_name
         if self.api_key:
             try:
-                from openai import OpenAI
-                self.client = OpenAI(api_key=self.api_key)
+                self.client, self.async_client = _shared_openai_clients(
+                    self.api_key
+                )
             except ImportError:
                 logger.warning("openai library not installed")
                 self.client = None
+                self.async_client = None
         else:
             self.client = None
+            self.async_client = None
 
     @property
     def provider_name(self) -> str:
         return "gpt4"
 
+    def _request(self, prompt: str) -> dict:
+        return {
+            "model": self.model_name,
+            "messages": [
+                {"role": "system", "content": "You are an expert code reviewer."},
+                {"role": "user", "content": prompt},
+            ],
+            "temperature": 0.7,
+            "max_tokens": 2048,
+        }
+
+    @staticmethod
+    def _review_text(response) -> str:
+        if response.choices and response.choices[0].message.content:
+            logger.debug("GPT-4 API call successful")
+            return response.choices[0].message.content
+        raise EmptyResponseError("No response from GPT-4 API")
+
     def generate_review(self, prompt: str, max_retries: int = 3) -> str:
         """Generate review using GPT-4 API."""
         if not self.client:
             raise RuntimeError("GPT-4 API not configured")
 
-        import time
-        delay = 10
+        return _call_with_retries(
+            lambda: self._review_text(
+                self.client.chat.completions.create(**self._request(prompt))
+            ),
+            self.provider_name,
+            OpenAIRateLimit,
+            max_retries,
+        )
 
-        for attempt in range(max_retries):
-            try:
-                response = self.client.chat.completions.create(
-                    model=self.model_name,
-                    messages=[
-                        {"role": "system", "content": "You are an expert code reviewer."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.7,
-                    max_tokens=2048,
+    async def generate_review_async(self, prompt: str, max_retries: int = 3) -> str:
+        """Generate review using the async GPT-4 client."""
+        if not self.async_client:
+            raise RuntimeError("GPT-4 API not configured")
+
+        async def call():
+            return self._review_text(
+                await self.async_client.chat.completions.create(
+                    **self._request(prompt)
                 )
-                if response.choices and response.choices[0].message.content:
-                    logger.debug("GPT-4 API call successful")
-                    return response.choices[0].message.content
-                return "No response from GPT-4 API"
+            )
 
-            except Exception as e:
-                if "rate_limit" in str(e).lower():
-                    logger.warning(
-                        "GPT-4 rate limit hit",
-                        attempt=attempt + 1,
-                    )
-                    if attempt < max_retries - 1:
-                        time.sleep(delay)
-                        delay *= 2
-                    else:
-                        raise
-                else:
-                    logger.error(f"GPT-4 API error: {str(e)}")
-                    if attempt < max_retries - 1:
-                        time.sleep(5)
-                    else:
-                        raise
-
-        return "Review failed after all retries"
+        return await _call_with_retries_async(
+            call, self.provider_name, OpenAIRateLimit, max_retries
+        )
 
     def health_check(self) -> bool:
         """Check GPT-4 API health."""
@@ -266,7 +465,7 @@ class GPT4Provider(CodeReviewProvider):
             )
             return response and response.choices
         except Exception as e:
-            logger.warning(f"GPT-4 health check failed: {e}")
+            logger.warning("GPT-4 health check failed", error=str(e))
             return False
 
 
@@ -288,6 +487,7 @@ class LLMProviderManager:
         self.primary_provider_name = primary_provider
         self.fallback_provider_name = fallback_provider
         self.providers = self._initialize_providers()
+        self.response_cache = get_llm_cache()
 
     def _initialize_providers(self) -> dict:
         """Initialize all configured providers."""
@@ -315,29 +515,42 @@ class LLMProviderManager:
         elif provider_name == "gpt4":
             return GPT4Provider()
         else:
-            logger.warning(f"Unknown provider: {provider_name}")
+            logger.warning("Unknown provider", provider=provider_name)
             return None
 
-    def generate_review(self, prompt: str) -> tuple:
+    async def generate_review(self, prompt: str) -> tuple:
         """
         Generate review with fallback.
+        Identical prompts are served from the response cache.
 
         Returns:
             Tuple of (review_text, provider_used)
         """
+        cache_key = self.response_cache.make_key(prompt)
+        cached = await self.response_cache.get(cache_key)
+        if cached:
+            logger.info("Review served from cache", provider=cached["provider"])
+            return cached["review"], cached["provider"]
+
         # Try primary provider
         if self.primary_provider_name in self.providers:
             try:
                 provider = self.providers[self.primary_provider_name]
-                review = provider.generate_review(prompt)
+                review = await provider.generate_review_async(prompt)
+                if not review:
+                    raise EmptyResponseError("Provider returned no review text")
                 logger.info(
                     "Review generated",
                     provider=self.primary_provider_name,
                 )
+                await self.response_cache.set(
+                    cache_key, {"review": review, "provider": self.primary_provider_name}
+                )
                 return review, self.primary_provider_name
             except Exception as e:
                 logger.warning(
-                    f"Primary provider failed: {e}",
+                    "Primary provider failed",
+                    error=str(e),
                     provider=self.primary_provider_name,
                 )
 
@@ -345,29 +558,50 @@ class LLMProviderManager:
         if self.fallback_provider_name and self.fallback_provider_name in self.providers:
             try:
                 provider = self.providers[self.fallback_provider_name]
-                review = provider.generate_review(prompt)
+                review = await provider.generate_review_async(prompt)
+                if not review:
+                    raise EmptyResponseError("Provider returned no review text")
                 logger.info(
                     "Review generated (fallback)",
                     provider=self.fallback_provider_name,
                 )
+                await self.response_cache.set(
+                    cache_key, {"review": review, "provider": self.fallback_provider_name}
+                )
                 return review, self.fallback_provider_name
             except Exception as e:
                 logger.error(
-                    f"Fallback provider also failed: {e}",
+                    "Fallback provider also failed",
+                    error=str(e),
                     provider=self.fallback_provider_name,
                 )
 
         raise RuntimeError("All LLM providers failed")
 
-    def health_check(self) -> dict:
-        """Check health of all providers."""
+    async def health_check(self) -> dict:
+        """
+        Check health of all providers.
+
+        Provider checks are blocking network calls, so they run concurrently
+        in the default executor; total latency is that of the slowest one.
+        """
+        loop = asyncio.get_running_loop()
+        names = list(self.providers)
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(None, self.providers[name].health_check)
+                for name in names
+            ),
+            return_exceptions=True,
+        )
+
         status = {}
-        for name, provider in self.providers.items():
-            try:
-                status[name] = provider.health_check()
-            except Exception as e:
-                logger.warning(f"Health check failed for {name}: {e}")
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                logger.warning("Health check failed", provider=name, error=str(result))
                 status[name] = False
+            else:
+                status[name] = bool(result)
         return status
 
 
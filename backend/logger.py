@@ -3,20 +3,36 @@ Structured logging module for REV2.
 Provides JSON-formatted logs with request tracing capabilities.
 """
 
+import atexit
 import logging
-import json
-import os
-from datetime import datetime
+import queue
+import sys
+import threading
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+
+import orjson
+
+from backend.config import LOG_FORMAT, LOG_LEVEL
+from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
 
+LOG_BUFFER_SIZE = 64 * 1024
+_LOG_LEVEL = getattr(logging, LOG_LEVEL)
+_UTC = timezone.utc
+# Per-context so concurrent requests and background reviews each keep their own
+# id; asyncio tasks and asyncio.to_thread copy it from their caller
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
 class JSONFormatter(logging.Formatter):
     """Custom formatter that outputs JSON-formatted logs."""
 
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON."""
         log_data = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": datetime.fromtimestamp(record.created, _UTC),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -25,43 +41,101 @@ class JSONFormatter(logging.Formatter):
             "line": record.lineno,
         }
 
-        # Add exception info if present
+        # Optional fields; the common record has none of them, so each is a
+        # single dict lookup on the record
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
 
-        # Add custom fields if present in record
-        if hasattr(record, "request_id") and record.request_id:
-            log_data["request_id"] = record.request_id
+        fields = record.__dict__
+        request_id = fields.get("request_id")
+        if request_id:
+            log_data["request_id"] = request_id
 
-        if hasattr(record, "extra_fields") and record.extra_fields:
-            log_data.update(record.extra_fields)
+        extra_fields = fields.get("extra_fields")
+        if extra_fields:
+            log_data.update(extra_fields)
 
-        return json.dumps(log_data)
+        # orjson encodes the datetime itself; default=str covers any other
+        # non-JSON types passed as extra fields
+        return orjson.dumps(
+            log_data, default=str, option=orjson.OPT_UTC_Z
+        ).decode("utf-8")
 
 
-class StructuredLogger:
-    """Wrapper around Python logger with structured logging support."""
+class _InProcessQueueHandler(QueueHandler):
+    """
+    QueueHandler that hands records over untouched.
 
-    def __init__(self, name: str):
-        """Initialize structured logger."""
-        self.logger = logging.getLogger(name)
-        self.request_id: Optional[str] = None
+    The stock prepare() pre-formats the message and drops exc_info so records
+    can cross process boundaries; the listener here is a thread in the same
+    process, so JSONFormatter can do all formatting there.
+    """
 
-    def _setup_handlers(self):
-        """Setup logging handlers if not already configured."""
-        if self.logger.handlers:
-            return
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _BufferedStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler that leaves flushing to its caller.
+
+    Writes go to a 64 KiB buffered stream over the stderr file descriptor;
+    _FlushingQueueListener flushes once the queue drains, so a burst of
+    records costs one write() syscall instead of one per record.
+    """
+
+    def __init__(self):
+        try:
+            stream = open(
+                sys.stderr.fileno(),
+                "w",
+                buffering=LOG_BUFFER_SIZE,
+                encoding="utf-8",
+                closefd=False,
+            )
+        except (AttributeError, OSError, ValueError):
+            # stderr replaced by an object without a real descriptor
+            stream = sys.stderr
+        super().__init__(stream)
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class _FlushingQueueListener(QueueListener):
+    """QueueListener that flushes its handlers whenever the queue is empty."""
+
+    def handle(self, record: logging.LogRecord):
+        super().handle(record)
+        if self.queue.empty():
+            self.flush()
+
+    def flush(self):
+        for handler in self.handlers:
+            handler.flush()
+
+
+# Records are queued by the request path and written by a background thread
+_log_queue = queue.SimpleQueue()
+_queue_handler: Optional[QueueHandler] = None
+_queue_listener: Optional[QueueListener] = None
+_queue_lock = threading.Lock()
 
-        log_level = os.getenv("LOG_LEVEL", "INFO").upper()
-        log_format = os.getenv("LOG_FORMAT", "json").lower()
 
-        self.logger.setLevel(getattr(logging, log_level))
+def _get_queue_handler() -> QueueHandler:
+    """Get the shared queue handler, starting the listener on first use."""
+    global _queue_handler, _queue_listener
+    with _queue_lock:
+        if _queue_handler is not None:
+            return _queue_handler
 
-        # Create console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(getattr(logging, log_level))
+        console_handler = _BufferedStreamHandler()
+        console_handler.setLevel(_LOG_LEVEL)
 
-        if log_format == "json":
+        if LOG_FORMAT == "json":
             formatter = JSONFormatter()
         else:
             # Text format: timestamp - level - message
@@ -71,15 +145,50 @@ class StructuredLogger:
             )
 
         console_handler.setFormatter(formatter)
-        self.logger.addHandler(console_handler)
+
+        _queue_listener = _FlushingQueueListener(
+            _log_queue, console_handler, respect_handler_level=True
+        )
+        _queue_listener.start()
+        atexit.register(shutdown_logging)
+
+        _queue_handler = _InProcessQueueHandler(_log_queue)
+        return _queue_handler
+
+
+def shutdown_logging():
+    """Flush queued log records and stop the background listener."""
+    global _queue_listener
+    with _queue_lock:
+        if _queue_listener is not None:
+            _queue_listener.stop()
+            _queue_listener.flush()
+            _queue_listener = None
+
+
+class StructuredLogger:
+    """Wrapper around Python logger with structured logging support."""
+
+    def __init__(self, name: str):
+        """Initialize structured logger."""
+        self.logger = logging.getLogger(name)
+        self._setup_handlers()
+
+    def _setup_handlers(self):
+        """Setup logging handlers if not already configured."""
+        if self.logger.handlers:
+            return
+
+        self.logger.setLevel(_LOG_LEVEL)
+        self.logger.addHandler(_get_queue_handler())
 
     def set_request_id(self, request_id: str):
-        """Set request ID for tracing."""
-        self.request_id = request_id
+        """Set request ID for tracing in the current context."""
+        _request_id.set(request_id)
 
     def clear_request_id(self):
         """Clear request ID."""
-        self.request_id = None
+        _request_id.set(None)
 
     def _log(
         self,
@@ -89,15 +198,22 @@ class StructuredLogger:
         extra_fields: Optional[Dict[str, Any]] = None,
     ):
         """Internal logging method with structured fields."""
-        self._setup_handlers()
+        # Disabled levels (e.g. debug in production) return before any work
+        if not self.logger.isEnabledFor(level):
+            return
 
         # Create extra dict for custom fields
         extra_dict = {"extra_fields": extra_fields or {}}
-        if self.request_id:
-            extra_dict["request_id"] = self.request_id
+        request_id = _request_id.get()
+        if request_id:
+            extra_dict["request_id"] = request_id
 
         self.logger.log(level, message, extra=extra_dict, exc_info=exc_info)
 
+    def is_enabled_for(self, level: int) -> bool:
+        """Check whether a record at this level would be emitted."""
+        return self.logger.isEnabledFor(level)
+
     def debug(self, message: str, **extra_fields):
         """Log debug message."""
         self._log(logging.DEBUG, message, extra_fields=extra_fields)
@@ -121,7 +237,13 @@ class StructuredLogger:
         )
 
 
-# Global logger instance
+# Logger instances, one per name
+_loggers: Dict[str, StructuredLogger] = {}
+
+
 def get_logger(name: str = __name__) -> StructuredLogger:
     """Get or create a structured logger instance."""
-    return StructuredLogger(name)
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers.setdefault(name, StructuredLogger(name))
+    return logger
@@ -1,19 +1,24 @@
 # main.py
-from fastapi import FastAPI, Request, HTTPException
-import hmac, hashlib, os, json, traceback, uuid
-from github import Github, GithubException
+from fastapi import BackgroundTasks, FastAPI, Request, HTTPException
+import asyncio, hmac, os, traceback
+import orjson
+from github import GithubException
 import requests
 
 from backend.reviewer import review_patch
-from backend.auth import get_installation_token
+from backend.auth import get_github_client
 from backend.repo_fetcher import save_repo_snapshot
 from backend.context_indexer import index_repo
-from backend.config import GITHUB_WEBHOOK_SECRET as WEBHOOK_SECRET, MAX_DIFF_SIZE
-from backend.logger import get_logger
+from backend.config import (
+    GITHUB_WEBHOOK_SECRET as WEBHOOK_SECRET,
+    MAX_DIFF_SIZE,
+    validate_config,
+    ensure_data_dirs,
+)
+from backend.logger import get_logger, shutdown_logging
 from backend.validators import (
     validate_webhook_payload,
-    validate_patch,
-    sanitize_patch_for_llm,
+    validate_and_sanitize_patch,
     ValidationError,
 )
 from backend.rate_limiter import get_rate_limiter
@@ -22,7 +27,15 @@ from backend.health import router as health_router
 
 app = FastAPI(title="REV2 - AI Code Reviewer")
 logger = get_logger(__name__)
+# Encoded once; validate_config() rejects a missing secret at startup
+_WEBHOOK_SECRET_BYTES = (WEBHOOK_SECRET or "").encode("utf-8")
 rate_limiter = get_rate_limiter()
+# Max files reviewed concurrently per pull request
+REVIEW_CONCURRENCY = int(os.getenv("PARALLEL_REVIEW_WORKERS", 8))
+# Max pull requests reviewed at once; further webhooks are acknowledged and
+# their reviews wait for a slot
+MAX_CONCURRENT_PR_REVIEWS = int(os.getenv("MAX_CONCURRENT_PR_REVIEWS", 4))
+_pr_semaphore = asyncio.Semaphore(MAX_CONCURRENT_PR_REVIEWS)
 
 # Include health check routes
 app.include_router(health_router)
@@ -31,6 +44,9 @@ app.include_router(health_router)
 @app.on_event("startup")
 async def startup_event():
     """Initialize database and system on startup."""
+    validate_config()
+    ensure_data_dirs()
+
     try:
         logger.info("Initializing database...")
         init_db()
@@ -44,14 +60,186 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown."""
     logger.info("Shutting down REV2...")
-    # Flush logs, close connections, etc.
+    shutdown_logging()
+
+
+async def _process_pr(payload: dict, request_id: str):
+    """
+    Review a pull request and post the result back to GitHub.
+
+    Runs after the webhook has been acknowledged, so failures are logged
+    rather than returned to GitHub.
+
+    Args:
+        payload: Validated pull_request webhook payload
+        request_id: Tracing ID of the webhook delivery
+    """
+    logger.set_request_id(request_id)
+    installation_id = payload["installation"]["id"]
+    repo_name = payload["repository"]["full_name"]
+    pr_number = payload["pull_request"]["number"]
+
+    async with _pr_semaphore:
+        try:
+            # Token exchange and PR lookups are blocking HTTP calls
+            g = await asyncio.to_thread(get_github_client, installation_id)
+
+            repo = await asyncio.to_thread(g.get_repo, repo_name)
+            pr = await asyncio.to_thread(repo.get_pull, pr_number)
+
+            head_sha = payload["pull_request"]["head"]["sha"]
+            ref = payload["pull_request"]["head"]["ref"]
+
+            logger.info(
+                "Building repository snapshot and index",
+                head_sha=head_sha,
+            )
+
+            # --- Snapshot + Index (done once) ---
+            # The PR file list doesn't depend on the snapshot, so page
+            # through it while the repository is being fetched
+            files, repo_dir = await asyncio.gather(
+                asyncio.to_thread(lambda: list(pr.get_files())),
+                asyncio.to_thread(save_repo_snapshot, repo, head_sha),
+            )
+            index, metadata = await asyncio.to_thread(
+                index_repo, repo_dir, repo_name, head_sha
+            )
+
+            all_review_comments = []
+            action_flag = "COMMENT"
+            summary_blocks = []
+            files_reviewed = 0
+
+            # Drop removed, binary (no patch) and oversized files up
+            # front, logging the skip count once instead of per file
+            candidate_files = [
+                file
+                for file in files
+                if file.patch
+                and file.status != "removed"
+                and len(file.patch) <= MAX_DIFF_SIZE
+            ]
+            if len(candidate_files) < len(files):
+                logger.info(
+                    "Skipping files",
+                    skipped=len(files) - len(candidate_files),
+                    total=len(files),
+                    reason="removed, no patch or over size limit",
+                    max_size=MAX_DIFF_SIZE,
+                )
+
+            eligible_files = []
+            for file in candidate_files:
+                # Validate and sanitize patch
+                try:
+                    sanitized_patch = validate_and_sanitize_patch(file.patch)
+                except ValidationError as e:
+                    logger.warning(
+                        f"Invalid patch for file {file.filename}: {str(e)}"
+                    )
+                    continue
+
+                eligible_files.append((file.filename, sanitized_patch))
+
+            # Each file is an independent LLM round trip: review them
+            # concurrently, bounded to stay under provider rate limits
+            semaphore = asyncio.Semaphore(REVIEW_CONCURRENCY)
+
+            async def review_file(filename, sanitized_patch):
+                async with semaphore:
+                    logger.debug("Reviewing file", filename=filename)
+                    return await asyncio.to_thread(
+                        review_patch,
+                        sanitized_patch,
+                        filename,
+                        repo_name,
+                        ref,
+                        head_sha,
+                        index,
+                        metadata,
+                    )
+
+            results = await asyncio.gather(
+                *(
+                    review_file(filename, sanitized_patch)
+                    for filename, sanitized_patch in eligible_files
+                ),
+                return_exceptions=True,
+            )
+
+            for (filename, _), review_json in zip(eligible_files, results):
+                if isinstance(review_json, Exception):
+                    logger.error(
+                        "File review failed",
+                        filename=filename,
+                        error=str(review_json),
+                    )
+                    continue
+
+                if review_json and "review" in review_json:
+                    files_reviewed += 1
+                    summary_blocks.append(
+                        f"### Review for `{review_json['file']}`\n\n{review_json['review']}"
+                    )
+                    all_review_comments.append(
+                        {
+                            "path": filename,
+                            "body": review_json["review"],
+                            "position": 1,  # Fallback position
+                        }
+                    )
 
+            logger.info(
+                "Review complete",
+                files_reviewed=files_reviewed,
+                total_comments=len(all_review_comments),
+            )
+
+            if all_review_comments:
+                await asyncio.to_thread(
+                    pr.create_review,
+                    body="🤖 **AI Code Review**\n\n"
+                    + "\n---\n".join(summary_blocks),
+                    event=action_flag,
+                    comments=all_review_comments,
+                )
+            else:
+                await asyncio.to_thread(
+                    pr.create_review,
+                    body="🤖 **AI Code Review**\n\nNo issues found!",
+                    event="COMMENT",
+                )
 
-@app.post("/api/webhook")
-async def github_webhook(request: Request):
-    """Handle GitHub webhook for pull request events."""
+            logger.info("Review posted successfully")
+
+        except (GithubException, requests.exceptions.RequestException) as e:
+            logger.error(
+                "GitHub/Network error during review",
+                error=str(e),
+                exc_info=True,
+            )
+        except Exception as e:
+            logger.error(
+                "Internal error during review processing",
+                error=str(e),
+                exc_info=True,
+            )
+        finally:
+            logger.clear_request_id()
+
+
+@app.post("/api/webhook", status_code=202)
+async def github_webhook(request: Request, background_tasks: BackgroundTasks):
+    """
+    Handle GitHub webhook for pull request events.
+
+    The delivery is verified, validated and rate limited here, then
+    acknowledged with 202; the review itself runs in the background so
+    GitHub's webhook timeout doesn't bound how long a review can take.
+    """
     # Generate request ID for tracing
-    request_id = str(uuid.uuid4())
+    request_id = os.urandom(8).hex()
     logger.set_request_id(request_id)
 
     try:
@@ -62,17 +250,27 @@ async def github_webhook(request: Request):
             raise HTTPException(status_code=400, detail="Missing signature header")
 
         body = await request.body()
-        hash_object = hmac.new(
-            WEBHOOK_SECRET.encode("utf-8"), body, hashlib.sha256
-        )
-        expected_signature = hash_object.hexdigest()
-        provided_signature = signature_header.split("=")[1] if "=" in signature_header else ""
+        # One-shot C HMAC over raw bytes; compared without hex-encoding
+        expected_signature = hmac.digest(_WEBHOOK_SECRET_BYTES, body, "sha256")
+        try:
+            provided_signature = (
+                bytes.fromhex(signature_header[len("sha256="):])
+                if signature_header.startswith("sha256=")
+                else b""
+            )
+        except ValueError:
+            provided_signature = b""
 
         if not hmac.compare_digest(provided_signature, expected_signature):
             logger.warning("Invalid webhook signature")
             raise HTTPException(status_code=401, detail="Invalid signature")
 
-        payload = await request.json()
+        # Parse the body already read for the signature check
+        try:
+            payload = orjson.loads(body)
+        except orjson.JSONDecodeError:
+            logger.warning("Malformed webhook body")
+            raise HTTPException(status_code=400, detail="Invalid JSON body")
         event = request.headers.get("X-GitHub-Event")
         logger.info("Webhook received", event_type=event)
 
@@ -87,19 +285,19 @@ async def github_webhook(request: Request):
             action = payload.get("action")
             if action in ["opened", "reopened", "synchronize"]:
                 installation_id = payload["installation"]["id"]
-                repo_name = payload["repository"]["full_name"]
-                pr_number = payload["pull_request"]["number"]
 
                 logger.info(
                     "Processing pull request",
-                    repo=repo_name,
-                    pr_number=pr_number,
+                    repo=payload["repository"]["full_name"],
+                    pr_number=payload["pull_request"]["number"],
                     action=action,
                     installation_id=installation_id,
                 )
 
-                # Check rate limit
-                is_allowed, current_count = rate_limiter.check_limit(installation_id)
+                # Check rate limit; the Redis-backed limiter does blocking I/O
+                is_allowed, current_count = await asyncio.to_thread(
+                    rate_limiter.check_limit, installation_id
+                )
                 if not is_allowed:
                     logger.warning(
                         "Rate limit exceeded",
@@ -112,126 +310,10 @@ async def github_webhook(request: Request):
                         detail=f"Rate limit exceeded: {current_count}/{rate_limiter.max_reviews_per_hour} reviews this hour",
                     )
 
-                try:
-                    access_token = get_installation_token(installation_id)
-                    g = Github(login_or_token=access_token)
-
-                    repo = g.get_repo(repo_name)
-                    pr = repo.get_pull(pr_number)
-
-                    head_sha = payload["pull_request"]["head"]["sha"]
-                    ref = payload["pull_request"]["head"]["ref"]
-
-                    logger.info(
-                        "Building repository snapshot and index",
-                        head_sha=head_sha,
-                    )
-
-                    # --- Snapshot + Index (done once) ---
-                    repo_dir = save_repo_snapshot(repo, head_sha)
-                    index, metadata = index_repo(repo_dir, repo_name, head_sha)
-
-                    files = pr.get_files()
-                    all_review_comments = []
-                    action_flag = "COMMENT"
-                    summary_blocks = []
-                    files_reviewed = 0
-
-                    for file in files:
-                        if file.status == "removed" or not file.patch:
-                            logger.debug(
-                                "Skipping file",
-                                filename=file.filename,
-                                reason="removed or no patch",
-                            )
-                            continue
-
-                        if len(file.patch) > MAX_DIFF_SIZE:
-                            logger.warning(
-                                "Patch exceeds size limit",
-                                filename=file.filename,
-                                patch_size=len(file.patch),
-                                max_size=MAX_DIFF_SIZE,
-                            )
-                            continue
-
-                        # Validate and sanitize patch
-                        try:
-                            validate_patch(file.patch)
-                            sanitized_patch = sanitize_patch_for_llm(file.patch)
-                        except ValidationError as e:
-                            logger.warning(
-                                f"Invalid patch for file {file.filename}: {str(e)}"
-                            )
-                            continue
-
-                        logger.debug(
-                            "Reviewing file", filename=file.filename
-                        )
-
-                        review_json = review_patch(
-                            sanitized_patch,
-                            file.filename,
-                            repo_name,
-                            ref,
-                            head_sha,
-                            index,
-                            metadata,
-                        )
-
-                        if review_json and "review" in review_json:
-                            files_reviewed += 1
-                            summary_blocks.append(
-                                f"### Review for `{review_json['file']}`\n\n{review_json['review']}"
-                            )
-                            all_review_comments.append(
-                                {
-                                    "path": file.filename,
-                                    "body": review_json["review"],
-                                    "position": 1,  # Fallback position
-                                }
-                            )
-
-                    logger.info(
-                        "Review complete",
-                        files_reviewed=files_reviewed,
-                        total_comments=len(all_review_comments),
-                    )
-
-                    if all_review_comments:
-                        pr.create_review(
-                            body="🤖 **AI Code Review**\n\n"
-                            + "\n---\n".join(summary_blocks),
-                            event=action_flag,
-                            comments=all_review_comments,
-                        )
-                    else:
-                        pr.create_review(
-                            body="🤖 **AI Code Review**\n\nNo issues found!",
-                            event="COMMENT",
-                        )
-
-                    logger.info("Review posted successfully")
-
-                except (GithubException, requests.exceptions.RequestException) as e:
-                    logger.error(
-                        "GitHub/Network error during review",
-                        error=str(e),
-                        exc_info=True,
-                    )
-                    raise HTTPException(
-                        status_code=502, detail=f"GitHub API error: {e}"
-                    )
-                except Exception as e:
-                    logger.error(
-                        "Internal error during review processing",
-                        error=str(e),
-                        exc_info=True,
-                    )
-                    raise HTTPException(status_code=500, detail=f"Internal error: {e}")
+                background_tasks.add_task(_process_pr, payload, request_id)
 
         logger.clear_request_id()
-        return {"status": "success"}
+        return {"status": "accepted"}
 
     except HTTPException:
         logger.clear_request_id()
@@ -239,4 +321,4 @@ async def github_webhook(request: Request):
     except Exception as e:
         logger.error("Unhandled webhook error", error=str(e), exc_info=True)
         logger.clear_request_id()
-        raise HTTPException(status_code=500, detail=f"Internal error: {e}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Internal error: {e}")
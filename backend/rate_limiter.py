@@ -3,74 +3,118 @@ Rate limiting module for REV2.
 Implements per-installation rate limiting to prevent abuse.
 """
 
+import threading
 import time
 import os
 from typing import Dict, Tuple, Any
 
+from backend.logger import get_logger
+from backend.redis_client import get_redis_client
+
+logger = get_logger(__name__)
+
+WINDOW_SECONDS = 3600
+# The window is split into this many buckets (one minute each by default);
+# a bucket leaves the window as a whole
+WINDOW_BUCKETS = 60
+REDIS_KEY_PREFIX = "rev2:ratelimit:"
+
+# Trim, count and conditionally admit in one server-side step, so concurrent
+# checks near the limit are serialized and a denial never touches the set.
+# KEYS[1]: sorted set; ARGV: now, window, limit, increment, member tag, ttl
+_SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local limit = tonumber(ARGV[3])
+local increment = tonumber(ARGV[4])
+redis.call("ZREMRANGEBYSCORE", KEYS[1], "-inf", now - tonumber(ARGV[2]))
+local count = redis.call("ZCARD", KEYS[1])
+if count + increment > limit then
+    return {0, count}
+end
+for i = 1, increment do
+    redis.call("ZADD", KEYS[1], now, ARGV[5] .. ":" .. i)
+end
+redis.call("EXPIRE", KEYS[1], ARGV[6])
+return {1, count + increment}
+"""
+
+
+class _Window:
+    """Ring of per-bucket review counts for one installation."""
+
+    __slots__ = ("buckets", "total", "tick")
+
+    def __init__(self, tick: int):
+        self.buckets = [0] * WINDOW_BUCKETS  # indexed by tick % WINDOW_BUCKETS
+        self.total = 0
+        self.tick = tick  # Most recent bucket tick written or expired
+
+    def advance(self, tick: int):
+        """Expire the buckets that fell out of the window by this tick."""
+        elapsed = tick - self.tick
+        if elapsed <= 0:
+            return
+        if elapsed >= WINDOW_BUCKETS:
+            self.buckets = [0] * WINDOW_BUCKETS
+            self.total = 0
+        else:
+            buckets = self.buckets
+            for expired in range(self.tick + 1, tick + 1):
+                index = expired % WINDOW_BUCKETS
+                self.total -= buckets[index]
+                buckets[index] = 0
+        self.tick = tick
+
 
 class RateLimiter:
     """
     Simple in-memory rate limiter for per-installation webhook processing.
-    Can be extended to use Redis for distributed systems.
+    See RedisRateLimiter for multi-worker deployments.
     """
 
     def __init__(
         self,
         max_reviews_per_hour: int = 100,
-        cleanup_interval: int = 3600,
+        window_seconds: int = WINDOW_SECONDS,
     ):
         """
         Initialize rate limiter.
 
         Args:
-            max_reviews_per_hour: Maximum reviews allowed per hour per installation
-            cleanup_interval: Cleanup interval in seconds (default: 1 hour)
+            max_reviews_per_hour: Maximum reviews allowed per window per installation
+            window_seconds: Length of the rate limit window (default: 1 hour)
         """
         self.max_reviews_per_hour = max_reviews_per_hour
-        self.cleanup_interval = cleanup_interval
-
-        # Format: {installation_id: [(timestamp1, count1), (timestamp2, count2), ...]}
-        self.records: Dict[str, list] = {}
-        self.last_cleanup = time.time()
+        self.window_seconds = window_seconds
+        self._bucket_seconds = window_seconds / WINDOW_BUCKETS
 
-    def _cleanup(self):
-        """Remove old records outside the 1-hour window."""
-        current_time = time.time()
+        # Format: {installation_id: _Window}
+        self.records: Dict[str, _Window] = {}
+        # Every operation is O(1) amortized, so one lock is cheap enough
+        self._lock = threading.Lock()
 
-        # Only cleanup if interval has passed
-        if current_time - self.last_cleanup < self.cleanup_interval:
-            return
-
-        one_hour_ago = current_time - 3600
-
-        for installation_id in list(self.records.keys()):
-            # Keep only records from the last hour
-            self.records[installation_id] = [
-                (timestamp, count)
-                for timestamp, count in self.records[installation_id]
-                if timestamp > one_hour_ago
-            ]
+    def _tick(self, now: float) -> int:
+        return int(now // self._bucket_seconds)
 
-            # Remove installation if no records left
-            if not self.records[installation_id]:
-                del self.records[installation_id]
-
-        self.last_cleanup = current_time
+    def _get_count_in_window(self, installation_id: str, tick: int) -> int:
+        """
+        Get total review count for installation in the last hour.
+        Buckets that left the window are expired as a side effect, so
+        memory per installation stays fixed however bursty it is.
 
-    def _get_count_in_window(self, installation_id: str) -> int:
-        """Get total review count for installation in the last hour."""
-        if installation_id not in self.records:
+        Args:
+            installation_id: GitHub installation ID
+            tick: Current bucket tick
+        """
+        window = self.records.get(installation_id)
+        if window is None:
             return 0
 
-        current_time = time.time()
-        one_hour_ago = current_time - 3600
-
-        total = 0
-        for timestamp, count in self.records[installation_id]:
-            if timestamp > one_hour_ago:
-                total += count
-
-        return total
+        window.advance(tick)
+        if not window.total:
+            del self.records[installation_id]
+            return 0
+        return window.total
 
     def check_limit(
         self, installation_id: str, increment: int = 1
@@ -87,22 +131,24 @@ class RateLimiter:
             - is_allowed: True if under limit, False if exceeded
             - current_count: Current count in window
         """
-        self._cleanup()
+        # Monotonic clock: immune to wall-clock jumps, read once per check
+        tick = self._tick(time.monotonic())
+        with self._lock:
+            current_count = self._get_count_in_window(installation_id, tick)
 
-        current_time = time.time()
-        current_count = self._get_count_in_window(installation_id)
+            if current_count + increment > self.max_reviews_per_hour:
+                # Exceeded limit
+                return False, current_count
 
-        if current_count + increment > self.max_reviews_per_hour:
-            # Exceeded limit
-            return False, current_count
+            # Under limit, increment
+            window = self.records.get(installation_id)
+            if window is None:
+                window = self.records[installation_id] = _Window(tick)
 
-        # Under limit, increment
-        if installation_id not in self.records:
-            self.records[installation_id] = []
+            window.buckets[tick % WINDOW_BUCKETS] += increment
+            window.total += increment
 
-        self.records[installation_id].append((current_time, increment))
-
-        return True, current_count + increment
+            return True, window.total
 
     def get_status(self, installation_id: str) -> Dict[str, Any]:
         """
@@ -114,9 +160,10 @@ class RateLimiter:
         Returns:
             Dict with current count, limit, and remaining
         """
-        self._cleanup()
-
-        current_count = self._get_count_in_window(installation_id)
+        with self._lock:
+            current_count = self._get_count_in_window(
+                installation_id, self._tick(time.monotonic())
+            )
         remaining = max(0, self.max_reviews_per_hour - current_count)
 
         return {
@@ -124,13 +171,117 @@ class RateLimiter:
             "current_count": current_count,
             "limit": self.max_reviews_per_hour,
             "remaining": remaining,
-            "window_seconds": 3600,
+            "window_seconds": self.window_seconds,
         }
 
     def reset(self, installation_id: str):
         """Reset rate limit for installation (for testing or manual reset)."""
-        if installation_id in self.records:
-            del self.records[installation_id]
+        with self._lock:
+            self.records.pop(installation_id, None)
+
+
+class RedisRateLimiter(RateLimiter):
+    """
+    Sliding-window rate limiter shared by all workers through Redis.
+
+    Each installation has a sorted set of admitted reviews scored by their
+    wall-clock time, so every worker sees the same exact window. Falls back
+    to the in-process window if Redis is unreachable.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        max_reviews_per_hour: int = 100,
+        window_seconds: int = WINDOW_SECONDS,
+    ):
+        """
+        Initialize Redis rate limiter.
+
+        Args:
+            redis_client: Redis client (owns a connection pool)
+            max_reviews_per_hour: Maximum reviews allowed per window per installation
+            window_seconds: Length of the rate limit window (default: 1 hour)
+        """
+        super().__init__(
+            max_reviews_per_hour=max_reviews_per_hour,
+            window_seconds=window_seconds,
+        )
+        self.redis = redis_client
+        # Sent by SHA (EVALSHA) after the first call
+        self._check_script = redis_client.register_script(_SLIDING_WINDOW_SCRIPT)
+        # Whole seconds, as EXPIRE requires
+        self._key_ttl = max(1, int(window_seconds + 0.999))
+
+    def _key(self, installation_id: str) -> str:
+        return f"{REDIS_KEY_PREFIX}{installation_id}"
+
+    def check_limit(
+        self, installation_id: str, increment: int = 1
+    ) -> Tuple[bool, int]:
+        """
+        Check if installation has exceeded rate limit.
+
+        Args:
+            installation_id: GitHub installation ID
+            increment: Number of reviews to increment (default: 1)
+
+        Returns:
+            Tuple of (is_allowed: bool, current_count: int)
+        """
+        # Wall clock so every worker agrees on the window
+        now = time.time()
+        # One member per review; the random tag keeps concurrent adds apart
+        tag = f"{now}:{os.urandom(6).hex()}"
+        try:
+            allowed, count = self._check_script(
+                keys=[self._key(installation_id)],
+                args=[
+                    now,
+                    self.window_seconds,
+                    self.max_reviews_per_hour,
+                    increment,
+                    tag,
+                    self._key_ttl,
+                ],
+            )
+            return bool(allowed), count
+        except Exception as e:
+            logger.warning("Redis rate limit check failed", error=str(e))
+            return super().check_limit(installation_id, increment)
+
+    def get_status(self, installation_id: str) -> Dict[str, Any]:
+        """
+        Get rate limit status for installation.
+
+        Args:
+            installation_id: GitHub installation ID
+
+        Returns:
+            Dict with current count, limit, and remaining
+        """
+        try:
+            current_count = self.redis.zcount(
+                self._key(installation_id),
+                time.time() - self.window_seconds,
+                "+inf",
+            )
+        except Exception as e:
+            logger.warning("Redis rate limit status failed", error=str(e))
+            return super().get_status(installation_id)
+
+        return {
+            "installation_id": installation_id,
+            "current_count": current_count,
+            "limit": self.max_reviews_per_hour,
+            "remaining": max(0, self.max_reviews_per_hour - current_count),
+            "window_seconds": self.window_seconds,
+        }
+
+    def reset(self, installation_id: str):
+        """Reset rate limit for installation (for testing or manual reset)."""
+        super().reset(installation_id)
+        self.redis.delete(self._key(installation_id))
 
 
 # Global rate limiter instance
@@ -142,5 +293,11 @@ def get_rate_limiter() -> RateLimiter:
     global _rate_limiter
     if _rate_limiter is None:
         max_reviews = int(os.getenv("RATE_LIMIT_REVIEWS_PER_HOUR", 100))
-        _rate_limiter = RateLimiter(max_reviews_per_hour=max_reviews)
+        redis_client = get_redis_client()
+        if redis_client is not None:
+            _rate_limiter = RedisRateLimiter(
+                redis_client, max_reviews_per_hour=max_reviews
+            )
+        else:
+            _rate_limiter = RateLimiter(max_reviews_per_hour=max_reviews)
     return _rate_limiter
@@ -0,0 +1,78 @@
+"""
+Shared Redis connection for REV2.
+Redis is optional: set REDIS_URL to share state across workers.
+"""
+
+import importlib
+import os
+from typing import Optional
+
+from backend.config import REDIS_URL
+from backend.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Redis is an optimization with an in-process fallback, so an unreachable
+# server must fail fast instead of waiting out the OS TCP timeout
+REDIS_CONNECT_TIMEOUT = float(os.getenv("REDIS_CONNECT_TIMEOUT", 0.5))
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", 0.5))
+
+# Global Redis clients by module ("redis" or "redis.asyncio"); None when
+# Redis is not configured
+_clients = {}
+
+
+def _get_client(module_name: str):
+    """
+    Get or create the global client from a redis module.
+
+    Args:
+        module_name: "redis" for the sync client, "redis.asyncio" for asyncio
+
+    Returns:
+        Redis client, or None if REDIS_URL is unset or redis is not installed
+    """
+    if module_name in _clients:
+        return _clients[module_name]
+
+    _clients[module_name] = None
+    if not REDIS_URL:
+        return None
+
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError:
+        logger.warning("redis library not installed, using in-process state")
+        return None
+
+    _clients[module_name] = module.Redis.from_url(
+        REDIS_URL,
+        decode_responses=True,
+        socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+        socket_timeout=REDIS_SOCKET_TIMEOUT,
+    )
+    return _clients[module_name]
+
+
+def get_redis_client() -> Optional["redis.Redis"]:
+    """
+    Get or create the global Redis client.
+
+    The client owns a connection pool, so it is safe to share between
+    requests and threads.
+
+    Returns:
+        Redis client, or None if REDIS_URL is unset or redis is not installed
+    """
+    return _get_client("redis")
+
+
+def get_async_redis_client() -> Optional["redis.asyncio.Redis"]:
+    """
+    Get or create the global asyncio Redis client.
+
+    Returns:
+        Async Redis client, or None if REDIS_URL is unset or redis is not
+        installed
+    """
+    return _get_client("redis.asyncio")
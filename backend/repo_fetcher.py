@@ -5,6 +5,9 @@ from backend.config import REPO_CACHE_DIR, MAX_FILE_CHARS
 
 logger = logging.getLogger(__name__)
 
+# Longest UTF-8 encoding of MAX_FILE_CHARS characters
+MAX_FILE_BYTES = MAX_FILE_CHARS * 4
+
 
 def save_repo_snapshot(repo: Repository, ref: str) -> str:
     """Fetch all repo files at ref (commit/branch) and store under cache path.
@@ -34,8 +37,9 @@ def save_repo_snapshot(repo: Repository, ref: str) -> str:
 
             try:
                 raw = c.decoded_content
-                # enforce char limit (decode -> slice -> re-encode)
-                raw_text = raw.decode("utf-8", errors="ignore")
+                # enforce char limit (decode -> slice -> re-encode); a UTF-8
+                # char is at most 4 bytes, so only that prefix is decoded
+                raw_text = raw[:MAX_FILE_BYTES].decode("utf-8", errors="ignore")
                 if len(raw_text) > MAX_FILE_CHARS:
                     raw_text = raw_text[:MAX_FILE_CHARS]
                 raw = raw_text.encode("utf-8")
@@ -3,15 +3,23 @@ Per-repository review configuration.
 Allows teams to customize review rules and focus areas.
 """
 
+import fnmatch
 import json
+import logging
 import os
-from typing import Optional, List, Dict, Any
+import re
+from typing import Optional, List, Dict, Any, Tuple
 from pathlib import Path
 
 from backend.logger import get_logger
 
 logger = get_logger(__name__)
 
+_SEVERITY_LEVELS = {"critical": 3, "warning": 2, "info": 1}
+
+# Parsed config files: {path: ((mtime_ns, size), ReviewConfig)}
+_file_cache: Dict[str, Tuple[Tuple[int, int], "ReviewConfig"]] = {}
+
 
 class ReviewConfig:
     """Repository-specific review configuration."""
@@ -39,9 +47,39 @@ class ReviewConfig:
         self.review_types = review_types or ["security", "performance", "quality"]
         self.languages = languages or []  # Empty = all languages
         self.file_patterns_ignore = file_patterns_ignore or []
+        # Matching structures built once instead of per file
+        self._languages_lc = frozenset(l.lower() for l in self.languages)
+        ignore_re = self._compile_ignore_patterns(self.file_patterns_ignore)
+        # Bound once so the per-file check is a single call
+        self._ignore_match = ignore_re.match if ignore_re else None
         self.min_severity = min_severity
+        self._min_level = _SEVERITY_LEVELS.get(min_severity, 1)
         self.custom_prompt = custom_prompt
         self.max_response_length = max_response_length
+        self._prompt_suffix = self._build_prompt_suffix()
+
+    @staticmethod
+    def _compile_ignore_patterns(patterns: List[str]) -> Optional["re.Pattern"]:
+        """
+        Combine glob patterns into one regex.
+
+        Each pattern gets a named group so the pattern that matched can still
+        be reported.
+
+        Args:
+            patterns: Glob patterns to ignore
+
+        Returns:
+            Compiled regex, or None if there are no patterns
+        """
+        if not patterns:
+            return None
+        return re.compile(
+            "|".join(
+                f"(?P<p{i}>{fnmatch.translate(pattern)})"
+                for i, pattern in enumerate(patterns)
+            )
+        )
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert configuration to dictionary."""
@@ -81,38 +119,52 @@ class ReviewConfig:
         """
         Load configuration from file.
 
+        Parsed configs are cached until the file's mtime or size changes.
+
         Args:
             file_path: Path to config file (.json or .yml)
 
         Returns:
             ReviewConfig instance
         """
-        if not file_path.exists():
+        try:
+            st = file_path.stat()
+        except FileNotFoundError:
             logger.warning(f"Config file not found: {file_path}")
             return cls()
 
+        # Reuse the parsed config until the file changes
+        cache_key = str(file_path)
+        signature = (st.st_mtime_ns, st.st_size)
+        cached = _file_cache.get(cache_key)
+        if cached and cached[0] == signature:
+            return cached[1]
+
         try:
             if file_path.suffix in [".json", ".jsonc"]:
-                with open(file_path, "r") as f:
-                    data = json.load(f)
-                return cls.from_dict(data)
+                data = json.loads(file_path.read_bytes())
             elif file_path.suffix in [".yml", ".yaml"]:
                 try:
                     import yaml
-                    with open(file_path, "r") as f:
-                        data = yaml.safe_load(f)
-                    return cls.from_dict(data)
                 except ImportError:
                     logger.warning("PyYAML not installed, cannot parse YAML config")
                     return cls()
+                # Prefer the libyaml-backed loader when PyYAML was built with it
+                loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+                with open(file_path, "rb") as f:
+                    data = yaml.load(f, Loader=loader)
             else:
                 logger.warning(f"Unknown config format: {file_path.suffix}")
                 return cls()
 
+            config = cls.from_dict(data)
         except Exception as e:
             logger.error(f"Failed to load config from {file_path}: {e}")
             return cls()
 
+        _file_cache[cache_key] = (signature, config)
+        return config
+
     def should_review_file(self, filename: str, file_language: str = None) -> bool:
         """
         Check if a file should be reviewed based on configuration.
@@ -124,26 +176,27 @@ class ReviewConfig:
         Returns:
             True if file should be reviewed
         """
-        import fnmatch
-
         # Check language filter
-        if self.languages and file_language:
-            if file_language.lower() not in [l.lower() for l in self.languages]:
-                logger.debug(
-                    "File skipped - language not in whitelist",
-                    filename=filename,
-                    language=file_language,
-                )
+        if self._languages_lc and file_language:
+            if file_language.lower() not in self._languages_lc:
+                if logger.is_enabled_for(logging.DEBUG):
+                    logger.debug(
+                        "File skipped - language not in whitelist",
+                        filename=filename,
+                        language=file_language,
+                    )
                 return False
 
         # Check ignore patterns
-        for pattern in self.file_patterns_ignore:
-            if fnmatch.fnmatch(filename, pattern):
-                logger.debug(
-                    "File skipped - matches ignore pattern",
-                    filename=filename,
-                    pattern=pattern,
-                )
+        if self._ignore_match:
+            match = self._ignore_match(filename)
+            if match:
+                if logger.is_enabled_for(logging.DEBUG):
+                    logger.debug(
+                        "File skipped - matches ignore pattern",
+                        filename=filename,
+                        pattern=self.file_patterns_ignore[int(match.lastgroup[1:])],
+                    )
                 return False
 
         return True
@@ -158,21 +211,19 @@ class ReviewConfig:
         Returns:
             Filtered list of comments
         """
-        severity_levels = {"critical": 3, "warning": 2, "info": 1}
-        min_level = severity_levels.get(self.min_severity, 1)
-
-        filtered = []
-        for comment in comments:
-            comment_severity = comment.get("severity", "info")
-            comment_level = severity_levels.get(comment_severity, 1)
-
-            if comment_level >= min_level:
-                filtered.append(comment)
-
-        return filtered
-
-    def get_review_prompt_suffix(self) -> str:
-        """Get custom prompt suffix for review."""
+        # Every comment passes the default "info" threshold
+        if self._min_level <= 1:
+            return comments
+
+        min_level = self._min_level
+        return [
+            comment
+            for comment in comments
+            if _SEVERITY_LEVELS.get(comment.get("severity", "info"), 1) >= min_level
+        ]
+
+    def _build_prompt_suffix(self) -> str:
+        """Build the custom prompt suffix from review types and custom prompt."""
         prompt = ""
 
         if self.review_types:
@@ -184,6 +235,10 @@ class ReviewConfig:
 
         return prompt
 
+    def get_review_prompt_suffix(self) -> str:
+        """Get custom prompt suffix for review (built once per config)."""
+        return self._prompt_suffix
+
 
 class ConfigManager:
     """Manages review configurations for repositories."""
@@ -7,14 +7,20 @@ Supports:
 - Structured review output
 """
 
-import json
+import asyncio
+import hashlib
+import threading
 import time
 import re
+import weakref
 import os
+import random
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Tuple
 from enum import Enum
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
+import orjson
 import google.generativeai as genai
 from google.api_core.exceptions import ResourceExhausted
 
@@ -30,13 +36,40 @@ import faiss
 
 logger = get_logger(__name__)
 
-# Configure Gemini API
-genai.configure(api_key=GEMINI_API_KEY)
-
 SAFE_TOKEN_LIMIT = 5000
 CHUNK_SIZE_LINES = 50
-DEFAULT_PARALLEL_WORKERS = int(os.getenv("PARALLEL_REVIEW_WORKERS", 2))
+# Reviews wait on the LLM API rather than the CPU, so concurrency is bounded
+# by provider rate limits, not cores
+DEFAULT_PARALLEL_WORKERS = int(os.getenv("PARALLEL_REVIEW_WORKERS", 8))
 DEFAULT_BATCH_SIZE = int(os.getenv("BATCH_SIZE", 5))
+SEARCH_CACHE_SIZE = 256
+MAX_RETRY_DELAY = 60
+# Bytes of serialized repository context included in a prompt
+PROMPT_CONTEXT_LIMIT = 2000
+
+# Semantic search results per FAISS index, each an LRU keyed by (repo, patch
+# digest). Shared by all generators since the legacy wrapper creates one per
+# call; weakly keyed so a freed index takes its results with it and a later
+# index can never be served them.
+_search_cache: "weakref.WeakKeyDictionary[faiss.Index, OrderedDict]" = (
+    weakref.WeakKeyDictionary()
+)
+_search_cache_lock = threading.Lock()
+
+# Monotonic deadline before which no worker should call the API again; set by
+# whichever worker hits the rate limit so the others back off with it
+_rate_limited_until = 0.0
+_rate_limit_lock = threading.Lock()
+
+_genai_configured = False
+_default_generator: Optional["ReviewGenerator"] = None
+_default_generator_lock = threading.Lock()
+
+
+class RateLimitExceeded(Exception):
+    """Raised when the API keeps rate limiting after all retries."""
+
+    pass
 
 
 class Severity(Enum):
@@ -46,7 +79,45 @@ class Severity(Enum):
     INFO = "info"
 
 
-@dataclass
+# Review keywords -> (severity rank, category). Ranks: 2 critical, 1 warning,
+# 0 no severity signal. Category priority follows _CATEGORY_PRIORITY.
+_REVIEW_KEYWORDS = {
+    "critical": (2, None),
+    "vulnerability": (2, "security"),
+    "security": (2, "security"),
+    "crash": (2, None),
+    "data loss": (2, None),
+    "warning": (1, None),
+    "issue": (1, None),
+    "bug": (1, None),
+    "performance": (1, "performance"),
+    "injection": (0, "security"),
+    "auth": (0, "security"),
+    "slow": (0, "performance"),
+    "optimize": (0, "performance"),
+    "memory": (0, "performance"),
+    "style": (0, "style"),
+    "format": (0, "style"),
+    "naming": (0, "style"),
+    "convention": (0, "style"),
+}
+_SEVERITY_BY_RANK = (Severity.INFO, Severity.WARNING, Severity.CRITICAL)
+_CATEGORY_PRIORITY = {"security": 3, "performance": 2, "style": 1}
+# One case-insensitive pass finds every keyword; words are matched from their
+# start so inflections ("issues", "optimized") still count
+_REVIEW_KEYWORD_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(word) for word in _REVIEW_KEYWORDS) + ")",
+    re.IGNORECASE,
+)
+# Start of a numbered or bulleted item in a review response; the marker must
+# be followed by whitespace so quoted diff lines ("-removed") aren't items
+_REVIEW_BLOCK_RE = re.compile(r"(?:^|\n)[ \t]*(?:\d+\.|•|-)\s+")
+# Section header separating files in a grouped review prompt and response
+_GROUP_FILE_MARKER = "===FILE: {}==="
+_GROUP_FILE_RE = re.compile(r"^[ \t]*===FILE:[ \t]*(.+?)[ \t]*===[ \t]*$", re.MULTILINE)
+
+
+@dataclass(slots=True, frozen=True)
 class ReviewComment:
     """Structured review comment."""
     severity: Severity
@@ -55,7 +126,18 @@ class ReviewComment:
     category: str  # e.g., "security", "performance", "maintainability"
 
 
-@dataclass
+@dataclass(slots=True)
+class _PreparedReview:
+    """Inputs gathered for a patch before the API call."""
+    filename: str
+    language: str
+    symbols: List[str]
+    trimmed: str
+    context: List[Dict]
+    prompt: str
+
+
+@dataclass(slots=True, frozen=True)
 class PatchReview:
     """Complete review for a patch."""
     file: str
@@ -68,60 +150,248 @@ class PatchReview:
     status: str  # "success" or "failure"
 
 
+def _ensure_configured():
+    """Configure the Gemini API on first use rather than at import time."""
+    global _genai_configured
+    if not _genai_configured:
+        genai.configure(api_key=GEMINI_API_KEY)
+        _genai_configured = True
+
+
+def _start_rate_limit_backoff(delay: float):
+    """Hold off all workers for a jittered delay after a rate limit."""
+    global _rate_limited_until
+    until = time.monotonic() + delay * (0.5 + random.random())
+    with _rate_limit_lock:
+        if until > _rate_limited_until:
+            _rate_limited_until = until
+
+
+def _rate_limit_wait() -> float:
+    """Seconds to wait before calling the API, with jitter to spread retries."""
+    remaining = _rate_limited_until - time.monotonic()
+    if remaining <= 0:
+        return 0.0
+    return remaining + random.random()
+
+
+def _context_json(context: List[Dict]) -> str:
+    """Serialize repository context for a prompt, bounded to PROMPT_CONTEXT_LIMIT bytes."""
+    # Compact C serialization: indentation only padded the part that got
+    # cut off. Slicing bytes may split a character, so drop the fragment.
+    return orjson.dumps(
+        context, default=str, option=orjson.OPT_SERIALIZE_NUMPY
+    )[:PROMPT_CONTEXT_LIMIT].decode("utf-8", "ignore")
+
+
+def _run_sync(coro):
+    """
+    Run a coroutine to completion from synchronous code.
+
+    asyncio.run() refuses to start inside a running event loop, so a caller
+    that is itself on one gets the coroutine run on a worker thread with its
+    own loop. That still blocks the caller's loop until the coroutine is
+    done; async code should await the *_async method instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
 class ReviewGenerator:
     """Generates code reviews with advanced features."""
 
     def __init__(self, model_name: str = "gemini-2.5-pro"):
         """Initialize review generator."""
+        _ensure_configured()
         self.model = genai.GenerativeModel(model_name)
         self.model_name = model_name
 
+    def _get_context(
+        self,
+        trimmed: str,
+        index: Optional[faiss.Index],
+        metadata: List[Dict],
+        repo_name: str,
+    ) -> List[Dict]:
+        """
+        Get the top-K repository context for a patch, reusing cached results.
+
+        Args:
+            trimmed: Trimmed patch content
+            index: FAISS index for semantic search
+            metadata: Metadata for indexed chunks
+            repo_name: Name of repository
+
+        Returns:
+            Context chunks for the prompt
+        """
+        if index is None:
+            # Nothing to search (or weakly reference); review without context
+            return []
+
+        key = (
+            repo_name,
+            hashlib.blake2b(trimmed.encode("utf-8"), digest_size=16).hexdigest(),
+        )
+        with _search_cache_lock:
+            index_cache = _search_cache.get(index)
+            if index_cache is not None:
+                cached = index_cache.get(key)
+                if cached is not None:
+                    index_cache.move_to_end(key)
+                    return cached
+
+        context_chunks = semantic_search(trimmed, index, metadata, top_k=TOP_K)
+
+        with _search_cache_lock:
+            index_cache = _search_cache.get(index)
+            if index_cache is None:
+                index_cache = _search_cache[index] = OrderedDict()
+            index_cache[key] = context_chunks
+            index_cache.move_to_end(key)
+            while len(index_cache) > SEARCH_CACHE_SIZE:
+                index_cache.popitem(last=False)
+        return context_chunks
+
+    def clear_cache(self):
+        """Clear cached semantic search results."""
+        with _search_cache_lock:
+            _search_cache.clear()
+
     def _extract_severity_and_category(self, text: str) -> Tuple[Severity, str]:
         """Extract severity level and category from review text."""
-        text_lower = text.lower()
-
-        # Check for severity indicators
-        if any(word in text_lower for word in ["critical", "vulnerability", "security", "crash", "data loss"]):
-            severity = Severity.CRITICAL
-        elif any(word in text_lower for word in ["warning", "issue", "bug", "performance"]):
-            severity = Severity.WARNING
-        else:
-            severity = Severity.INFO
-
-        # Check for category
-        if any(word in text_lower for word in ["security", "vulnerability", "injection", "auth"]):
-            category = "security"
-        elif any(word in text_lower for word in ["performance", "slow", "optimize", "memory"]):
-            category = "performance"
-        elif any(word in text_lower for word in ["style", "format", "naming", "convention"]):
-            category = "style"
-        else:
-            category = "maintainability"
-
-        return severity, category
+        severity_rank = 0
+        category = "maintainability"
+        category_rank = 0
+
+        for match in _REVIEW_KEYWORD_RE.finditer(text):
+            rank, keyword_category = _REVIEW_KEYWORDS[match.group().lower()]
+            if rank > severity_rank:
+                severity_rank = rank
+            if keyword_category and _CATEGORY_PRIORITY[keyword_category] > category_rank:
+                category = keyword_category
+                category_rank = _CATEGORY_PRIORITY[keyword_category]
+            if severity_rank == 2 and category_rank == 3:
+                break  # Nothing can outrank critical security
+
+        return _SEVERITY_BY_RANK[severity_rank], category
 
     def _parse_review_response(self, response_text: str) -> List[ReviewComment]:
         """Parse AI response into structured comments."""
-        comments = []
-
-        # Split response into comment blocks (separated by numbers or bullet points)
-        blocks = re.split(r"\n\d+\.|•|-", response_text)
-
-        for block in blocks:
-            if not block.strip():
-                continue
-
-            severity, category = self._extract_severity_and_category(block)
-            comments.append(
-                ReviewComment(
-                    severity=severity,
-                    line_number=None,  # TODO: Extract line numbers from response
-                    comment=block.strip()[:500],  # Limit to 500 chars
-                    category=category,
-                )
+        # Blocks run between numbered/bulleted item markers; they are sliced
+        # straight out of the response instead of materialising a split list
+        matches = list(_REVIEW_BLOCK_RE.finditer(response_text))
+        starts = [0] + [m.end() for m in matches]
+        ends = [m.start() for m in matches] + [len(response_text)]
+
+        extract = self._extract_severity_and_category
+        return [
+            ReviewComment(
+                severity=severity,
+                line_number=None,  # TODO: Extract line numbers from response
+                comment=block[:500],  # Limit to 500 chars
+                category=category,
             )
+            for block in (
+                response_text[start:end].strip() for start, end in zip(starts, ends)
+            )
+            if block
+            for severity, category in (extract(block),)
+        ]
 
-        return comments
+    def _prepare_review(
+        self,
+        patch: str,
+        filename: str,
+        index: faiss.Index,
+        metadata: List[Dict],
+        repo_name: str,
+    ) -> _PreparedReview:
+        """Gather language, symbols and repository context, and build the prompt."""
+        language = detect_language_from_filename(filename)
+        symbols = extract_symbols_from_patch(patch)
+        trimmed = trim_diff(patch)
+
+        # Get semantic context
+        context_chunks = self._get_context(trimmed, index, metadata, repo_name)
+
+        # Generate review prompt
+        prompt = self._build_review_prompt(
+            filename=filename,
+            language=language,
+            symbols=symbols,
+            context=context_chunks,
+            patch=trimmed,
+        )
+
+        logger.debug(
+            "Generating review",
+            filename=filename,
+            patch_length=len(trimmed),
+        )
+
+        return _PreparedReview(
+            filename=filename,
+            language=language,
+            symbols=symbols,
+            trimmed=trimmed,
+            context=context_chunks,
+            prompt=prompt,
+        )
+
+    def _finish_review(
+        self, prepared: _PreparedReview, response_text: str, start_time: float
+    ) -> PatchReview:
+        """Parse the API response into a successful PatchReview."""
+        # Parse response into structured comments
+        comments = self._parse_review_response(response_text)
+
+        processing_time = (time.time() - start_time) * 1000
+
+        logger.info(
+            "Review generated",
+            filename=prepared.filename,
+            comments_count=len(comments),
+            processing_time_ms=int(processing_time),
+        )
+
+        return PatchReview(
+            file=prepared.filename,
+            language=prepared.language,
+            symbols=prepared.symbols,
+            comments=comments,
+            summary=response_text[:1000],
+            context_used=prepared.context,
+            processing_time_ms=processing_time,
+            status="success",
+        )
+
+    def _failed_review(
+        self, filename: str, error: Exception, start_time: float
+    ) -> PatchReview:
+        """Log a review failure and build the failed PatchReview."""
+        # Rate limiting fails many files back to back for a known reason;
+        # only unexpected errors are worth a formatted traceback
+        logger.error(
+            "Review generation failed",
+            filename=filename,
+            error=str(error),
+            exc_info=not isinstance(error, (ResourceExhausted, RateLimitExceeded)),
+        )
+        return PatchReview(
+            file=filename,
+            language="unknown",
+            symbols=[],
+            comments=[],
+            summary=f"Review failed: {str(error)}",
+            context_used=[],
+            processing_time_ms=(time.time() - start_time) * 1000,
+            status="failure",
+        )
 
     def review_patch(
         self,
@@ -147,72 +417,47 @@ class ReviewGenerator:
         start_time = time.time()
 
         try:
-            language = detect_language_from_filename(str(filename))
-            symbols = extract_symbols_from_patch(patch)
-            trimmed = trim_diff(patch)
-
-            # Get semantic context
-            context_chunks = semantic_search(trimmed, index, metadata)
-            context_chunks = context_chunks[:TOP_K]
-
-            # Generate review prompt
-            prompt = self._build_review_prompt(
-                filename=filename,
-                language=language,
-                symbols=symbols,
-                context=context_chunks,
-                patch=trimmed,
-            )
-
-            logger.debug(
-                "Generating review",
-                filename=filename,
-                patch_length=len(trimmed),
-            )
-
+            prepared = self._prepare_review(patch, filename, index, metadata, repo_name)
             # Call API with retry logic
-            response_text = self._call_api_with_retry(prompt)
+            response_text = self._call_api_with_retry(prepared.prompt)
+            return self._finish_review(prepared, response_text, start_time)
+        except Exception as e:
+            return self._failed_review(filename, e, start_time)
 
-            # Parse response into structured comments
-            comments = self._parse_review_response(response_text)
+    async def review_patch_async(
+        self,
+        patch: str,
+        filename: str,
+        index: faiss.Index,
+        metadata: List[Dict],
+        repo_name: str = "",
+    ) -> PatchReview:
+        """
+        Generate a review for a single patch without blocking the event loop.
 
-            processing_time = (time.time() - start_time) * 1000
+        Context search runs in a worker thread and the API call uses
+        Gemini's async client.
 
-            logger.info(
-                "Review generated",
-                filename=filename,
-                comments_count=len(comments),
-                processing_time_ms=int(processing_time),
-            )
+        Args:
+            patch: The patch/diff content
+            filename: The filename being reviewed
+            index: FAISS index for semantic search
+            metadata: Metadata for indexed chunks
+            repo_name: Name of repository
 
-            return PatchReview(
-                file=filename,
-                language=language,
-                symbols=symbols,
-                comments=comments,
-                summary=response_text[:1000],
-                context_used=context_chunks,
-                processing_time_ms=processing_time,
-                status="success",
-            )
+        Returns:
+            PatchReview object with structured comments
+        """
+        start_time = time.time()
 
-        except Exception as e:
-            logger.error(
-                "Review generation failed",
-                filename=filename,
-                error=str(e),
-                exc_info=True,
-            )
-            return PatchReview(
-                file=filename,
-                language="unknown",
-                symbols=[],
-                comments=[],
-                summary=f"Review failed: {str(e)}",
-                context_used=[],
-                processing_time_ms=(time.time() - start_time) * 1000,
-                status="failure",
+        try:
+            prepared = await asyncio.to_thread(
+                self._prepare_review, patch, filename, index, metadata, repo_name
             )
+            response_text = await self._call_api_with_retry_async(prepared.prompt)
+            return self._finish_review(prepared, response_text, start_time)
+        except Exception as e:
+            return self._failed_review(filename, e, start_time)
 
     def _build_review_prompt(
         self,
@@ -231,7 +476,7 @@ You are an expert software code reviewer. Analyze the following patch and provid
 **Changed Symbols:** {', '.join(symbols) if symbols else 'N/A'}
 
 **Repository Context** (similar code from repo):
-{json.dumps(context, indent=2)[:2000]}
+{_context_json(context)}
 
 **Patch to Review:**
 {patch}
@@ -247,13 +492,67 @@ Format each issue as:
 Be specific and actionable in your feedback.
 """
 
+    def _build_group_prompt(self, prepared: List[_PreparedReview]) -> str:
+        """Build one prompt reviewing several patches, one section per file."""
+        sections = "\n".join(
+            f"""{_GROUP_FILE_MARKER.format(item.filename)}
+**Language:** {item.language}
+**Changed Symbols:** {', '.join(item.symbols) if item.symbols else 'N/A'}
+
+**Repository Context** (similar code from repo):
+{_context_json(item.context)}
+
+**Patch to Review:**
+{item.trimmed}
+"""
+            for item in prepared
+        )
+
+        return f"""
+You are an expert software code reviewer. Analyze the following {len(prepared)} patches and provide a detailed code review of each.
+
+{sections}
+Review each file separately. Start each file's review with its header line
+exactly as given above (e.g. {_GROUP_FILE_MARKER.format(prepared[0].filename)}).
+
+For each file, provide a detailed review with:
+1. **Critical Issues**: Security vulnerabilities, crashes, data loss risks
+2. **Warnings**: Performance issues, code smells, maintainability concerns
+3. **Info**: Style suggestions, documentation improvements
+
+Format each issue as:
+- [CRITICAL/WARNING/INFO] Category: Brief description
+
+Be specific and actionable in your feedback.
+"""
+
+    def _split_group_response(self, response_text: str) -> Dict[str, str]:
+        """Split a grouped review response into {filename: review text}."""
+        sections = {}
+        matches = list(_GROUP_FILE_RE.finditer(response_text))
+        for i, match in enumerate(matches):
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(response_text)
+            section = response_text[match.end():end].strip()
+            if section:
+                sections[match.group(1)] = section
+        return sections
+
     def _call_api_with_retry(
         self, prompt: str, max_retries: int = 3
     ) -> str:
-        """Call Gemini API with exponential backoff retry."""
+        """
+        Call Gemini API with exponential backoff retry.
+
+        A rate limit hit by any worker pauses all of them until a shared,
+        jittered deadline, rather than each backing off on its own schedule.
+        """
         delay = 10
 
         for attempt in range(max_retries):
+            wait = _rate_limit_wait()
+            if wait:
+                time.sleep(wait)
+
             try:
                 response = self.model.generate_content(prompt)
                 if response and response.text:
@@ -267,10 +566,10 @@ Be specific and actionable in your feedback.
                     max_retries=max_retries,
                 )
                 if attempt < max_retries - 1:
-                    time.sleep(delay)
-                    delay *= 2
+                    _start_rate_limit_backoff(delay)
+                    delay = min(delay * 2, MAX_RETRY_DELAY)
                 else:
-                    raise Exception(f"API rate limit exceeded after {max_retries} retries")
+                    raise RateLimitExceeded(f"API rate limit exceeded after {max_retries} retries")
 
             except Exception as e:
                 logger.error(f"API error: {str(e)}")
@@ -281,59 +580,224 @@ Be specific and actionable in your feedback.
 
         return "Review failed after all retries"
 
-    def review_batch(
+    async def _call_api_with_retry_async(
+        self, prompt: str, max_retries: int = 3
+    ) -> str:
+        """Call Gemini's async API with exponential backoff retry."""
+        delay = 10
+
+        for attempt in range(max_retries):
+            wait = _rate_limit_wait()
+            if wait:
+                await asyncio.sleep(wait)
+
+            try:
+                response = await self.model.generate_content_async(prompt)
+                if response and response.text:
+                    return response.text
+                return "No response from API"
+
+            except ResourceExhausted as e:
+                logger.warning(
+                    "API rate limit hit",
+                    attempt=attempt + 1,
+                    max_retries=max_retries,
+                )
+                if attempt < max_retries - 1:
+                    _start_rate_limit_backoff(delay)
+                    delay = min(delay * 2, MAX_RETRY_DELAY)
+                else:
+                    raise RateLimitExceeded(f"API rate limit exceeded after {max_retries} retries")
+
+            except Exception as e:
+                logger.error(f"API error: {str(e)}")
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(5)
+                else:
+                    raise
+
+        return "Review failed after all retries"
+
+    async def review_group_async(
         self,
         patches: List[Tuple[str, str]],  # List of (patch, filename)
         index: faiss.Index,
         metadata: List[Dict],
+        repo_name: str = "",
     ) -> List[PatchReview]:
         """
-        Review multiple patches in parallel.
+        Review several patches with a single API call.
+
+        Each file gets a marked section in the prompt and is expected to get
+        one back in the response; files the response doesn't cover are
+        reviewed on their own, concurrently.
 
         Args:
             patches: List of (patch, filename) tuples
             index: FAISS index for semantic search
             metadata: Metadata for indexed chunks
+            repo_name: Name of repository
 
         Returns:
-            List of PatchReview objects
+            List of PatchReview objects, in the order of patches
         """
+        if len(patches) == 1:
+            patch, filename = patches[0]
+            return [
+                await self.review_patch_async(patch, filename, index, metadata, repo_name)
+            ]
+
+        start_time = time.time()
+        try:
+            prepared = await asyncio.to_thread(
+                lambda: [
+                    self._prepare_review(patch, filename, index, metadata, repo_name)
+                    for patch, filename in patches
+                ]
+            )
+            response_text = await self._call_api_with_retry_async(
+                self._build_group_prompt(prepared)
+            )
+        except Exception as e:
+            return [self._failed_review(filename, e, start_time) for _, filename in patches]
+
+        sections = self._split_group_response(response_text)
         reviews = []
+        missing = []
+        for (patch, filename), item in zip(patches, prepared):
+            section = sections.get(filename)
+            if section is None:
+                logger.warning("File missing from grouped review", filename=filename)
+                missing.append((len(reviews), patch, filename))
+                reviews.append(None)
+            else:
+                reviews.append(self._finish_review(item, section, start_time))
+
+        # Re-review uncovered files concurrently, within the caller's
+        # concurrency slot, rather than one round trip after another
+        fallbacks = await asyncio.gather(
+            *(
+                self.review_patch_async(patch, filename, index, metadata, repo_name)
+                for _, patch, filename in missing
+            )
+        )
+        for (position, _, _), review in zip(missing, fallbacks):
+            reviews[position] = review
+        return reviews
 
-        with ThreadPoolExecutor(max_workers=DEFAULT_PARALLEL_WORKERS) as executor:
-            futures = {
-                executor.submit(
-                    self.review_patch, patch, filename, index, metadata
-                ): filename
-                for patch, filename in patches
-            }
+    def review_group(
+        self,
+        patches: List[Tuple[str, str]],  # List of (patch, filename)
+        index: faiss.Index,
+        metadata: List[Dict],
+        repo_name: str = "",
+    ) -> List[PatchReview]:
+        """
+        Review several patches with a single API call from synchronous code.
 
-            for future in as_completed(futures):
-                try:
-                    review = future.result()
-                    reviews.append(review)
-                except Exception as e:
-                    filename = futures[future]
-                    logger.error(
-                        "Parallel review failed",
-                        filename=filename,
-                        error=str(e),
-                    )
-                    reviews.append(
-                        PatchReview(
-                            file=filename,
-                            language="unknown",
-                            symbols=[],
-                            comments=[],
-                            summary=f"Review failed: {str(e)}",
-                            context_used=[],
-                            processing_time_ms=0,
-                            status="failure",
-                        )
+        Safe to call from a running event loop, but it blocks that loop;
+        async callers should await review_group_async instead.
+        """
+        return _run_sync(self.review_group_async(patches, index, metadata, repo_name))
+
+    async def review_batch_async(
+        self,
+        patches: List[Tuple[str, str]],  # List of (patch, filename)
+        index: faiss.Index,
+        metadata: List[Dict],
+        max_concurrency: int = DEFAULT_PARALLEL_WORKERS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> List[PatchReview]:
+        """
+        Review multiple patches concurrently.
+
+        Patches are sent in groups of batch_size per API call, and up to
+        max_concurrency groups are in flight at once.
+
+        Args:
+            patches: List of (patch, filename) tuples
+            index: FAISS index for semantic search
+            metadata: Metadata for indexed chunks
+            max_concurrency: Maximum API calls in flight at once
+            batch_size: Patches reviewed per API call
+
+        Returns:
+            List of PatchReview objects, in the order of patches
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        batch_size = max(1, batch_size)
+        groups = [
+            patches[i:i + batch_size] for i in range(0, len(patches), batch_size)
+        ]
+
+        async def review_one(group: List[Tuple[str, str]]) -> List[PatchReview]:
+            async with semaphore:
+                return await self.review_group_async(group, index, metadata)
+
+        results = await asyncio.gather(
+            *(review_one(group) for group in groups),
+            return_exceptions=True,
+        )
+
+        reviews = []
+        for group, result in zip(groups, results):
+            if not isinstance(result, BaseException):
+                reviews.extend(result)
+                continue
+
+            for _, filename in group:
+                logger.error(
+                    "Parallel review failed",
+                    filename=filename,
+                    error=str(result),
+                )
+                reviews.append(
+                    PatchReview(
+                        file=filename,
+                        language="unknown",
+                        symbols=[],
+                        comments=[],
+                        summary=f"Review failed: {str(result)}",
+                        context_used=[],
+                        processing_time_ms=0,
+                        status="failure",
                     )
+                )
 
         return reviews
 
+    def review_batch(
+        self,
+        patches: List[Tuple[str, str]],  # List of (patch, filename)
+        index: faiss.Index,
+        metadata: List[Dict],
+    ) -> List[PatchReview]:
+        """
+        Review multiple patches concurrently from synchronous code.
+
+        Safe to call from a running event loop, but it blocks that loop;
+        async callers should await review_batch_async instead.
+
+        Args:
+            patches: List of (patch, filename) tuples
+            index: FAISS index for semantic search
+            metadata: Metadata for indexed chunks
+
+        Returns:
+            List of PatchReview objects, in the order of patches
+        """
+        return _run_sync(self.review_batch_async(patches, index, metadata))
+
+
+def _get_default_generator() -> ReviewGenerator:
+    """Get or create the shared default ReviewGenerator."""
+    global _default_generator
+    if _default_generator is None:
+        with _default_generator_lock:
+            if _default_generator is None:
+                _default_generator = ReviewGenerator()
+    return _default_generator
+
 
 def review_patch_legacy(
     patch: str,
@@ -348,7 +812,7 @@ def review_patch_legacy(
     Legacy interface for backward compatibility.
     Generates a review using the new ReviewGenerator.
     """
-    generator = ReviewGenerator()
+    generator = _get_default_generator()
     review = generator.review_patch(patch, filename, index, metadata, repo_full_name)
 
     # Convert to legacy format
@@ -1,4 +1,7 @@
 # backend/semantic_search.py
+import hashlib
+import threading
+from collections import OrderedDict
 from typing import List, Tuple
 from sentence_transformers import SentenceTransformer
 import numpy as np
@@ -6,23 +9,79 @@ import faiss
 from backend.config import TOP_K
 from backend.context_indexer import _get_model
 
-def semantic_search(query: str, index: faiss.Index, metadata: List[dict]) -> List[dict]:
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+
+# Query embeddings keyed by a digest of the query (queries are whole patches,
+# so the text itself would be a large key); LRU order
+_embedding_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+_embedding_cache_lock = threading.Lock()
+
+
+def _query_key(query: str) -> bytes:
+    return hashlib.blake2b(query.encode("utf-8"), digest_size=16).digest()
+
+
+def _encode_queries(queries: List[str]) -> np.ndarray:
+    """
+    Embed queries into a contiguous (n, d) float32 array.
+
+    Previously seen queries reuse their cached embedding; the rest are
+    encoded together in one forward pass.
+    """
+    keys = [_query_key(query) for query in queries]
+    with _embedding_cache_lock:
+        rows = []
+        for key in keys:
+            row = _embedding_cache.get(key)
+            if row is not None:
+                _embedding_cache.move_to_end(key)
+            rows.append(row)
+
+    missing = [i for i, row in enumerate(rows) if row is None]
+    if missing:
+        embeddings = _get_model().encode(
+            [queries[i] for i in missing], convert_to_numpy=True, show_progress_bar=False
+        )
+        with _embedding_cache_lock:
+            for i, embedding in zip(missing, embeddings):
+                row = np.array(embedding, dtype=np.float32)
+                row.flags.writeable = False
+                rows[i] = row
+                _embedding_cache[keys[i]] = row
+            while len(_embedding_cache) > QUERY_EMBEDDING_CACHE_SIZE:
+                _embedding_cache.popitem(last=False)
+
+    return np.ascontiguousarray(np.stack(rows), dtype=np.float32)
+
+
+def semantic_search(
+    query: str, index: faiss.Index, metadata: List[dict], top_k: int = TOP_K
+) -> List[dict]:
     """
     Retrieve top-k relevant context chunks from the repo's FAISS index.
-    The index and metadata are now passed as arguments.
+    The index and metadata are now passed as arguments; FAISS returns at
+    most top_k hits, so callers don't need to trim the result.
+    """
+    return semantic_search_batch([query], index, metadata, top_k)[0]
+
+
+def semantic_search_batch(
+    queries: List[str], index: faiss.Index, metadata: List[dict], top_k: int = TOP_K
+) -> List[List[dict]]:
     """
-    if index is None or not metadata:
-        return []
-
-    model = _get_model()
-    q_emb = model.encode([query])[0].astype("float32")
-    
-    # Use the passed index for searching
-    D, I = index.search(np.array([q_emb]), TOP_K)
-
-    results = []
-    for idx in I[0]:
-        if idx < 0 or idx >= len(metadata):
-            continue
-        results.append(metadata[idx])
-    return results
\ No newline at end of file
+    Retrieve top-k context chunks for several queries at once.
+
+    One encode call and one FAISS search cover every query, so model and
+    search overhead is paid once rather than per query.
+
+    Returns:
+        One list of metadata dicts per query, in query order
+    """
+    if index is None or not metadata or not queries:
+        return [[] for _ in queries]
+
+    # encode() already returns a 2-D array; no re-wrapping or copying
+    D, I = index.search(_encode_queries(queries), top_k)
+
+    n_chunks = len(metadata)
+    return [[metadata[idx] for idx in row if 0 <= idx < n_chunks] for row in I]
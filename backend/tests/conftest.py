@@ -9,7 +9,7 @@ import tempfile
 from unittest.mock import Mock, MagicMock, patch
 from pathlib import Path
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 
@@ -17,31 +17,62 @@ from backend.db_models import Base
 from backend.database import SessionLocal
 
 
-@pytest.fixture
-def test_db():
-    """Create an in-memory SQLite database for testing."""
-    # Create in-memory database
+@pytest.fixture(scope="session")
+def _test_engine():
+    """In-memory SQLite engine with the schema created once per test run."""
     engine = create_engine(
         "sqlite:///:memory:",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
 
-    # Create all tables
+    # pysqlite's own transaction handling ignores SAVEPOINTs; let SQLAlchemy
+    # emit BEGIN so per-test savepoints can be rolled back
+    @event.listens_for(engine, "connect")
+    def do_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def test_db(_test_engine):
+    """
+    Database session for one test.
+
+    Everything runs inside an outer transaction that is rolled back after the
+    test; commit() in tests or endpoints only releases a SAVEPOINT, so no
+    per-test DDL is needed.
+    """
+    connection = _test_engine.connect()
+    transaction = connection.begin()
 
     # Create session
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    TestingSessionLocal = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=connection,
+        join_transaction_mode="create_savepoint",
+    )
 
     # Patch the get_db_session function to use test database
     from backend import database
     original_sessionlocal = database.SessionLocal
     database.SessionLocal = TestingSessionLocal
 
-    yield TestingSessionLocal()
+    session = TestingSessionLocal()
+    yield session
 
     # Cleanup
-    Base.metadata.drop_all(bind=engine)
+    session.close()
+    transaction.rollback()
+    connection.close()
     database.SessionLocal = original_sessionlocal
 
 
@@ -103,7 +134,7 @@ def mock_gemini_client():
 @pytest.fixture
 def mock_github_api():
     """Mock requests for GitHub API calls."""
-    with patch("requests.post") as mock_post:
+    with patch("requests.Session.post") as mock_post:
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.json.return_value = {
@@ -0,0 +1,128 @@
+"""
+Tests for GitHub App authentication module.
+"""
+
+import pytest
+import time
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from backend import auth
+
+
+@pytest.fixture(autouse=True)
+def app_credentials(monkeypatch):
+    """Use a throwaway RSA key and empty token caches for each test."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+    monkeypatch.setattr(auth, "APP_ID", "12345")
+    monkeypatch.setattr(auth, "PRIVATE_KEY", pem)
+    auth._jwt_cache.clear()
+    auth._install_token_cache.clear()
+    auth._github_clients.clear()
+    yield
+    auth._jwt_cache.clear()
+    auth._install_token_cache.clear()
+    auth._github_clients.clear()
+
+
+class TestBuildAppJwt:
+    """Tests for app JWT caching."""
+
+    def test_jwt_reused_while_fresh(self):
+        """Repeated calls should return the cached JWT."""
+        assert auth.build_app_jwt() == auth.build_app_jwt()
+
+    def test_jwt_rebuilt_near_expiry(self):
+        """A JWT inside the refresh margin should be re-signed."""
+        auth.build_app_jwt()
+        auth._jwt_cache[auth.APP_ID] = ("stale", time.time() + 5)
+        assert auth.build_app_jwt() != "stale"
+        assert auth._jwt_cache[auth.APP_ID][1] - time.time() > 60
+
+
+class TestGetInstallationToken:
+    """Tests for installation token caching."""
+
+    def test_token_cached_per_installation(self, mock_github_api):
+        """Second call for the same installation should not hit GitHub."""
+        assert auth.get_installation_token("1") == "ghu_test_token_123"
+        assert auth.get_installation_token("1") == "ghu_test_token_123"
+        assert mock_github_api.call_count == 1
+
+    def test_separate_installations(self, mock_github_api):
+        """Each installation gets its own token."""
+        auth.get_installation_token("1")
+        auth.get_installation_token("2")
+        assert mock_github_api.call_count == 2
+
+    def test_expired_token_refreshed(self, mock_github_api):
+        """Tokens near expiry should be refreshed."""
+        auth.get_installation_token("1")
+        auth._install_token_cache["1"] = ("stale", time.time() + 5)
+        assert auth.get_installation_token("1") == "ghu_test_token_123"
+        assert mock_github_api.call_count == 2
+
+    def test_token_refreshed_five_minutes_early(self, mock_github_api):
+        """Installation tokens within five minutes of expiry are refreshed."""
+        auth.get_installation_token("1")
+        auth._install_token_cache["1"] = ("stale", time.time() + 240)
+        assert auth.get_installation_token("1") == "ghu_test_token_123"
+        assert mock_github_api.call_count == 2
+
+
+class TestGetGithubClient:
+    """Tests for pooled PyGithub clients."""
+
+    def test_client_reused_for_same_token(self, mock_github_api):
+        """The same installation and token should reuse one client."""
+        assert auth.get_github_client("1") is auth.get_github_client("1")
+
+    def test_client_rebuilt_after_token_refresh(self, mock_github_api):
+        """A refreshed token should get a new client."""
+        first = auth.get_github_client("1")
+        auth._install_token_cache["1"] = ("stale", time.time() + 5)
+        mock_github_api.return_value.json.return_value = {
+            "token": "ghu_new_token",
+            "expires_in": 3600,
+        }
+        assert auth.get_github_client("1") is not first
+
+    def test_replaced_client_closed(self, mock_github_api, monkeypatch):
+        """The client for a rotated token should release its connection pool."""
+        first = auth.get_github_client("1")
+        closed = []
+        monkeypatch.setattr(first, "close", lambda: closed.append(first))
+        auth._install_token_cache["1"] = ("stale", time.time() + 5)
+        mock_github_api.return_value.json.return_value = {
+            "token": "ghu_new_token",
+            "expires_in": 3600,
+        }
+        auth.get_github_client("1")
+        assert closed == [first]
+
+    def test_evicted_client_left_open(self, mock_github_api, monkeypatch):
+        """LRU eviction should not close a client a review may still be using."""
+        monkeypatch.setattr(auth, "INSTALL_TOKEN_CACHE_SIZE", 1)
+        first = auth.get_github_client("1")
+        closed = []
+        monkeypatch.setattr(first, "close", lambda: closed.append(first))
+        auth.get_github_client("2")
+        assert "1" not in auth._github_clients
+        assert closed == []
+
+
+class TestParseExpiresAt:
+    """Tests for installation token expiry parsing."""
+
+    def test_zulu_suffix(self):
+        """GitHub's trailing Z should parse as UTC."""
+        assert auth._parse_expires_at({"expires_at": "2024-01-01T00:00:00Z"}) == 1704067200
+
+    def test_fallback_to_expires_in(self):
+        """Without expires_at, the token lasts expires_in seconds from now."""
+        assert abs(auth._parse_expires_at({"expires_in": 60}) - (time.time() + 60)) < 5
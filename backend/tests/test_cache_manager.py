@@ -0,0 +1,171 @@
+"""
+Tests for index cache management.
+"""
+
+import os
+import pickle
+import time
+
+import faiss
+import numpy as np
+import pytest
+
+from backend import cache_manager
+from backend.cache_manager import (
+    HNSW_EF_SEARCH,
+    INDEX_TYPE_HNSW,
+    INDEX_TYPE_IVFPQ,
+    IVF_NPROBE,
+    CacheManager,
+    get_index_type,
+)
+
+REPO = "test-owner/test-repo"
+SHA = "abc123"
+METADATA = [{"path": "a.py", "chunk": 0}, {"path": "b.py", "chunk": 1}]
+
+
+def _vectors(n: int, dimension: int = 16) -> np.ndarray:
+    return np.random.default_rng(0).random((n, dimension), dtype="float32")
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Cache manager writing to a temporary directory."""
+    return CacheManager(cache_dir=tmp_path)
+
+
+@pytest.fixture(scope="module")
+def ivf_index(tmp_path_factory):
+    """
+    Small IVF-PQ index built by lowering the IVF threshold.
+
+    Two dimensions keep PQ training (256 centroids per sub-quantizer) quick;
+    the index is built once and shared by the module's tests.
+    """
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(cache_manager, "USE_IVF_FOR_LARGE_REPOS", True)
+        monkeypatch.setattr(cache_manager, "IVF_THRESHOLD", 100)
+        manager = CacheManager(cache_dir=tmp_path_factory.mktemp("ivf"))
+        return manager.build_index(_vectors(300, dimension=2))
+
+
+class TestBuildIndex:
+    """Tests for index type selection."""
+
+    def test_small_repo_uses_hnsw(self, manager):
+        """Below the threshold the index is HNSW, tuned for search."""
+        index = manager.build_index(_vectors(50))
+        assert get_index_type(index) == INDEX_TYPE_HNSW
+        assert index.hnsw.efSearch == HNSW_EF_SEARCH
+        assert index.ntotal == 50
+
+    def test_large_repo_uses_ivfpq(self, ivf_index):
+        """Above the threshold the index is a trained IVF-PQ index."""
+        assert get_index_type(ivf_index) == INDEX_TYPE_IVFPQ
+        assert faiss.extract_index_ivf(ivf_index).nprobe == IVF_NPROBE
+        assert ivf_index.ntotal == 300
+
+    def test_ivf_disabled(self, manager, monkeypatch):
+        """With IVF disabled, large repos stay on HNSW."""
+        monkeypatch.setattr(cache_manager, "USE_IVF_FOR_LARGE_REPOS", False)
+        monkeypatch.setattr(cache_manager, "IVF_THRESHOLD", 100)
+        assert get_index_type(manager.build_index(_vectors(200))) == INDEX_TYPE_HNSW
+
+
+class TestSaveAndLoad:
+    """Tests for the on-disk cache format."""
+
+    def test_round_trip(self, manager):
+        """Metadata and index survive a save/load through the msgpack sidecar."""
+        manager.save_index(manager.build_index(_vectors(50)), METADATA, REPO, SHA)
+        assert manager.get_metadata_path(REPO, SHA).exists()
+
+        index, metadata = manager.load_index(REPO, SHA)
+        assert metadata == METADATA
+        assert get_index_type(index) == INDEX_TYPE_HNSW
+        assert index.hnsw.efSearch == HNSW_EF_SEARCH
+        assert index.ntotal == 50
+
+    def test_legacy_pickle_metadata(self, manager):
+        """Caches written with pickled metadata still load."""
+        faiss.write_index(
+            manager.build_index(_vectors(50)), str(manager.get_index_path(REPO, SHA))
+        )
+        with open(manager.get_legacy_metadata_path(REPO, SHA), "wb") as f:
+            pickle.dump(METADATA, f)
+
+        index, metadata = manager.load_index(REPO, SHA)
+        assert metadata == METADATA
+        assert index.ntotal == 50
+
+    def test_ivf_loaded_memory_mapped(self, manager, ivf_index, monkeypatch):
+        """IVF-PQ indexes are read with the mmap flags."""
+        manager.save_index(ivf_index, METADATA, REPO, SHA)
+
+        flags = []
+        read_index = faiss.read_index
+
+        def spy(path, *args):
+            flags.extend(args)
+            return read_index(path, *args)
+
+        monkeypatch.setattr(cache_manager.faiss, "read_index", spy)
+        index, _ = manager.load_index(REPO, SHA)
+        assert flags == [faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY]
+        assert faiss.extract_index_ivf(index).nprobe == IVF_NPROBE
+        assert index.search(_vectors(1, dimension=2), 1)[1].shape == (1, 1)
+
+    def test_type_mismatch_is_miss(self, manager):
+        """An index that doesn't match its recorded type is not served."""
+        manager.save_index(manager.build_index(_vectors(50)), METADATA, REPO, SHA)
+        faiss.write_index(
+            faiss.IndexFlatL2(16), str(manager.get_index_path(REPO, SHA))
+        )
+        assert manager.load_index(REPO, SHA) == (None, None)
+
+    def test_failed_save_keeps_previous_cache(self, manager, monkeypatch):
+        """A save that fails mid-write leaves no temp files or torn index."""
+        manager.save_index(manager.build_index(_vectors(50)), METADATA, REPO, SHA)
+
+        def broken(index, fileobj):
+            fileobj.write(b"partial")
+            raise OSError("disk full")
+
+        monkeypatch.setattr(cache_manager, "_write_index_stream", broken)
+        manager.save_index(manager.build_index(_vectors(80)), METADATA, REPO, SHA)
+
+        assert not list(manager.cache_dir.glob("*.tmp"))
+        index, _ = manager.load_index(REPO, SHA)
+        assert index.ntotal == 50
+
+
+class TestCleanup:
+    """Tests for expiring cached indexes."""
+
+    def test_old_indexes_removed_with_sidecars(self, manager):
+        """Expired indexes and both metadata formats are deleted in parallel."""
+        index = manager.build_index(_vectors(10))
+        old = time.time() - 3 * 86400
+        for sha in ("old1", "old2"):
+            manager.save_index(index, METADATA, REPO, sha)
+            manager.get_legacy_metadata_path(REPO, sha).write_bytes(b"")
+            os.utime(manager.get_index_path(REPO, sha), (old, old))
+        manager.save_index(index, METADATA, REPO, "fresh")
+
+        assert manager.cleanup_old_indexes(ttl_days=1) == 2
+        remaining = sorted(p.name for p in manager.cache_dir.iterdir())
+        assert remaining == [
+            manager.get_index_path(REPO, "fresh").name,
+            manager.get_metadata_path(REPO, "fresh").name,
+        ]
+
+    def test_expired_cache_is_miss(self, manager, monkeypatch):
+        """An index past its TTL is deleted on lookup."""
+        manager.save_index(manager.build_index(_vectors(10)), METADATA, REPO, SHA)
+        old = time.time() - 3 * 86400
+        os.utime(manager.get_index_path(REPO, SHA), (old, old))
+        monkeypatch.setattr(cache_manager, "DEFAULT_TTL_DAYS", 1)
+
+        assert not manager.cache_exists(REPO, SHA)
+        assert not manager.get_index_path(REPO, SHA).exists()
@@ -0,0 +1,87 @@
+"""
+Tests for database models.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import MetaData, create_engine, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateTable
+
+from backend.db_models import Base, ReviewRecord
+
+
+def _record(**kwargs) -> ReviewRecord:
+    return ReviewRecord(
+        installation_id="1",
+        repo_name="test-owner/test-repo",
+        pr_number=1,
+        pr_url="https://github.com/test-owner/test-repo/pull/1",
+        commit_sha="abc123",
+        **kwargs,
+    )
+
+
+class TestTimestamps:
+    """Tests for database-stamped UTC timestamps."""
+
+    def test_created_at_is_utc(self, test_db):
+        """New rows should be stamped with the current UTC time."""
+        record = _record()
+        test_db.add(record)
+        test_db.commit()
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        assert abs(record.created_at - now) < timedelta(seconds=5)
+        assert abs(record.updated_at - now) < timedelta(seconds=5)
+
+    def test_insert_without_server_default(self):
+        """Tables created before the server default existed still accept rows."""
+        metadata = MetaData()
+        for table in Base.metadata.sorted_tables:
+            legacy = table.to_metadata(metadata)
+            for column in legacy.columns:
+                column.server_default = None
+
+        engine = create_engine("sqlite:///:memory:")
+        metadata.create_all(engine)
+        with Session(engine) as session:
+            record = _record()
+            session.add(record)
+            session.commit()
+            assert record.created_at is not None
+        engine.dispose()
+
+    def test_postgresql_default_converts_to_utc(self):
+        """PostgreSQL's now() is server-local, so the default converts it."""
+        ddl = str(
+            CreateTable(ReviewRecord.__table__).compile(dialect=postgresql.dialect())
+        )
+        assert "DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP)" in ddl
+
+
+class TestUUIDKeys:
+    """Tests for UUID ids kept in string columns."""
+
+    def test_legacy_string_id_matches(self, test_db):
+        """Dashed string ids written by older releases load as uuid.UUID."""
+        review_id = uuid.uuid4()
+        test_db.execute(
+            text(
+                "INSERT INTO review_records "
+                "(id, installation_id, repo_name, pr_number, pr_url, commit_sha, "
+                "review_status) VALUES (:id, '1', 'o/r', 1, 'u', 'abc', 'SUCCESS')"
+            ),
+            {"id": str(review_id)},
+        )
+        record = test_db.get(ReviewRecord, review_id)
+        assert record is not None
+        assert record.id == review_id
+
+    def test_postgresql_column_type_unchanged(self):
+        """Ids stay VARCHAR(36) so existing PostgreSQL schemas keep working."""
+        ddl = str(
+            CreateTable(ReviewRecord.__table__).compile(dialect=postgresql.dialect())
+        )
+        assert "id VARCHAR(36) NOT NULL" in ddl
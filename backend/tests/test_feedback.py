@@ -0,0 +1,218 @@
+"""
+Tests for feedback endpoints.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.analytics_cache import get_analytics_cache
+from backend.database import get_db_session
+from backend.db_models import ReviewFeedback, ReviewRecord
+from backend.feedback import router
+
+
+@pytest.fixture
+def client(test_db):
+    """Test client for the feedback router backed by the test database."""
+    get_analytics_cache().clear()
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_db_session] = lambda: test_db
+    return TestClient(app)
+
+
+@pytest.fixture
+def review(test_db):
+    """A stored review to attach feedback to."""
+    record = ReviewRecord(
+        installation_id="1",
+        repo_name="test-owner/test-repo",
+        pr_number=123,
+        pr_url="https://github.com/test-owner/test-repo/pull/123",
+        commit_sha="abc1234567890def",
+    )
+    test_db.add(record)
+    test_db.commit()
+    return record
+
+
+class TestSubmitFeedback:
+    """Tests for single feedback submission."""
+
+    def test_feedback_created(self, client, review, test_db):
+        """Feedback should be stored and its id and timestamp returned."""
+        response = client.post(
+            f"/api/reviews/{review.id}/feedback",
+            params={"rating": 4, "is_helpful": True},
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert body["feedback_id"]
+        assert body["created_at"]
+        assert test_db.query(ReviewFeedback).count() == 1
+
+    def test_invalid_rating(self, client, review):
+        """Ratings outside 1-5 should be rejected."""
+        response = client.post(
+            f"/api/reviews/{review.id}/feedback",
+            params={"rating": 0, "is_helpful": True},
+        )
+        assert response.status_code == 400
+
+
+class TestSubmitFeedbackBatch:
+    """Tests for batch feedback submission."""
+
+    def test_batch_inserted(self, client, review, test_db):
+        """All items should be stored and their ids returned."""
+        items = [
+            {"review_id": str(review.id), "rating": 5, "is_helpful": True},
+            {"review_id": str(review.id), "rating": 2, "is_helpful": False,
+             "comment": "missed a bug"},
+        ]
+        response = client.post("/api/reviews/feedback/batch", json=items)
+        assert response.status_code == 200
+        assert len(response.json()["feedback_ids"]) == 2
+        assert test_db.query(ReviewFeedback).count() == 2
+
+    def test_empty_batch_rejected(self, client):
+        """An empty batch is a client error."""
+        response = client.post("/api/reviews/feedback/batch", json=[])
+        assert response.status_code == 400
+
+    def test_invalid_rating_rejected(self, client, review):
+        """Ratings outside 1-5 should fail validation."""
+        items = [{"review_id": str(review.id), "rating": 9, "is_helpful": True}]
+        response = client.post("/api/reviews/feedback/batch", json=items)
+        assert response.status_code == 422
+
+
+class TestGetReviewFeedback:
+    """Tests for listing feedback."""
+
+    def _submit(self, client, review, rating):
+        client.post(
+            f"/api/reviews/{review.id}/feedback",
+            params={"rating": rating, "is_helpful": True},
+        )
+
+    def test_list_feedback(self, client, review):
+        """All feedback for the review should be returned."""
+        self._submit(client, review, 3)
+        self._submit(client, review, 5)
+        body = client.get(f"/api/reviews/{review.id}/feedback").json()
+        assert body["feedback_count"] == 2
+        assert sorted(f["rating"] for f in body["feedback"]) == [3, 5]
+
+    def test_stream_ndjson(self, client, review):
+        """Streaming should emit one JSON object per line."""
+        import json
+
+        self._submit(client, review, 3)
+        self._submit(client, review, 5)
+        response = client.get(
+            f"/api/reviews/{review.id}/feedback", params={"stream": True}
+        )
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert sorted(f["rating"] for f in lines) == [3, 5]
+
+
+class TestFeedbackAnalytics:
+    """Tests for feedback analytics."""
+
+    def test_summary_from_histogram(self, client, review):
+        """Totals, average and helpful share should match the stored feedback."""
+        for rating, helpful in ((5, True), (3, False), (5, True), (1, False)):
+            client.post(
+                f"/api/reviews/{review.id}/feedback",
+                params={"rating": rating, "is_helpful": helpful},
+            )
+        body = client.get("/api/reviews/analytics/feedback").json()
+        assert body["total_feedback"] == 4
+        assert body["average_rating"] == 3.5
+        assert body["helpful_percentage"] == 50
+        assert body["feedback_by_rating"] == {"1": 1, "2": 0, "3": 1, "4": 0, "5": 2}
+
+    def test_cached_until_feedback_submitted(self, client, review, test_db):
+        """Cached analytics should be dropped when new feedback arrives."""
+        assert client.get("/api/reviews/analytics/feedback").json()["total_feedback"] == 0
+
+        # A write that bypasses the API changes the ETag, so the cached
+        # payload is not served for it either
+        test_db.add(ReviewFeedback(review_record_id=review.id, rating=4, is_helpful=True))
+        test_db.commit()
+        assert client.get("/api/reviews/analytics/feedback").json()["total_feedback"] == 1
+
+        client.post(
+            f"/api/reviews/{review.id}/feedback",
+            params={"rating": 5, "is_helpful": True},
+        )
+        assert client.get("/api/reviews/analytics/feedback").json()["total_feedback"] == 2
+
+    def test_no_feedback(self, client):
+        """An empty table should report zeros."""
+        body = client.get("/api/reviews/analytics/feedback").json()
+        assert body["total_feedback"] == 0
+
+
+class TestAnalyticsConditionalGet:
+    """Tests for ETag handling on the analytics endpoints."""
+
+    @pytest.mark.parametrize(
+        "path", ["/api/reviews/analytics/feedback", "/api/reviews/analytics/quality"]
+    )
+    def test_not_modified_until_feedback_changes(self, client, review, path):
+        """A matching If-None-Match gets an empty 304 until the data changes."""
+        etag = client.get(path).headers["ETag"]
+
+        response = client.get(path, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+        client.post(
+            f"/api/reviews/{review.id}/feedback",
+            params={"rating": 3, "is_helpful": True},
+        )
+        response = client.get(path, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_weak_and_listed_tags(self, client):
+        """Weak validators and tag lists should be matched too."""
+        path = "/api/reviews/analytics/feedback"
+        etag = client.get(path).headers["ETag"]
+        response = client.get(path, headers={"If-None-Match": f'"other", W/{etag}'})
+        assert response.status_code == 304
+
+    @pytest.mark.parametrize(
+        "path", ["/api/reviews/analytics/feedback", "/api/reviews/analytics/quality"]
+    )
+    def test_signature_failure_returns_500(self, client, monkeypatch, path):
+        """A database error while computing the ETag should be a uniform 500."""
+        from backend import feedback
+
+        def broken(db, stmt):
+            raise RuntimeError("db down")
+
+        monkeypatch.setattr(feedback, "_analytics_etag", broken)
+        response = client.get(path)
+        assert response.status_code == 500
+        assert response.json() == {"detail": "Failed to generate analytics"}
+
+
+class TestQualityAnalytics:
+    """Tests for review quality analytics."""
+
+    def test_reviews_with_feedback_counted_once(self, client, review):
+        """Several feedback entries on one review count as one review."""
+        for rating in (2, 4):
+            client.post(
+                f"/api/reviews/{review.id}/feedback",
+                params={"rating": rating, "is_helpful": True},
+            )
+        body = client.get("/api/reviews/analytics/quality").json()
+        assert body["total_reviews"] == 1
+        assert body["reviews_with_feedback"] == 1
@@ -0,0 +1,149 @@
+"""
+Tests for health and metrics module.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.database import get_db_session
+from backend.health import MetricsStore, MAX_TRACKED_DURATIONS, _get_dir_size, router
+
+
+@pytest.fixture
+def client(test_db):
+    """Test client for the health router bound to the in-memory test database."""
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_db_session] = lambda: test_db
+    return TestClient(app)
+
+
+class TestMetricsStore:
+    """Tests for MetricsStore class."""
+
+    def test_record_review_counts(self):
+        """Should count successes and failures separately."""
+        store = MetricsStore()
+        store.record_review(True, 100)
+        store.record_review(False, 200)
+        assert store.reviews_total == 2
+        assert store.reviews_success == 1
+        assert store.reviews_failure == 1
+
+    def test_avg_duration_empty(self):
+        """Average should be zero with no reviews."""
+        assert MetricsStore().get_avg_duration_ms() == 0.0
+
+    def test_avg_duration(self):
+        """Should average recorded durations."""
+        store = MetricsStore()
+        store.record_review(True, 100)
+        store.record_review(True, 300)
+        assert store.get_avg_duration_ms() == 200
+
+    def test_durations_bounded(self):
+        """Only the most recent durations should be kept."""
+        store = MetricsStore()
+        for i in range(MAX_TRACKED_DURATIONS + 500):
+            store.record_review(True, float(i))
+        assert len(store.review_durations) == MAX_TRACKED_DURATIONS
+        assert store.review_durations_sum == sum(store.review_durations)
+
+    def test_concurrent_increments_not_lost(self):
+        """Counters bumped from many threads should count every increment."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        store = MetricsStore()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: store.record_api_error(), range(2000)))
+        assert store.api_errors_total == 2000
+
+    def test_concurrent_durations_sum_consistent(self):
+        """The running sum should match the kept durations under concurrency."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        store = MetricsStore()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(
+                lambda i: store.record_review(True, float(i)),
+                range(MAX_TRACKED_DURATIONS * 3),
+            ))
+        assert len(store.review_durations) == MAX_TRACKED_DURATIONS
+        assert store.review_durations_sum == sum(store.review_durations)
+
+    def test_totals_without_redis(self):
+        """Totals should fall back to local counters when Redis is unset."""
+        store = MetricsStore()
+        store.record_review(True, 100)
+        store.record_api_error()
+        totals = store.get_totals()
+        assert totals["reviews_total"] == 1
+        assert totals["api_errors_total"] == 1
+        assert totals["rate_limit_hits_total"] == 0
+
+
+class TestDirSizeCache:
+    """Tests for cached directory sizes."""
+
+    def test_size_cached_within_ttl(self, tmp_path):
+        """Size should not be recomputed until the TTL expires."""
+        (tmp_path / "a.bin").write_bytes(b"x" * 10)
+        assert _get_dir_size(tmp_path) == 10
+        (tmp_path / "b.bin").write_bytes(b"x" * 5)
+        assert _get_dir_size(tmp_path) == 10
+        assert _get_dir_size(tmp_path, ttl=0) == 15
+
+    def test_missing_dir(self, tmp_path):
+        """A missing directory has size zero."""
+        assert _get_dir_size(tmp_path / "missing") == 0
+
+
+class TestPrometheusMetrics:
+    """Tests for the /metrics endpoint."""
+
+    def test_plain_text_exposition(self, client):
+        """Metrics should be served as Prometheus text, not a JSON string."""
+        response = client.get("/metrics")
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'rev2_reviews_total{status="success"}' in response.text
+        assert not response.text.startswith('"')
+
+
+class TestDetailedHealthCheck:
+    """Tests for the /health/detailed endpoint."""
+
+    def test_database_check_healthy(self, client):
+        """SELECT 1 should succeed on SQLAlchemy 2.x."""
+        response = client.get("/health/detailed")
+        assert response.json()["checks"]["database"]["status"] == "healthy"
+
+
+class TestMetricsSummary:
+    """Tests for the /metrics/summary endpoint."""
+
+    def test_counts_by_status(self, client, test_db):
+        """Reviews should be counted per status with average latency."""
+        from backend.db_models import ReviewRecord, ReviewStatus
+
+        for status, latency in (
+            (ReviewStatus.SUCCESS, 100),
+            (ReviewStatus.SUCCESS, 300),
+            (ReviewStatus.FAILURE, None),
+        ):
+            test_db.add(ReviewRecord(
+                installation_id="1",
+                repo_name="test-owner/test-repo",
+                pr_number=1,
+                pr_url="https://github.com/test-owner/test-repo/pull/1",
+                commit_sha="abc123",
+                review_status=status,
+                api_latency_ms=latency,
+            ))
+        test_db.commit()
+
+        body = client.get("/metrics/summary").json()
+        assert body["reviews"]["total"] == 3
+        assert body["reviews"]["success"] == 2
+        assert body["reviews"]["failure"] == 1
+        assert body["performance"]["avg_review_duration_ms"] == 200
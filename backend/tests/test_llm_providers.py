@@ -0,0 +1,239 @@
+"""
+Tests for LLM provider manager.
+"""
+
+import threading
+import pytest
+
+from backend.llm_cache import LLMResponseCache
+from backend.llm_providers import LLMProviderManager
+
+
+class _FakeProvider:
+    """Provider stub whose health check can wait on a shared barrier."""
+
+    def __init__(self, result, barrier=None):
+        self.result = result
+        self.barrier = barrier
+
+    async def generate_review_async(self, prompt, max_retries=3):
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+    def health_check(self):
+        if self.barrier is not None:
+            # Only passes if the other check is running at the same time
+            self.barrier.wait()
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+@pytest.fixture
+def manager():
+    """Manager with no real providers configured."""
+    manager = LLMProviderManager(primary_provider="none", fallback_provider=None)
+    manager.providers = {}
+    manager.response_cache = LLMResponseCache()
+    return manager
+
+
+class TestHealthCheck:
+    """Tests for provider health checks."""
+
+    async def test_checks_run_concurrently(self, manager):
+        """Both checks should be in flight at once, not run one after another."""
+        barrier = threading.Barrier(2, timeout=5)
+        manager.providers = {
+            "a": _FakeProvider(True, barrier=barrier),
+            "b": _FakeProvider(True, barrier=barrier),
+        }
+        status = await manager.health_check()
+        assert not barrier.broken
+        assert status == {"a": True, "b": True}
+
+    async def test_failures_reported_false(self, manager):
+        """Exceptions and falsy results should map to False."""
+        manager.providers = {
+            "ok": _FakeProvider("OK"),
+            "empty": _FakeProvider(None),
+            "error": _FakeProvider(RuntimeError("down")),
+        }
+        status = await manager.health_check()
+        assert status == {"ok": True, "empty": False, "error": False}
+
+
+class TestGenerateReview:
+    """Tests for review generation with fallback."""
+
+    async def test_primary_used(self, manager):
+        """Primary provider result should be returned when it succeeds."""
+        manager.primary_provider_name = "a"
+        manager.fallback_provider_name = "b"
+        manager.providers = {"a": _FakeProvider("LGTM"), "b": _FakeProvider("other")}
+        assert await manager.generate_review("diff") == ("LGTM", "a")
+
+    async def test_fallback_on_failure(self, manager):
+        """Fallback provider should be used when the primary raises."""
+        manager.primary_provider_name = "a"
+        manager.fallback_provider_name = "b"
+        manager.providers = {
+            "a": _FakeProvider(RuntimeError("down")),
+            "b": _FakeProvider("LGTM"),
+        }
+        assert await manager.generate_review("diff") == ("LGTM", "b")
+
+    async def test_empty_response_not_cached(self, manager):
+        """An empty reply should fall back and never be cached or returned."""
+        primary = _FakeProvider("")
+        manager.primary_provider_name = "a"
+        manager.fallback_provider_name = "b"
+        manager.providers = {"a": primary, "b": _FakeProvider(RuntimeError("down"))}
+        with pytest.raises(RuntimeError):
+            await manager.generate_review("diff")
+        cache_key = manager.response_cache.make_key("diff")
+        assert await manager.response_cache.get(cache_key) is None
+
+        # Once the primary answers, its real review is returned
+        primary.result = "LGTM"
+        assert await manager.generate_review("diff") == ("LGTM", "a")
+
+    async def test_repeated_prompt_cached(self, manager):
+        """A repeated prompt should not call the provider again."""
+        provider = _FakeProvider("LGTM")
+        manager.primary_provider_name = "a"
+        manager.providers = {"a": provider}
+        assert await manager.generate_review("diff") == ("LGTM", "a")
+        provider.result = RuntimeError("should not be called")
+        assert await manager.generate_review("diff") == ("LGTM", "a")
+
+
+class TestRateLimitHandling:
+    """Tests for typed rate limit detection."""
+
+    def _provider(self, error):
+        """Claude provider whose client always raises the given error."""
+        from types import SimpleNamespace
+        from backend.llm_providers import ClaudeProvider
+
+        async def create(**kwargs):
+            raise error
+
+        provider = ClaudeProvider(api_key=None)
+        provider.async_client = SimpleNamespace(
+            messages=SimpleNamespace(create=create)
+        )
+        return provider
+
+    async def test_rate_limit_backs_off(self, monkeypatch):
+        """SDK rate limit errors should use exponential backoff."""
+        from backend import llm_providers
+
+        class FakeRateLimit(Exception):
+            pass
+
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+
+        monkeypatch.setattr(llm_providers, "AnthropicRateLimit", FakeRateLimit)
+        monkeypatch.setattr(llm_providers.asyncio, "sleep", fake_sleep)
+        with pytest.raises(FakeRateLimit):
+            await self._provider(FakeRateLimit()).generate_review_async("diff")
+        assert sleeps == [10, 20]
+
+    async def test_message_text_not_sniffed(self, monkeypatch):
+        """Other errors mentioning rate_limit should not be backed off."""
+        from backend import llm_providers
+
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+
+        monkeypatch.setattr(llm_providers.asyncio, "sleep", fake_sleep)
+        with pytest.raises(ValueError):
+            await self._provider(
+                ValueError("bad rate_limit config")
+            ).generate_review_async("diff")
+        assert sleeps == [5, 5]
+
+    def test_sync_rate_limit_backs_off(self, monkeypatch):
+        """The sync client shares the same backoff schedule."""
+        from types import SimpleNamespace
+        from backend import llm_providers
+        from backend.llm_providers import ClaudeProvider
+
+        class FakeRateLimit(Exception):
+            pass
+
+        def create(**kwargs):
+            raise FakeRateLimit()
+
+        sleeps = []
+        monkeypatch.setattr(llm_providers, "AnthropicRateLimit", FakeRateLimit)
+        monkeypatch.setattr(llm_providers.time, "sleep", sleeps.append)
+        provider = ClaudeProvider(api_key=None)
+        provider.client = SimpleNamespace(messages=SimpleNamespace(create=create))
+        with pytest.raises(FakeRateLimit):
+            provider.generate_review("diff")
+        assert sleeps == [10, 20]
+
+    async def test_empty_message_raises(self, monkeypatch):
+        """A reply without content should raise instead of returning placeholder text."""
+        from types import SimpleNamespace
+        from backend import llm_providers
+        from backend.llm_providers import ClaudeProvider, EmptyResponseError
+
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+
+        async def create(**kwargs):
+            return SimpleNamespace(content=[])
+
+        monkeypatch.setattr(llm_providers.asyncio, "sleep", fake_sleep)
+        provider = ClaudeProvider(api_key=None)
+        provider.async_client = SimpleNamespace(messages=SimpleNamespace(create=create))
+        with pytest.raises(EmptyResponseError):
+            await provider.generate_review_async("diff")
+        assert sleeps == []
+
+
+class TestLLMResponseCache:
+    """Tests for the in-process response cache."""
+
+    async def test_entry_expires(self):
+        """Entries past their TTL should be misses."""
+        cache = LLMResponseCache()
+        await cache.set("k", {"review": "r", "provider": "p"}, ttl=-1)
+        assert await cache.get("k") is None
+
+    async def test_lru_eviction(self):
+        """Least recently used entries are evicted past max_size."""
+        cache = LLMResponseCache(max_size=2)
+        await cache.set("a", {"review": "1", "provider": "p"})
+        await cache.set("b", {"review": "2", "provider": "p"})
+        await cache.get("a")
+        await cache.set("c", {"review": "3", "provider": "p"})
+        assert await cache.get("b") is None
+        assert await cache.get("a") is not None
+
+    def test_key_depends_on_prompt(self):
+        """Different prompts should hash to different keys."""
+        assert LLMResponseCache.make_key("a") != LLMResponseCache.make_key("b")
+
+
+class TestSharedClients:
+    """Tests for client reuse across provider instances."""
+
+    def test_gemini_model_shared(self):
+        """Providers with the same key and model share one model object."""
+        from backend.llm_providers import GeminiProvider
+
+        first = GeminiProvider(api_key="test-key", model_name="gemini-test")
+        second = GeminiProvider(api_key="test-key", model_name="gemini-test")
+        assert first.model is second.model
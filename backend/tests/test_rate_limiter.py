@@ -4,7 +4,13 @@ Tests for rate limiting module.
 
 import pytest
 import time
-from backend.rate_limiter import RateLimiter, get_rate_limiter
+from backend import rate_limiter
+from backend.rate_limiter import (
+    WINDOW_BUCKETS,
+    RateLimiter,
+    RedisRateLimiter,
+    get_rate_limiter,
+)
 
 
 class TestRateLimiter:
@@ -86,28 +92,42 @@ class TestRateLimiter:
         assert is_allowed is True
         assert count == 1
 
-    def test_cleanup_old_records(self):
-        """Should cleanup records outside the window."""
-        limiter = RateLimiter(
-            max_reviews_per_hour=10,
-            cleanup_interval=0,  # Always cleanup
-        )
-        current_time = time.time()
+    def test_old_records_evicted(self):
+        """Records outside the window should be evicted and not counted."""
+        limiter = RateLimiter(max_reviews_per_hour=10)
+        limiter.check_limit("install-1")
+
+        # Backdate the window's last write to two hours ago
+        limiter.records["install-1"].tick -= 2 * WINDOW_BUCKETS
+
+        is_allowed, count = limiter.check_limit("install-1")
+        assert is_allowed is True
+        assert count == 1  # Only the new record
+        assert sum(limiter.records["install-1"].buckets) == 1
 
-        # Manually add an old record (more than 1 hour ago)
-        if "install-1" not in limiter.records:
-            limiter.records["install-1"] = []
-        limiter.records["install-1"].append((current_time - 7200, 1))  # 2 hours ago
+    def test_empty_window_dropped(self):
+        """Installations with no recent records should not be retained."""
+        limiter = RateLimiter(max_reviews_per_hour=10)
+        limiter.check_limit("install-1")
+        limiter.records["install-1"].tick -= 2 * WINDOW_BUCKETS
 
-        # Add recent record
-        limiter.records["install-1"].append((current_time, 1))
+        assert limiter.get_status("install-1")["current_count"] == 0
+        assert "install-1" not in limiter.records
 
-        # Trigger cleanup
-        limiter._cleanup()
+    def test_buckets_expire_individually(self, monkeypatch):
+        """Only buckets that left the window should stop counting."""
+        now = [0.0]
+        monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: now[0])
+        limiter = RateLimiter(max_reviews_per_hour=10, window_seconds=60)
 
-        # Old record should be gone
-        count = limiter._get_count_in_window("install-1")
-        assert count == 1  # Only recent record
+        limiter.check_limit("install-1")
+        now[0] = 30.0
+        limiter.check_limit("install-1", increment=2)
+        assert limiter.get_status("install-1")["current_count"] == 3
+
+        now[0] = 61.0
+        assert limiter.get_status("install-1")["current_count"] == 2
+        assert len(limiter.records["install-1"].buckets) == WINDOW_BUCKETS
 
     def test_increment_parameter(self):
         """Should handle increment parameter."""
@@ -122,6 +142,131 @@ class TestRateLimiter:
         is_allowed, count = limiter.check_limit("install-1", increment=15)
         assert is_allowed is False
 
+    def test_custom_window(self):
+        """Records should expire after the configured window."""
+        limiter = RateLimiter(max_reviews_per_hour=1, window_seconds=0.05)
+        assert limiter.check_limit("install-1")[0] is True
+        assert limiter.check_limit("install-1")[0] is False
+        time.sleep(0.06)
+        assert limiter.check_limit("install-1")[0] is True
+        assert limiter.get_status("install-1")["window_seconds"] == 0.05
+
+    def test_concurrent_checks_respect_limit(self):
+        """Concurrent checks should never admit more than the limit."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        limiter = RateLimiter(max_reviews_per_hour=50)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(
+                pool.map(lambda _: limiter.check_limit("install-1")[0], range(200))
+            )
+        assert sum(results) == 50
+        assert limiter.get_status("install-1")["current_count"] == 50
+
+
+class _FakeRedis:
+    """Minimal in-memory stand-in for the Redis commands the limiter uses."""
+
+    def __init__(self):
+        self.data = {}  # {key: {member: score}}
+        self.ttls = {}
+
+    def register_script(self, script):
+        # No Lua here: mirror the sliding-window script step by step
+        def run(keys, args):
+            key = keys[0]
+            now, window, limit, increment, tag, ttl = args
+            self.zremrangebyscore(key, "-inf", now - window)
+            count = self.zcard(key)
+            if count + increment > limit:
+                return [0, count]
+            self.data.setdefault(key, {}).update(
+                {f"{tag}:{i}": now for i in range(1, increment + 1)}
+            )
+            self.ttls[key] = ttl
+            return [1, count + increment]
+
+        return run
+
+    def zremrangebyscore(self, key, low, high):
+        zset = self.data.get(key, {})
+        expired = [m for m, score in zset.items() if float(low) <= score <= float(high)]
+        for member in expired:
+            del zset[member]
+        return len(expired)
+
+    def zcard(self, key):
+        return len(self.data.get(key, {}))
+
+    def zcount(self, key, low, high):
+        return sum(
+            float(low) <= score <= float(high)
+            for score in self.data.get(key, {}).values()
+        )
+
+    def delete(self, key):
+        self.data.pop(key, None)
+        self.ttls.pop(key, None)
+
+
+class TestRedisRateLimiter:
+    """Tests for the Redis-backed rate limiter."""
+
+    def test_counts_shared_through_redis(self):
+        """Limiters on the same Redis should share one count."""
+        redis = _FakeRedis()
+        worker1 = RedisRateLimiter(redis, max_reviews_per_hour=3)
+        worker2 = RedisRateLimiter(redis, max_reviews_per_hour=3)
+        assert worker1.check_limit("install-1") == (True, 1)
+        assert worker2.check_limit("install-1") == (True, 2)
+        assert worker1.check_limit("install-1") == (True, 3)
+        assert worker2.check_limit("install-1") == (False, 3)
+        assert worker1.get_status("install-1")["remaining"] == 0
+
+    def test_denial_leaves_set_untouched(self):
+        """A denied check should not add members or consume quota."""
+        redis = _FakeRedis()
+        limiter = RedisRateLimiter(redis, max_reviews_per_hour=2)
+        assert limiter.check_limit("install-1", increment=2) == (True, 2)
+        assert limiter.check_limit("install-1") == (False, 2)
+        assert redis.zcard(limiter._key("install-1")) == 2
+
+    def test_window_expiry_set(self):
+        """The counter key should expire with the window."""
+        redis = _FakeRedis()
+        RedisRateLimiter(redis).check_limit("install-1")
+        assert list(redis.ttls.values()) == [3600]
+
+    def test_sliding_window(self, monkeypatch):
+        """Reviews should leave the shared window one by one as they age."""
+        now = [1000.0]
+        monkeypatch.setattr(rate_limiter.time, "time", lambda: now[0])
+        limiter = RedisRateLimiter(_FakeRedis(), max_reviews_per_hour=2)
+
+        assert limiter.check_limit("install-1") == (True, 1)
+        now[0] += 1800
+        assert limiter.check_limit("install-1") == (True, 2)
+        assert limiter.check_limit("install-1") == (False, 2)
+
+        # Only the first review has aged out
+        now[0] += 1801
+        assert limiter.get_status("install-1")["current_count"] == 1
+        assert limiter.check_limit("install-1") == (True, 2)
+
+    def test_falls_back_when_redis_fails(self):
+        """Redis errors should fall back to the in-process window."""
+
+        class BrokenRedis(_FakeRedis):
+            def register_script(self, script):
+                def run(keys, args):
+                    raise ConnectionError("down")
+
+                return run
+
+        limiter = RedisRateLimiter(BrokenRedis(), max_reviews_per_hour=1)
+        assert limiter.check_limit("install-1") == (True, 1)
+        assert limiter.check_limit("install-1") == (False, 1)
+
 
 class TestGlobalRateLimiter:
     """Tests for global rate limiter singleton."""
@@ -0,0 +1,72 @@
+"""
+Tests for per-repository review configuration.
+"""
+
+import pytest
+from backend.review_config import ReviewConfig
+
+
+class TestShouldReviewFile:
+    """Tests for file filtering."""
+
+    def test_no_filters(self):
+        """Every file is reviewed by default."""
+        assert ReviewConfig().should_review_file("src/app.py", "python") is True
+
+    def test_ignore_patterns(self):
+        """Files matching any ignore glob should be skipped."""
+        config = ReviewConfig(file_patterns_ignore=["*.lock", "docs/*", "test_?.py"])
+        assert config.should_review_file("poetry.lock") is False
+        assert config.should_review_file("docs/index.md") is False
+        assert config.should_review_file("test_1.py") is False
+        assert config.should_review_file("test_10.py") is True
+        assert config.should_review_file("src/app.py") is True
+
+    def test_language_whitelist_case_insensitive(self):
+        """Languages should be compared case-insensitively."""
+        config = ReviewConfig(languages=["Python"])
+        assert config.should_review_file("app.py", "python") is True
+        assert config.should_review_file("app.js", "JavaScript") is False
+
+
+class TestFilterCommentsBySeverity:
+    """Tests for severity filtering."""
+
+    COMMENTS = [
+        {"severity": "critical"},
+        {"severity": "warning"},
+        {"severity": "info"},
+        {},
+    ]
+
+    def test_info_keeps_all(self):
+        """The default threshold should keep every comment."""
+        assert ReviewConfig().filter_comments_by_severity(self.COMMENTS) == self.COMMENTS
+
+    def test_warning_threshold(self):
+        """Comments below the threshold should be dropped."""
+        config = ReviewConfig(min_severity="warning")
+        assert config.filter_comments_by_severity(self.COMMENTS) == [
+            {"severity": "critical"},
+            {"severity": "warning"},
+        ]
+
+
+class TestFromFile:
+    """Tests for loading configuration files."""
+
+    def test_cached_until_modified(self, tmp_path):
+        """An unchanged file should return the cached config."""
+        config_file = tmp_path / "config.json"
+        config_file.write_text('{"min_severity": "warning"}')
+        first = ReviewConfig.from_file(config_file)
+        assert first.min_severity == "warning"
+        assert ReviewConfig.from_file(config_file) is first
+
+        config_file.write_text('{"min_severity": "info"}')
+        assert ReviewConfig.from_file(config_file).min_severity == "info"
+
+    def test_missing_file(self, tmp_path):
+        """A missing file should fall back to defaults."""
+        config = ReviewConfig.from_file(tmp_path / "missing.json")
+        assert config.min_severity == "info"
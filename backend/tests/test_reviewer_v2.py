@@ -0,0 +1,86 @@
+"""
+Tests for the enhanced review generator.
+"""
+
+import pytest
+
+pytest.importorskip("sentence_transformers")
+
+from backend import reviewer_v2
+from backend.reviewer_v2 import ReviewGenerator
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    """Generator whose API call returns a canned review."""
+    generator = ReviewGenerator()
+    monkeypatch.setattr(
+        generator, "_call_api_with_retry", lambda prompt: "1. Looks fine"
+    )
+    return generator
+
+
+class TestContextSearch:
+    """Tests for cached semantic search context."""
+
+    def test_no_index_skips_cache(self, generator):
+        """A missing index gives no context and leaves the cache untouched."""
+        assert generator._get_context("patch", None, [], "owner/repo") == []
+        assert len(reviewer_v2._search_cache) == 0
+
+    def test_review_without_index(self, generator):
+        """A patch is still reviewed, without context, when there is no index."""
+        review = generator.review_patch("+x = 1", "a.py", None, [], "owner/repo")
+        assert review.status == "success"
+        assert review.context_used == []
+
+
+class TestSyncWrappers:
+    """Tests for the synchronous batch entry points."""
+
+    async def test_batch_from_running_loop(self, generator, monkeypatch):
+        """review_batch should work when called from inside an event loop."""
+        async def fake_batch(patches, index, metadata):
+            return ["reviewed"]
+
+        monkeypatch.setattr(generator, "review_batch_async", fake_batch)
+        assert generator.review_batch([("+x = 1", "a.py")], None, []) == ["reviewed"]
+
+    def test_batch_without_loop(self, generator, monkeypatch):
+        """review_batch should also work from plain synchronous code."""
+        async def fake_batch(patches, index, metadata):
+            return ["reviewed"]
+
+        monkeypatch.setattr(generator, "review_batch_async", fake_batch)
+        assert generator.review_batch([("+x = 1", "a.py")], None, []) == ["reviewed"]
+
+
+class TestGroupedReview:
+    """Tests for reviewing several patches in one API call."""
+
+    async def test_missing_files_reviewed_concurrently(self, generator, monkeypatch):
+        """Files absent from the grouped response are re-reviewed in parallel."""
+        import asyncio
+
+        async def fake_call(prompt):
+            return "===FILE: a.py===\n1. Looks fine"
+
+        in_flight = []
+        peak = []
+
+        async def fake_review(patch, filename, index, metadata, repo_name=""):
+            in_flight.append(filename)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(filename)
+            return filename
+
+        monkeypatch.setattr(generator, "_call_api_with_retry_async", fake_call)
+        monkeypatch.setattr(generator, "review_patch_async", fake_review)
+        patches = [("+a", "a.py"), ("+b", "b.py"), ("+c", "c.py")]
+        reviews = await generator.review_group_async(patches, None, [])
+
+        assert reviews[0].file == "a.py"
+        assert reviews[0].status == "success"
+        assert reviews[1:] == ["b.py", "c.py"]
+        assert max(peak) == 2
@@ -0,0 +1,24 @@
+"""
+Tests for the shared TTL cache.
+"""
+
+from backend.ttl_cache import TTLCache
+
+
+class TestTTLCache:
+    """Tests for the in-process fallback of TTLCache."""
+
+    async def test_default_ttl_per_instance(self):
+        """Entries use the TTL the cache was created with."""
+        cache = TTLCache("test", "rev2:test:", ttl=-1)
+        await cache.set("k", {"v": 1})
+        assert await cache.get("k") is None
+
+    async def test_invalidate(self):
+        """Invalidated keys should be misses; others stay cached."""
+        cache = TTLCache("test", "rev2:test:", ttl=60)
+        await cache.set("a", {"v": 1})
+        await cache.set("b", {"v": 2})
+        await cache.invalidate("a")
+        assert await cache.get("a") is None
+        assert await cache.get("b") == {"v": 2}
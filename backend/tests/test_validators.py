@@ -8,6 +8,7 @@ from backend.validators import (
     validate_patch,
     validate_repo_name,
     sanitize_patch_for_llm,
+    validate_and_sanitize_patch,
     validate_file_path,
     ValidationError,
 )
@@ -56,6 +57,18 @@ class TestValidateWebhookPayload:
         with pytest.raises(ValidationError):
             validate_webhook_payload(sample_webhook_payload)
 
+    def test_error_names_missing_field(self, sample_webhook_payload):
+        """The error should say which field is missing."""
+        del sample_webhook_payload["pull_request"]["head"]["sha"]
+        with pytest.raises(ValidationError, match="Missing PR head SHA"):
+            validate_webhook_payload(sample_webhook_payload)
+
+    def test_malformed_section(self, sample_webhook_payload):
+        """A section of the wrong type should be a validation error."""
+        sample_webhook_payload["pull_request"] = None
+        with pytest.raises(ValidationError):
+            validate_webhook_payload(sample_webhook_payload)
+
 
 class TestValidatePatch:
     """Tests for patch validation."""
@@ -109,6 +122,16 @@ class TestValidateRepoName:
         with pytest.raises(ValidationError):
             validate_repo_name("../../../etc/passwd")
 
+    def test_traversal_in_valid_format(self):
+        """'..' should be rejected even when the owner/repo shape matches."""
+        with pytest.raises(ValidationError, match="Suspicious"):
+            validate_repo_name("owner/..")
+
+    def test_trailing_newline_rejected(self):
+        """A trailing newline should not slip past the format check."""
+        with pytest.raises(ValidationError):
+            validate_repo_name("owner/repo\n")
+
     def test_double_slash(self):
         """Double slashes should raise error."""
         with pytest.raises(ValidationError):
@@ -132,6 +155,14 @@ class TestSanitizePatch:
         assert "sk_live_abc123" not in sanitized
         assert "REDACTED" in sanitized
 
+    def test_sanitize_labels_each_pattern(self):
+        """Each kind of secret should get its own placeholder."""
+        patch = 'API_KEY = "sk_live"\npassword = "pw"\nAuth: Bearer abc\nAuth: Basic dXNlcg=='
+        assert sanitize_patch_for_llm(patch) == (
+            "***REDACTED_KEY***\n***REDACTED***\n"
+            "Auth: ***REDACTED_BEARER_TOKEN***\nAuth: ***REDACTED_BASIC_AUTH***"
+        )
+
     def test_sanitize_bearer_token(self):
         """Should redact bearer tokens."""
         patch_with_token = "Authorization: Bearer eyJhbGc..."
@@ -145,6 +176,11 @@ class TestSanitizePatch:
         sanitized = sanitize_patch_for_llm(large, max_size=1000)
         assert len(sanitized) <= 1010  # 1000 + "... (truncated)"
 
+    def test_sanitize_mixed_case_keyword(self):
+        """The keyword prefilter should not miss differently cased secrets."""
+        sanitized = sanitize_patch_for_llm('+DB_PassWord = "hunter2"')
+        assert "hunter2" not in sanitized
+
     def test_sanitize_valid_code(self):
         """Valid code should remain mostly unchanged."""
         code = 'def hello():\n    print("Hello")'
@@ -152,6 +188,20 @@ class TestSanitizePatch:
         assert 'print("Hello")' in sanitized
 
 
+class TestValidateAndSanitizePatch:
+    """Tests for combined patch validation and sanitization."""
+
+    def test_returns_sanitized_patch(self):
+        """Valid patches come back sanitized."""
+        sanitized = validate_and_sanitize_patch('+password = "secret123"')
+        assert "secret123" not in sanitized
+
+    def test_empty_patch_rejected(self):
+        """Invalid patches raise before sanitization."""
+        with pytest.raises(ValidationError):
+            validate_and_sanitize_patch("")
+
+
 class TestValidateFilePath:
     """Tests for file path validation."""
 
@@ -177,3 +227,8 @@ class TestValidateFilePath:
         """Absolute path should raise error."""
         with pytest.raises(ValidationError):
             validate_file_path("/etc/passwd")
+
+    def test_nul_byte_rejected(self):
+        """Paths with NUL bytes should raise error."""
+        with pytest.raises(ValidationError):
+            validate_file_path("src/main.py\x00.txt")
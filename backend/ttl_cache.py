@@ -0,0 +1,123 @@
+"""
+TTL cache for REV2 response payloads.
+Backed by Redis when configured, so entries are shared across workers,
+otherwise an in-process LRU.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import orjson
+
+from backend.logger import get_logger
+from backend.redis_client import get_async_redis_client
+
+logger = get_logger(__name__)
+
+LOCAL_CACHE_SIZE = 256
+
+
+class TTLCache:
+    """TTL cache of JSON-serializable dicts under a Redis key prefix."""
+
+    def __init__(
+        self,
+        name: str,
+        redis_prefix: str,
+        ttl: int,
+        max_size: int = LOCAL_CACHE_SIZE,
+    ):
+        """
+        Args:
+            name: Cache name used in log messages
+            redis_prefix: Prefix for this cache's Redis keys
+            ttl: Default seconds until an entry expires
+            max_size: Entries kept by the in-process fallback
+        """
+        self.name = name
+        self.redis_prefix = redis_prefix
+        self.ttl = ttl
+        self.max_size = max_size
+        self._local = OrderedDict()  # {key: (value, expires_at)}, LRU order
+
+    async def get(self, key: str) -> Optional[dict]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None on miss
+        """
+        redis_client = get_async_redis_client()
+        if redis_client is not None:
+            try:
+                value = await redis_client.get(self.redis_prefix + key)
+                return orjson.loads(value) if value else None
+            except Exception as e:
+                logger.warning("Cache read failed", cache=self.name, error=str(e))
+                return None
+
+        cached = self._local.get(key)
+        if cached is None:
+            return None
+        if cached[1] < time.monotonic():
+            self._local.pop(key, None)
+            return None
+        self._local.move_to_end(key)
+        return cached[0]
+
+    async def set(self, key: str, value: dict, ttl: Optional[int] = None):
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: Dict to cache
+            ttl: Seconds until the entry expires (defaults to the cache's TTL)
+        """
+        if ttl is None:
+            ttl = self.ttl
+
+        redis_client = get_async_redis_client()
+        if redis_client is not None:
+            try:
+                await redis_client.set(
+                    self.redis_prefix + key,
+                    orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS),
+                    ex=ttl,
+                )
+            except Exception as e:
+                logger.warning("Cache write failed", cache=self.name, error=str(e))
+            return
+
+        self._local[key] = (value, time.monotonic() + ttl)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_size:
+            self._local.popitem(last=False)
+
+    async def invalidate(self, *keys: str):
+        """
+        Drop cached values after the data behind them changes.
+
+        Args:
+            keys: Cache keys
+        """
+        redis_client = get_async_redis_client()
+        if redis_client is not None:
+            try:
+                await redis_client.delete(*(self.redis_prefix + key for key in keys))
+            except Exception as e:
+                logger.warning(
+                    "Cache invalidation failed", cache=self.name, error=str(e)
+                )
+            return
+
+        for key in keys:
+            self._local.pop(key, None)
+
+    def clear(self):
+        """Clear the in-process cache."""
+        self._local.clear()
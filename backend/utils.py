@@ -1,16 +1,21 @@
 import re
+from functools import lru_cache
 from typing import List
 
-
-def detect_language_from_filename(filename: str) -> str:
-    ext_map = {
+_EXT_MAP = {
     ".py": "Python", ".js": "JavaScript", ".ts": "TypeScript",
     ".java": "Java", ".cpp": "C++", ".c": "C", ".cs": "C#",
     ".go": "Go", ".rb": "Ruby", ".php": "PHP", ".rs": "Rust",
     ".swift": "Swift", ".kt": "Kotlin", ".scala": "Scala",
     ".html": "HTML", ".css": "CSS", ".sql": "SQL", ".ipynb": "Jupyter Notebook"
-    }
-    for ext, lang in ext_map.items():
+}
+# generic regex for def/class and common function patterns
+_SYMBOL_RE = re.compile(r'def\s+(\w+)|class\s+(\w+)|function\s+(\w+)')
+
+
+@lru_cache(maxsize=4096)
+def detect_language_from_filename(filename: str) -> str:
+    for ext, lang in _EXT_MAP.items():
         if filename.endswith(ext):
             return lang
     return "Unknown"
@@ -47,7 +52,6 @@ def trim_diff(patch: str, context_window: int = 3) -> str:
 
 
 def extract_symbols_from_patch(patch: str) -> List[str]:
-    # generic regex for def/class and common function patterns
-    syms = re.findall(r'def\s+(\w+)|class\s+(\w+)|function\s+(\w+)', patch)
+    syms = _SYMBOL_RE.findall(patch)
     flat = [s for t in syms for s in t if s]
     return list(dict.fromkeys(flat))
\ No newline at end of file
@@ -4,16 +4,75 @@ Validates GitHub webhook payloads, patches, and repository names.
 """
 
 import re
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Dict, Optional
 from backend.config import MAX_DIFF_SIZE
 
 
+# Repository names and file paths recur across a PR's files and webhooks; the
+# verdict for each distinct string is cached (invalid ones included)
+VALIDATION_CACHE_SIZE = 4096
+
+# Patterns that might contain sensitive data, combined into one alternation so
+# a patch is scanned once; the matching group picks the replacement
+_SENSITIVE_RE = re.compile(
+    r"""(?P<apikey>(?i:api[_-]?key)\s*[:=]\s*["']?[^"';\n]+["']?)"""
+    r"""|(?P<secret>(?i:password|secret|token|key|credential)\s*=\s*["']?[^"';\n]+["']?)"""
+    r"|(?P<bearer>Bearer\s+\S+)"
+    r"|(?P<basic>Basic\s+\S+)"
+)
+_SENSITIVE_REPLACEMENTS = {
+    "apikey": "***REDACTED_KEY***",
+    "secret": "***REDACTED***",
+    "bearer": "***REDACTED_BEARER_TOKEN***",
+    "basic": "***REDACTED_BASIC_AUTH***",
+}
+# Every sensitive pattern contains one of these keywords (matched
+# case-insensitively) or one of the case-sensitive auth schemes
+_SENSITIVE_KEYWORDS = ("password", "secret", "token", "key", "credential")
+_AUTH_SCHEMES = ("Bearer", "Basic")
+_TRUNCATION_MARKER = "\n... (truncated)"
+# owner/repo with no ".." anywhere; the character classes already rule out
+# leading, trailing and repeated slashes
+_REPO_NAME_RE = re.compile(r"^(?!.*\.\.)[\w\-\.]+/[\w\-\.]+\Z")
+# Relative, no ".." and no NUL bytes
+_FILE_PATH_RE = re.compile(r"^(?!/)(?!.*\.\.)[^\x00]+\Z", re.DOTALL)
+
+
+def _redact(match: re.Match) -> str:
+    return _SENSITIVE_REPLACEMENTS[match.lastgroup]
+
+
 class ValidationError(Exception):
     """Raised when validation fails."""
 
     pass
 
 
+# Required webhook fields, only walked to name the missing one
+_REQUIRED_PAYLOAD_FIELDS = ("action", "pull_request", "repository", "installation")
+_REQUIRED_PR_FIELDS = ("number", "head", "html_url")
+
+
+def _missing_payload_field(payload: Dict[str, Any]) -> Optional[str]:
+    """Describe the first required webhook field that is absent."""
+    for field in _REQUIRED_PAYLOAD_FIELDS:
+        if field not in payload:
+            return f"Missing required field: {field}"
+
+    pr = payload["pull_request"]
+    for field in _REQUIRED_PR_FIELDS:
+        if field not in pr:
+            return f"Missing PR field: {field}"
+    if "sha" not in pr["head"]:
+        return "Missing PR head SHA"
+    if "full_name" not in payload["repository"]:
+        return "Missing repository full_name"
+    if "id" not in payload["installation"]:
+        return "Missing installation ID"
+    return None
+
+
 def validate_webhook_payload(payload: Dict[str, Any]) -> bool:
     """
     Validate GitHub webhook payload structure.
@@ -24,33 +83,22 @@ def validate_webhook_payload(payload: Dict[str, Any]) -> bool:
     Returns:
         True if valid, raises ValidationError otherwise
     """
-    required_fields = ["action", "pull_request", "repository", "installation"]
-
-    for field in required_fields:
-        if field not in payload:
-            raise ValidationError(f"Missing required field: {field}")
-
-    # Validate pull_request structure
-    pr = payload.get("pull_request", {})
-    pr_required = ["number", "head", "html_url"]
-    for field in pr_required:
-        if field not in pr:
-            raise ValidationError(f"Missing PR field: {field}")
-
-    # Validate head structure
-    head = pr.get("head", {})
-    if "sha" not in head:
-        raise ValidationError("Missing PR head SHA")
-
-    # Validate repository structure
-    repo = payload.get("repository", {})
-    if "full_name" not in repo:
-        raise ValidationError("Missing repository full_name")
-
-    # Validate installation
-    installation = payload.get("installation", {})
-    if "id" not in installation:
-        raise ValidationError("Missing installation ID")
+    # Valid payloads are the norm: index the required fields directly and
+    # only walk the payload for a precise message once something is missing
+    try:
+        payload["action"]
+        pr = payload["pull_request"]
+        pr["number"]
+        pr["html_url"]
+        pr["head"]["sha"]
+        payload["repository"]["full_name"]
+        payload["installation"]["id"]
+    except (KeyError, TypeError):
+        try:
+            message = _missing_payload_field(payload)
+        except TypeError:
+            message = None
+        raise ValidationError(message or "Malformed webhook payload") from None
 
     return True
 
@@ -69,19 +117,32 @@ def validate_patch(patch_text: str, max_size: int = MAX_DIFF_SIZE) -> bool:
     if not patch_text:
         raise ValidationError("Patch cannot be empty")
 
-    if len(patch_text) > max_size:
+    # Patches without standard diff headers are accepted, so size is the
+    # only structural check
+    size = len(patch_text)
+    if size > max_size:
         raise ValidationError(
-            f"Patch exceeds maximum size ({len(patch_text)} > {max_size} chars)"
+            f"Patch exceeds maximum size ({size} > {max_size} chars)"
         )
 
-    # Check if patch starts with diff markers (basic validation)
-    if not patch_text.startswith(("---", "+++", "diff", "@")):
-        # Some patches might not have standard headers, so just warn
-        pass
-
     return True
 
 
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _repo_name_error(name: str) -> Optional[str]:
+    """Why a repository name is invalid, or None; cached per name."""
+    if not name:
+        return "Repository name cannot be empty"
+
+    # One regex pass covers the format and the traversal checks
+    if _REPO_NAME_RE.match(name):
+        return None
+
+    if ".." in name:
+        return f"Suspicious repository name: {name}"
+    return f"Invalid repository name format: {name}. Expected 'owner/repo'"
+
+
 def validate_repo_name(name: str) -> bool:
     """
     Validate repository name to prevent path traversal attacks.
@@ -92,19 +153,9 @@ def validate_repo_name(name: str) -> bool:
     Returns:
         True if valid, raises ValidationError otherwise
     """
-    if not name:
-        raise ValidationError("Repository name cannot be empty")
-
-    # Repository names should be owner/repo format
-    if not re.match(r"^[\w\-\.]+/[\w\-\.]+$", name):
-        raise ValidationError(
-            f"Invalid repository name format: {name}. Expected 'owner/repo'"
-        )
-
-    # Check for path traversal attempts
-    if ".." in name or name.startswith("/") or name.endswith("/"):
-        raise ValidationError(f"Suspicious repository name: {name}")
-
+    error = _repo_name_error(name)
+    if error:
+        raise ValidationError(error)
     return True
 
 
@@ -122,23 +173,50 @@ def sanitize_patch_for_llm(patch: str, max_size: int = MAX_DIFF_SIZE) -> str:
     Returns:
         Sanitized patch content
     """
-    # Patterns that might contain sensitive data
-    sensitive_patterns = [
-        (r'(?i)(password|secret|token|key|credential)[\s]*=[\s]*["\']?[^"\';\n]+["\']?', '***REDACTED***'),
-        (r'(?i)(api[_-]?key)[\s]*[:=][\s]*["\']?[^"\';\n]+["\']?', '***REDACTED_KEY***'),
-        (r'Bearer\s+[^\s]+', '***REDACTED_BEARER_TOKEN***'),
-        (r'Basic\s+[^\s]+', '***REDACTED_BASIC_AUTH***'),
-    ]
+    # Literal substring scans are far cheaper than the regex, so patches
+    # without any keyword skip it entirely. casefold() folds every character
+    # the regex's IGNORECASE would (e.g. "ſ" to "s").
+    folded = patch.casefold()
+    if any(keyword in folded for keyword in _SENSITIVE_KEYWORDS) or any(
+        scheme in patch for scheme in _AUTH_SCHEMES
+    ):
+        sanitized = _SENSITIVE_RE.sub(_redact, patch)
+    else:
+        sanitized = patch
+
+    if len(sanitized) <= max_size:
+        return sanitized
+
+    # Truncate so the result, marker included, stays within max_size
+    return sanitized[: max(0, max_size - len(_TRUNCATION_MARKER))] + _TRUNCATION_MARKER
+
+
+def validate_and_sanitize_patch(patch: str, max_size: int = MAX_DIFF_SIZE) -> str:
+    """
+    Validate a patch and return it sanitized for LLM processing.
+
+    Args:
+        patch: The patch content
+        max_size: Maximum allowed patch size in characters
+
+    Returns:
+        Sanitized patch content, raises ValidationError if invalid
+    """
+    validate_patch(patch, max_size)
+    return sanitize_patch_for_llm(patch, max_size)
+
 
-    sanitized = patch
-    for pattern, replacement in sensitive_patterns:
-        sanitized = re.sub(pattern, replacement, sanitized)
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _file_path_error(file_path: str) -> Optional[str]:
+    """Why a file path is invalid, or None; cached per path."""
+    if not file_path:
+        return "File path cannot be empty"
 
-    # Truncate if too large
-    if len(sanitized) > max_size:
-        sanitized = sanitized[:max_size] + "\n... (truncated)"
+    # Check for path traversal attempts
+    if not _FILE_PATH_RE.match(file_path):
+        return f"Suspicious file path: {file_path}"
 
-    return sanitized
+    return None
 
 
 def validate_file_path(file_path: str) -> bool:
@@ -151,11 +229,7 @@ def validate_file_path(file_path: str) -> bool:
     Returns:
         True if valid, raises ValidationError otherwise
     """
-    if not file_path:
-        raise ValidationError("File path cannot be empty")
-
-    # Check for path traversal attempts
-    if ".." in file_path or file_path.startswith("/"):
-        raise ValidationError(f"Suspicious file path: {file_path}")
-
+    error = _file_path_error(file_path)
+    if error:
+        raise ValidationError(error)
     return True
@@ -0,0 +1,11 @@
+"""
+Settings shared by every REV2 environment profile.
+Environment profiles import these and override only what differs.
+"""
+
+# Performance Settings (same defaults as backend/config.py)
+MAX_DIFF_SIZE = 15000
+MAX_FILE_SIZE = 8000
+CHUNK_SIZE = 800
+CHUNK_OVERLAP = 200
+TOP_K = 5
@@ -4,6 +4,8 @@ Development environment configuration for REV2.
 
 import os
 
+from config.base import *  # noqa: F401,F403 - shared performance settings
+
 # Debug mode
 DEBUG = True
 
@@ -19,13 +21,6 @@ DATABASE_POOL_SIZE = 5
 # Rate Limiting
 RATE_LIMIT_REVIEWS_PER_HOUR = 1000  # Generous in dev
 
-# Performance Settings
-MAX_DIFF_SIZE = 15000
-MAX_FILE_SIZE = 8000
-CHUNK_SIZE = 800
-CHUNK_OVERLAP = 200
-TOP_K = 5
-
 # Index Settings
 INDEX_TTL_DAYS = 7
 USE_IVF_FOR_LARGE_REPOS = False
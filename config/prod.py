@@ -4,6 +4,8 @@ Production environment configuration for REV2.
 
 import os
 
+from config.base import *  # noqa: F401,F403 - shared performance settings
+
 # Debug mode
 DEBUG = False
 
@@ -18,17 +20,11 @@ DATABASE_URL = os.getenv(
 )
 DATABASE_ECHO = False
 DATABASE_POOL_SIZE = 20
+DATABASE_MAX_OVERFLOW = 40
 
 # Rate Limiting
 RATE_LIMIT_REVIEWS_PER_HOUR = 100
 
-# Performance Settings
-MAX_DIFF_SIZE = 15000
-MAX_FILE_SIZE = 8000
-CHUNK_SIZE = 800
-CHUNK_OVERLAP = 200
-TOP_K = 5
-
 # Index Settings
 INDEX_TTL_DAYS = 30
 USE_IVF_FOR_LARGE_REPOS = True
@@ -4,6 +4,8 @@ Test environment configuration for REV2.
 
 import os
 
+from config.base import *  # noqa: F401,F403 - shared performance settings
+
 # Debug mode
 DEBUG = False
 
@@ -19,13 +21,6 @@ DATABASE_POOL_SIZE = 1
 # Rate Limiting
 RATE_LIMIT_REVIEWS_PER_HOUR = 10000  # Very generous for tests
 
-# Performance Settings
-MAX_DIFF_SIZE = 15000
-MAX_FILE_SIZE = 8000
-CHUNK_SIZE = 800
-CHUNK_OVERLAP = 200
-TOP_K = 5
-
 # Index Settings
 INDEX_TTL_DAYS = 1
 USE_IVF_FOR_LARGE_REPOS = False